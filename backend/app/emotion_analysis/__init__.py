@@ -0,0 +1,5 @@
+from flask import Blueprint
+
+emotion_analysis_bp = Blueprint('emotion_analysis', __name__, cli_group='emotions')
+
+from . import routes
@@ -0,0 +1,131 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_
+from ..extentions import db
+from ..models import AnalysisJob, JournalEntry
+
+ANALYSIS_MAX_ATTEMPTS = int(os.environ.get("ANALYSIS_MAX_ATTEMPTS", 5))
+# A running job whose worker has not finished it after this long is handed out again
+ANALYSIS_LEASE_SECONDS = float(os.environ.get("ANALYSIS_LEASE_SECONDS", 300))
+
+class AnalysisQueue():
+    """Durable queue of journal entries waiting for emotion analysis.
+
+    Jobs live in the analysis_jobs table, so they are committed in the
+    same transaction as the entry that needs them. Workers claim jobs with
+    SELECT ... FOR UPDATE SKIP LOCKED, which lets several workers share the
+    queue without handing out the same job twice. A claimed job is leased
+    for ANALYSIS_LEASE_SECONDS, so jobs of a crashed worker run again.
+    """
+
+    @staticmethod
+    def enqueue(journal_entry):
+        """Mark the entry pending and queue it, unless it is already queued."""
+
+        journal_entry.analysis_status = JournalEntry.ANALYSIS_PENDING
+        for job in list(journal_entry.analysis_jobs):
+            if job.status == AnalysisJob.FAILED:
+                journal_entry.analysis_jobs.remove(job)
+        # A queued job reads the entry's content when it runs, so one is enough
+        if any(job.status == AnalysisJob.QUEUED for job in journal_entry.analysis_jobs):
+            return
+        journal_entry.analysis_jobs.append(AnalysisJob())
+
+    @staticmethod
+    def claim(limit):
+        """Lease up to ``limit`` runnable jobs, oldest first."""
+
+        now = datetime.now(timezone.utc)
+        jobs = (
+            AnalysisJob.query
+            .filter(or_(
+                and_(AnalysisJob.status == AnalysisJob.QUEUED, AnalysisJob.run_after <= now),
+                and_(AnalysisJob.status == AnalysisJob.RUNNING,
+                     AnalysisJob.locked_at <= now - timedelta(seconds=ANALYSIS_LEASE_SECONDS)),
+            ))
+            .order_by(AnalysisJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for job in jobs:
+            job.status = AnalysisJob.RUNNING
+            job.locked_at = now
+            job.attempts += 1
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return jobs
+
+    @staticmethod
+    def complete(job, content, emotions):
+        """Store the emotions detected for ``content`` and drop the job."""
+
+        journal_entry = job.journal_entry
+        # The entry was edited while this job ran; the job queued by that edit will analyze it
+        if journal_entry.content == content:
+            journal_entry.set_emotions(emotions)
+            journal_entry.analysis_status = JournalEntry.ANALYSIS_DONE
+
+        db.session.delete(job)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def fail(job, error):
+        """Retry the job with jittered exponential backoff, or give up after ANALYSIS_MAX_ATTEMPTS."""
+
+        job.last_error = str(error)
+        if job.attempts >= ANALYSIS_MAX_ATTEMPTS:
+            job.status = AnalysisJob.FAILED
+            job.journal_entry.analysis_status = JournalEntry.ANALYSIS_FAILED
+        else:
+            delay = min(600, 5 * 2 ** (job.attempts - 1)) * random.uniform(0.5, 1.5)
+            job.status = AnalysisJob.QUEUED
+            job.run_after = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def release(jobs, delay):
+        """Put jobs back without counting the attempt, e.g. while the ML service is unavailable."""
+
+        run_after = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        for job in jobs:
+            job.status = AnalysisJob.QUEUED
+            job.attempts -= 1
+            job.run_after = run_after
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def requeue_failed():
+        """Queue failed jobs again, for example after fixing the ML service."""
+
+        jobs = AnalysisJob.query.filter_by(status=AnalysisJob.FAILED).all()
+        for job in jobs:
+            job.status = AnalysisJob.QUEUED
+            job.attempts = 0
+            job.run_after = datetime.now(timezone.utc)
+            job.journal_entry.analysis_status = JournalEntry.ANALYSIS_PENDING
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return len(jobs)
@@ -0,0 +1,37 @@
+import click
+import logging
+from . import emotion_analysis_bp
+from .services import EmotionAnalysisService
+from ..utils.response import make_response
+
+# Circuit breaker state of the ML service client, for monitoring
+@emotion_analysis_bp.route('/status', methods=['GET'])
+def get_status():
+
+    status = EmotionAnalysisService.breaker_status()
+
+    return make_response(
+        status_code=200,
+        data=status,
+        message='Emotion analysis status found successfully',
+    )
+
+# flask emotions work
+@emotion_analysis_bp.cli.command('work')
+@click.option('--batch-size', type=int, default=None, help='Entries sent to the ML service per request.')
+def work(batch_size):
+    """Run the emotion analysis worker until interrupted."""
+    from .worker import AnalysisWorker
+
+    logging.basicConfig(level=logging.INFO)
+    worker = AnalysisWorker() if batch_size is None else AnalysisWorker(batch_size=batch_size)
+    worker.run()
+
+# flask emotions requeue-failed
+@emotion_analysis_bp.cli.command('requeue-failed')
+def requeue_failed():
+    """Queue entries whose analysis failed for another attempt."""
+    from .jobs import AnalysisQueue
+
+    requeued = AnalysisQueue.requeue_failed()
+    click.echo(f'Requeued {requeued} failed analysis jobs.')
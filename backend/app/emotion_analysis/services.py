@@ -1,42 +1,254 @@
 import os
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, Timeout, RequestException
+from urllib3.util.retry import Retry
 from ..utils.custom_exceptions import BadRequestError, ServiceUnavailableError
 
 ML_SERVICE_URL = os.environ.get("ML_SERVICE_URL", "http://localhost:5001")
+ML_SERVICE_CONNECT_TIMEOUT = float(os.environ.get("ML_SERVICE_CONNECT_TIMEOUT", 2))
+ML_SERVICE_READ_TIMEOUT = float(os.environ.get("ML_SERVICE_READ_TIMEOUT", 10))
+ML_SERVICE_BATCH_READ_TIMEOUT = float(os.environ.get("ML_SERVICE_BATCH_READ_TIMEOUT", 60))
+# One keep-alive connection per gunicorn thread that may call the ML service at once
+ML_SERVICE_POOL_SIZE = int(os.environ.get("ML_SERVICE_POOL_SIZE", os.environ.get("GUNICORN_THREADS", 4)))
+ML_SERVICE_RETRIES = int(os.environ.get("ML_SERVICE_RETRIES", 2))
+# Circuit breaker: stop calling the ML service after repeated failures or slow calls
+ML_BREAKER_FAILURE_THRESHOLD = int(os.environ.get("ML_BREAKER_FAILURE_THRESHOLD", 5))
+ML_BREAKER_SLOW_CALL_SECONDS = float(os.environ.get("ML_BREAKER_SLOW_CALL_SECONDS", 5))
+ML_BREAKER_RESET_SECONDS = float(os.environ.get("ML_BREAKER_RESET_SECONDS", 30))
+ML_BREAKER_HALF_OPEN_CALLS = int(os.environ.get("ML_BREAKER_HALF_OPEN_CALLS", 1))
+
+def build_session(pool_size=ML_SERVICE_POOL_SIZE, retries=ML_SERVICE_RETRIES):
+    """Session reusing keep-alive connections to the ML service.
+
+    Only failures to connect are retried, with jittered exponential
+    backoff. A request that reached the service is never sent twice,
+    because the prediction may already be running there.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=0,
+        other=0,
+        redirect=0,
+        backoff_factor=0.1,
+        backoff_jitter=0.1,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+ml_session = build_session()
+
+class CircuitBreaker():
+    """Fail fast while a downstream service keeps failing.
+
+    closed: calls go through. ``failure_threshold`` consecutive failures,
+    where a call slower than ``slow_call_seconds`` also counts as one, open
+    the circuit.
+    open: calls raise ServiceUnavailableError without being attempted,
+    until ``reset_seconds`` have passed.
+    half_open: up to ``half_open_calls`` trial calls go through while the
+    rest still fail fast. A successful trial closes the circuit and a
+    failed one opens it again.
+
+    Exceptions listed in ``ignored`` (the service answered, but rejected
+    the input) count as successes.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, slow_call_seconds=5.0, reset_seconds=30.0,
+                 half_open_calls=1, ignored=(), clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.half_open_calls = half_open_calls
+        self.ignored = ignored
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trials = 0
+        self._counts = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_seconds:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+        self._counts["opened"] += 1
+
+    def _before_call(self):
+        with self._lock:
+            state = self._current_state()
+            trial = state == self.HALF_OPEN and self._trials < self.half_open_calls
+            if trial:
+                self._trials += 1
+            elif state != self.CLOSED:
+                self._counts["rejected"] += 1
+                retry_in = max(0.0, self.reset_seconds - (self.clock() - self._opened_at))
+                raise ServiceUnavailableError(
+                    message="Emotion Analysis Service is unavailable.",
+                    details={"circuit": state, "retry_in": round(retry_in, 1)}
+                )
+            self._counts["calls"] += 1
+            return trial
+
+    def _after_call(self, trial, failed, slow=False):
+        with self._lock:
+            self._counts["failures"] += failed
+            self._counts["slow_calls"] += slow
+            if trial:
+                self._trials -= 1
+            elif self._state != self.CLOSED:
+                # Started before the circuit opened; the trial calls decide what happens next
+                return
+
+            if failed:
+                self._failures += 1
+                if trial or self._failures >= self.failure_threshold:
+                    self._open()
+            else:
+                self._failures = 0
+                self._state = self.CLOSED
+
+    def call(self, fn, *args, **kwargs):
+        trial = self._before_call()
+        start = self.clock()
+        try:
+            result = fn(*args, **kwargs)
+        except self.ignored:
+            self._after_call(trial, failed=False)
+            raise
+        except Exception:
+            self._after_call(trial, failed=True)
+            raise
+
+        slow = self.clock() - start >= self.slow_call_seconds
+        self._after_call(trial, failed=slow, slow=slow)
+        return result
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state()
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "slow_call_seconds": self.slow_call_seconds,
+                "retry_in": (
+                    round(max(0.0, self.reset_seconds - (self.clock() - self._opened_at)), 1)
+                    if state == self.OPEN else None
+                ),
+                **self._counts,
+            }
+
+ml_breaker = CircuitBreaker(
+    failure_threshold=ML_BREAKER_FAILURE_THRESHOLD,
+    slow_call_seconds=ML_BREAKER_SLOW_CALL_SECONDS,
+    reset_seconds=ML_BREAKER_RESET_SECONDS,
+    half_open_calls=ML_BREAKER_HALF_OPEN_CALLS,
+    ignored=(BadRequestError,),
+)
 
 class EmotionAnalysisService:
 
+    # Prediction options sent with every request
+    prediction_options = {
+        "threshold": 0.01,  # Optional, default 0.3
+        "top_k": 28,  # Optional, return top 10 emotions
+        "strategy": "average"  # Optional: "average" or "max"
+    }
 
     @staticmethod
     def emotion_detection(text: str) -> dict:
+        # While the ML service is failing, callers get ServiceUnavailableError immediately
+        return ml_breaker.call(EmotionAnalysisService._request_emotions, text)
+
+    @staticmethod
+    def emotion_detection_batch(texts: list) -> list:
+        """Emotions of each text, or a BadRequestError in place of a text the ML service rejected."""
+        return ml_breaker.call(EmotionAnalysisService._request_emotions_batch, texts)
+
+    @staticmethod
+    def breaker_status() -> dict:
+        return ml_breaker.stats()
+
+    @staticmethod
+    def _to_emotions(predictions):
+        return {
+            emotion.get('emotion'): emotion.get('score') for emotion in predictions
+        }
+
+    @staticmethod
+    def _request_emotions(text: str) -> dict:
+
+        response = EmotionAnalysisService._post(
+            '', {"text": text, **EmotionAnalysisService.prediction_options}, ML_SERVICE_READ_TIMEOUT
+        )
+        if response is not None:
+            return EmotionAnalysisService._to_emotions(response.get('data'))
+
+    @staticmethod
+    def _request_emotions_batch(texts: list) -> list:
+
+        response = EmotionAnalysisService._post(
+            'batch', {"texts": texts, **EmotionAnalysisService.prediction_options}, ML_SERVICE_BATCH_READ_TIMEOUT
+        )
+        if response is None:
+            raise ServiceUnavailableError(message="Emotion Analysis Service returned an error.")
+
+        return [
+            EmotionAnalysisService._to_emotions(result.get('emotions'))
+            if result.get('success') else BadRequestError(message=result.get('error'))
+            for result in response.get('data')
+        ]
+
+    @staticmethod
+    def _post(path: str, payload: dict, read_timeout: float):
 
         try:
-            response = requests.post(f'{ML_SERVICE_URL}/api/v1/emotion_detect/',
-                json= {
-                    "text": text,
-                    "threshold": 0.01,  # Optional, default 0.3
-                    "top_k": 28,  # Optional, return top 10 emotions
-                    "strategy": "average"  # Optional: "average" or "max"
-                }, timeout=10              
+            response = ml_session.post(f'{ML_SERVICE_URL}/api/v1/emotion_detect/{path}',
+                json=payload,
+                # Lets the ML service drop the request instead of scoring it after we gave up
+                headers={"X-Request-Deadline": f"{time.time() + ML_SERVICE_CONNECT_TIMEOUT + read_timeout:.3f}"},
+                timeout=(ML_SERVICE_CONNECT_TIMEOUT, read_timeout)
             )
 
             response = response.json()
 
             if response.get('success'):
-                emotions = response.get('data')
-                emotions = {
-                    emotion.get('emotion'): emotion.get('score') for emotion in emotions
-                }
-                return emotions
+                return response
             else:
                 if response.get('status_code') == 400:
                     raise BadRequestError(message=response.get('message'))
                 if response.get('status_code') == 500:
                     raise ServiceUnavailableError(message="Emotion Analysis Service returned an error.")
+                if response.get('status_code') in (503, 504):
+                    raise ServiceUnavailableError(message="Emotion Analysis Service is busy, try again later.")
         except (ConnectionError, Timeout):
             raise ServiceUnavailableError(message="Emotion Analysis Service is unavailable.")        
         except RequestException as e:
             raise ServiceUnavailableError(message=str(e))
         except Exception:
-            raise        
\ No newline at end of file
+            raise
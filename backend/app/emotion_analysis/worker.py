@@ -0,0 +1,78 @@
+import os
+import time
+import logging
+from sqlalchemy.orm.exc import ObjectDeletedError
+from ..extentions import db
+from .jobs import AnalysisQueue
+from .services import EmotionAnalysisService
+from ..utils.custom_exceptions import ServiceUnavailableError
+
+ANALYSIS_BATCH_SIZE = int(os.environ.get("ANALYSIS_BATCH_SIZE", 16))
+ANALYSIS_POLL_SECONDS = float(os.environ.get("ANALYSIS_POLL_SECONDS", 1))
+
+class AnalysisWorker():
+    """Drains the analysis queue, sending each claimed batch to the ML service's /batch endpoint."""
+
+    def __init__(self, batch_size=ANALYSIS_BATCH_SIZE, poll_seconds=ANALYSIS_POLL_SECONDS):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+
+    def run_once(self):
+        """Process one batch and return how many jobs were claimed."""
+
+        jobs = AnalysisQueue.claim(self.batch_size)
+        if not jobs:
+            return 0
+
+        claimed = len(jobs)
+        contents = []
+        for job in list(jobs):
+            try:
+                contents.append(job.journal_entry.content)
+            except ObjectDeletedError:
+                # The entry was deleted, or another worker took the job over after its lease expired
+                logging.info("Skipping emotion analysis job whose entry or lease is gone")
+                jobs.remove(job)
+        if not jobs:
+            return claimed
+
+        try:
+            results = EmotionAnalysisService.emotion_detection_batch(contents)
+        except ServiceUnavailableError as error:
+            # Not the entries' fault: retry once the circuit breaker lets calls through again
+            retry_in = (error.details or {}).get("retry_in") or self.poll_seconds
+            logging.warning(f"Emotion analysis postponed for {len(jobs)} entries: {error.message}")
+            AnalysisQueue.release(jobs, delay=retry_in)
+            return claimed
+        except Exception as error:
+            logging.exception("Emotion analysis batch failed")
+            results = [error] * len(jobs)
+
+        for job, content, result in zip(jobs, contents, results):
+            try:
+                if isinstance(result, Exception):
+                    AnalysisQueue.fail(job, getattr(result, "message", result))
+                else:
+                    AnalysisQueue.complete(job, content, result)
+            except Exception:
+                # e.g. the entry was deleted meanwhile; the job's lease expires and it is retried
+                logging.exception(f"Could not store emotion analysis for job {job.id}")
+                db.session.rollback()
+
+        return claimed
+
+    def run(self, should_stop=lambda: False):
+        logging.info(f"Analysis worker started (batch size {self.batch_size})")
+        while not should_stop():
+            try:
+                claimed = self.run_once()
+            except Exception:
+                logging.exception("Analysis worker iteration failed")
+                db.session.rollback()
+                claimed = 0
+            finally:
+                # Drop the identity map so the next batch sees fresh rows
+                db.session.remove()
+
+            if claimed < self.batch_size:
+                time.sleep(self.poll_seconds)
@@ -9,7 +9,11 @@ from ..utils.response import make_response
 @login_required
 def get_journal_entries():
 
-    journal_entries = JournalService.get_journal_entries()
+    journal_entries = JournalService.get_journal_entries(
+        cursor=request.args.get('cursor'),
+        limit=request.args.get('limit'),
+        all_entries=request.args.get('all', 'false').lower() == 'true'
+    )
 
     return make_response(
         status_code=200,
@@ -17,6 +21,23 @@ def get_journal_entries():
         message=f'Journal entries found successfully',
     )
 
+# Emotion timeline of the current user's journal, aggregated per bucket
+@journals_bp.route('/analytics/timeline', methods=['GET'])
+@login_required
+def get_emotion_timeline():
+
+    timeline = JournalService.get_emotion_timeline(
+        bucket=request.args.get('bucket'),
+        start=request.args.get('from'),
+        end=request.args.get('to')
+    )
+
+    return make_response(
+        status_code=200,
+        data=timeline,
+        message=f'Emotion timeline found successfully',
+    )
+
 # Get a specific journal entry by ID
 @journals_bp.route('/<int:entry_id>', methods=['GET'])
 @login_required
@@ -30,6 +51,19 @@ def get_journal_entry(entry_id):
         message=f'Journal entry found successfully',
     )
 
+# Poll the emotion analysis of a journal entry
+@journals_bp.route('/<int:entry_id>/analysis', methods=['GET'])
+@login_required
+def get_journal_entry_analysis(entry_id):
+
+    analysis = JournalService.get_journal_entry_analysis(entry_id)
+
+    return make_response(
+        status_code=200,
+        data=analysis,
+        message=f'Journal entry analysis found successfully',
+    )
+
 # Create a new journal entry
 @journals_bp.route('/', methods=['POST'])
 @login_required
@@ -1,24 +1,93 @@
+import json
+import math
+import base64
+import binascii
+from datetime import datetime, timezone
+from sqlalchemy import and_, or_, func
 from ..extentions import db
 from flask_login import current_user
-from ..models import JournalEntry, Emotion
-from ..emotion_analysis.services import EmotionAnalysisService
+from ..models import EmotionLabelSet, EmotionVector, JournalEntry
+from ..emotion_analysis.jobs import AnalysisQueue
 from ..utils.custom_exceptions import NotFoundError, BadRequestError
 
 class JournalService():
 
+    page_size = 20
+    max_page_size = 100
+    timeline_buckets = ('day', 'week', 'month')
+
+    @staticmethod
+    def _encode_cursor(journal_entry):
+        payload = json.dumps({"created_at": journal_entry.created_at.isoformat(), "id": journal_entry.id})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
     @staticmethod
-    def get_journal_entries():
+    def _decode_cursor(cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return datetime.fromisoformat(payload["created_at"]), int(payload["id"])
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+            raise BadRequestError(message="Invalid cursor.")
+
+    @staticmethod
+    def _validate_limit(limit):
+        if limit is None:
+            return JournalService.page_size
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise BadRequestError(message="limit must be an integer.")
+        if not 1 <= limit <= JournalService.max_page_size:
+            raise BadRequestError(message=f"limit must be between 1 and {JournalService.max_page_size}.")
+        return limit
+
+    @staticmethod
+    def get_journal_entries(cursor=None, limit=None, all_entries=False):
+        """One page of the user's entries, newest first.
+
+        Pages are keyed on (created_at, id) rather than an offset, so each
+        page is an index range scan no matter how far back it is. Pass the
+        returned ``next_cursor`` to get the following page; it is None on
+        the last page. ``all_entries`` returns the whole journal as a plain
+        list, as this endpoint did before it was paginated.
+        """
 
         user_id = current_user.id
-        journal_entries = JournalEntry.query.filter_by(user_id=user_id).all()
 
-        return [entry.to_dict() for entry in journal_entries]
+        if all_entries:
+            journal_entries = JournalEntry.query_with_emotions().filter_by(user_id=user_id).all()
+            return [entry.to_dict() for entry in journal_entries]
+
+        limit = JournalService._validate_limit(limit)
+        query = JournalEntry.query_with_emotions().filter_by(user_id=user_id)
+        if cursor:
+            created_at, entry_id = JournalService._decode_cursor(cursor)
+            query = query.filter(or_(
+                JournalEntry.created_at < created_at,
+                and_(JournalEntry.created_at == created_at, JournalEntry.id < entry_id),
+            ))
+
+        # One extra row tells whether another page follows
+        journal_entries = (
+            query
+            .order_by(JournalEntry.created_at.desc(), JournalEntry.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(journal_entries) > limit
+        journal_entries = journal_entries[:limit]
+
+        return {
+            "entries": [entry.to_dict() for entry in journal_entries],
+            "next_cursor": JournalService._encode_cursor(journal_entries[-1]) if has_more else None,
+            "limit": limit
+        }
     
     @staticmethod
     def get_journal_entry_by_id(entry_id):
         
         user_id = current_user.id
-        journal_entry = JournalEntry.query.filter_by(id=entry_id, user_id=user_id).first()
+        journal_entry = JournalEntry.query_with_emotions().filter_by(id=entry_id, user_id=user_id).first()
 
         # Check if the journal entry exists
         if not journal_entry:
@@ -26,6 +95,162 @@ class JournalService():
         
         return journal_entry.to_dict()
     
+    @staticmethod
+    def get_journal_entry_analysis(entry_id):
+
+        user_id = current_user.id
+        journal_entry = JournalEntry.query_with_emotions().filter_by(id=entry_id, user_id=user_id).first()
+
+        if not journal_entry:
+            raise NotFoundError(f'Journal entry not found.')
+
+        return {
+            "id": journal_entry.id,
+            "analysis_status": journal_entry.analysis_status,
+            "emotions": journal_entry.emotions
+        }
+
+    @staticmethod
+    def _parse_timestamp(value, name):
+        if value is None:
+            return None
+        try:
+            timestamp = datetime.fromisoformat(value)
+        except ValueError:
+            raise BadRequestError(message=f"{name} must be an ISO 8601 date or datetime.")
+        # created_at is compared in UTC; a value without an offset is taken as UTC
+        if timestamp.tzinfo is None:
+            return timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.astimezone(timezone.utc)
+
+    @staticmethod
+    def _bucket_start(bucket, dialect_name):
+        """SQL expression for the UTC start of the bucket an entry's created_at falls in."""
+        created_at = JournalEntry.created_at
+        if dialect_name == 'postgresql':
+            return func.date_trunc(db.literal(bucket, literal_execute=True), func.timezone('UTC', created_at))
+        # SQLite stores created_at as UTC text; weeks start on Monday like date_trunc's
+        if bucket == 'day':
+            return func.date(created_at)
+        if bucket == 'week':
+            return func.date(created_at, '-6 days', 'weekday 1')
+        return func.strftime('%Y-%m-01', created_at)
+
+    @staticmethod
+    def _emotion_rows(bucket_start, filters, dialect_name):
+        """(bucket start, emotion, entries, average confidence) for every emotion in every bucket."""
+        if dialect_name == 'postgresql':
+            scores = (
+                func.unnest(EmotionVector.scores)
+                .table_valued('score', with_ordinality='position')
+                .render_derived()
+                .lateral('scores')
+            )
+            # Literal values, so GROUP BY repeats exactly the selected expressions
+            position = db.cast(scores.c.position - db.literal(1, literal_execute=True), db.Integer)
+            emotion = EmotionLabelSet.labels.op('->>', return_type=db.String)(position)
+            return (
+                db.session.query(bucket_start, emotion, func.count(), func.avg(scores.c.score))
+                .select_from(JournalEntry)
+                .join(EmotionVector, EmotionVector.entry_id == JournalEntry.id)
+                .join(EmotionLabelSet, EmotionLabelSet.version == EmotionVector.label_set_version)
+                .join(scores, db.true())
+                .filter(*filters, scores.c.score != db.cast(db.literal_column("'NaN'"), db.REAL))
+                .group_by(bucket_start, emotion)
+                .all()
+            )
+
+        # Packed vectors cannot be unnested in SQL here, so they are averaged in Python
+        labels = dict(db.session.query(EmotionLabelSet.version, EmotionLabelSet.labels).all())
+        vectors = (
+            db.session.query(bucket_start, EmotionVector.label_set_version, EmotionVector.scores)
+            .select_from(JournalEntry)
+            .join(EmotionVector, EmotionVector.entry_id == JournalEntry.id)
+            .filter(*filters)
+        )
+        totals = {}
+        for start, version, scores in vectors:
+            for emotion, score in zip(labels[version], scores):
+                if not math.isnan(score):
+                    total = totals.setdefault((start, emotion), [0, 0.0])
+                    total[0] += 1
+                    total[1] += score
+        return [(start, emotion, count, score_sum / count) for (start, emotion), (count, score_sum) in totals.items()]
+
+    @staticmethod
+    def _summarize_emotions(counts):
+        emotions = [
+            {"name": name, "count": count, "avg_confidence": round(score_sum / count, 2)}
+            for name, (count, score_sum) in counts.items()
+        ]
+        return sorted(emotions, key=lambda emotion: (-emotion["count"], -emotion["avg_confidence"]))
+
+    @staticmethod
+    def get_emotion_timeline(bucket=None, start=None, end=None):
+        """Entry counts and average emotion confidence per day, week or month.
+
+        Only the aggregated series is returned, grouped in the database,
+        so the history page no longer downloads the whole journal.
+        ``start`` is inclusive and ``end`` exclusive. Buckets are in UTC,
+        and buckets without entries are left out.
+        """
+
+        bucket = bucket or 'day'
+        if bucket not in JournalService.timeline_buckets:
+            raise BadRequestError(message=f"bucket must be one of {', '.join(JournalService.timeline_buckets)}.")
+        start = JournalService._parse_timestamp(start, "from")
+        end = JournalService._parse_timestamp(end, "to")
+        if start and end and start >= end:
+            raise BadRequestError(message="from must be before to.")
+
+        user_id = current_user.id
+        dialect_name = db.session.get_bind().dialect.name
+        bucket_start = JournalService._bucket_start(bucket, dialect_name)
+        filters = [JournalEntry.user_id == user_id]
+        if start:
+            filters.append(JournalEntry.created_at >= start)
+        if end:
+            filters.append(JournalEntry.created_at < end)
+
+        entry_counts = (
+            db.session.query(bucket_start, func.count(JournalEntry.id))
+            .filter(*filters)
+            .group_by(bucket_start)
+            .all()
+        )
+        emotion_rows = JournalService._emotion_rows(bucket_start, filters, dialect_name)
+
+        def as_utc(value):
+            # PostgreSQL returns a naive UTC timestamp, SQLite a date string
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            return value.replace(tzinfo=timezone.utc)
+
+        series = {as_utc(value): {"entry_count": count, "emotions": {}} for value, count in entry_counts}
+        overall = {}
+        for value, emotion, count, avg_confidence in emotion_rows:
+            score_sum = float(avg_confidence) * count
+            series[as_utc(value)]["emotions"][emotion] = (count, score_sum)
+            total = overall.setdefault(emotion, [0, 0.0])
+            total[0] += count
+            total[1] += score_sum
+
+        return {
+            "bucket": bucket,
+            "from": start.isoformat() if start else None,
+            "to": end.isoformat() if end else None,
+            "entry_count": sum(item["entry_count"] for item in series.values()),
+            "emotions": JournalService._summarize_emotions(overall),
+            "series": [
+                {
+                    "start": bucket_value.isoformat(),
+                    "entry_count": item["entry_count"],
+                    "emotions": JournalService._summarize_emotions(item["emotions"]),
+                }
+                for bucket_value, item in sorted(series.items())
+            ]
+        }
+
     @staticmethod
     def create_journal_entry(data):
         
@@ -47,15 +272,8 @@ class JournalService():
             content=content
         )
 
-        emotions = EmotionAnalysisService.emotion_detection(content)
-
-        for emotion_name, score in emotions.items():
-            emotion = Emotion(
-                entry_id=new_entry.id,
-                emotion_name=emotion_name,
-                confidence_score=score
-            )
-            new_entry.emotions.append(emotion)
+        # Emotions are filled in by the analysis worker; saving does not wait for the model
+        AnalysisQueue.enqueue(new_entry)
 
         try:
             db.session.add(new_entry)
@@ -94,15 +312,12 @@ class JournalService():
                 journal_entry.content = content
                 
                 # Re-analyze emotions if content is updated
-                journal_entry.emotions.clear()
-                emotions = EmotionAnalysisService.emotion_detection(content)
-                for emotion_name, score in emotions.items():
-                    emotion = Emotion(
-                        entry_id=journal_entry.id,
-                        emotion_name=emotion_name,
-                        confidence_score=score
-                    )
-                    journal_entry.emotions.append(emotion)
+                journal_entry.clear_emotions()
+                AnalysisQueue.enqueue(journal_entry)
+
+        # Saving an entry whose analysis gave up retries it, even if only the title changed
+        if journal_entry.analysis_status == JournalEntry.ANALYSIS_FAILED:
+            AnalysisQueue.enqueue(journal_entry)
         try:
             db.session.commit()  
         except Exception:
@@ -126,5 +341,3 @@ class JournalService():
         except Exception:
             db.session.rollback()
             raise
-     
-
@@ -1,6 +1,34 @@
+import math
+import struct
 from .extentions import db, bcrypt
 from flask_login import UserMixin
 from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
+
+class EmotionVectorType(db.TypeDecorator):
+    """A list of float32 scores: REAL[] on PostgreSQL, packed little-endian bytes elsewhere."""
+
+    impl = db.LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.ARRAY(db.REAL))
+        return dialect.type_descriptor(db.LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == 'postgresql':
+            return [float(score) for score in value]
+        return struct.pack(f'<{len(value)}f', *value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == 'postgresql':
+            return list(value)
+        return list(struct.unpack(f'<{len(value) // 4}f', value))
 
 class User(db.Model,UserMixin):
 
@@ -41,6 +69,13 @@ class User(db.Model,UserMixin):
 class JournalEntry(db.Model):
 
     __tablename__ = 'journal_entries'
+    # Serves the keyset-paginated listing, newest first
+    __table_args__ = (db.Index('ix_journal_entries_user_id_created_at_id', 'user_id', 'created_at', 'id'),)
+
+    # analysis_status values; pending entries are waiting for the analysis worker
+    ANALYSIS_PENDING = 'pending'
+    ANALYSIS_DONE = 'done'
+    ANALYSIS_FAILED = 'failed'
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -48,37 +83,126 @@ class JournalEntry(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime(timezone=True), nullable=True, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    analysis_status = db.Column(db.String(20), nullable=False, default=ANALYSIS_DONE, server_default=ANALYSIS_DONE, index=True)
 
     user = db.relationship('User', backref=db.backref('journal_entries', lazy='dynamic', cascade="all, delete-orphan"))
-    emotions = db.relationship('Emotion', backref='journal_entry', lazy=True, cascade="all, delete-orphan")
+    emotion_vector = db.relationship('EmotionVector', backref='journal_entry', uselist=False, lazy=True, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f'<JournalEntry {self.id}>'
-    
+
+    @classmethod
+    def query_with_emotions(cls):
+        """Query that loads the emotions of every matched entry in one extra SELECT, instead of one per entry."""
+        return cls.query.options(db.selectinload(cls.emotion_vector))
+
+    @property
+    def emotions(self):
+        return self.emotion_vector.to_dict() if self.emotion_vector else []
+
+    def set_emotions(self, emotions):
+        """Store a {name: score} mapping as this entry's emotion vector."""
+        if not emotions:
+            self.clear_emotions()
+            return
+        label_set = EmotionLabelSet.for_labels(emotions)
+        scores = [emotions.get(label, math.nan) for label in label_set.labels]
+        if self.emotion_vector is None:
+            self.emotion_vector = EmotionVector(label_set=label_set, scores=scores)
+        else:
+            self.emotion_vector.label_set = label_set
+            self.emotion_vector.scores = scores
+
+    def clear_emotions(self):
+        self.emotion_vector = None
+
     def to_dict(self):
         return {
             "id": self.id,
             "title": self.title,
             "content": self.content,
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "emotions": [e.to_dict() for e in self.emotions]
+            "analysis_status": self.analysis_status,
+            "emotions": self.emotions
         }
 
-class Emotion(db.Model):
+class EmotionLabelSet(db.Model):
 
-    __tablename__ = 'emotions'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    entry_id = db.Column(db.Integer, db.ForeignKey('journal_entries.id'), nullable=False)
-    emotion_name = db.Column(db.String(150), nullable=False)
-    confidence_score = db.Column(db.Float, nullable=False)
+    __tablename__ = 'emotion_label_sets'
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    labels = db.Column(db.JSON, nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
 
     def __repr__(self):
-        return f'<Emotion {self.id}>'
+        return f'<EmotionLabelSet {self.version}>'
+
+    @classmethod
+    def for_labels(cls, names):
+        """Latest label set that covers ``names``, adding a new version when a label is unknown.
+
+        Versions only ever append labels, so the positions of an older
+        vector stay valid. Two workers adding the same version at once
+        conflict on the primary key; the loser's job is retried.
+        """
+        latest = cls.query.order_by(cls.version.desc()).first()
+        known = latest.labels if latest else []
+        unknown = sorted(set(names) - set(known))
+        if not unknown:
+            return latest
+        label_set = cls(version=latest.version + 1 if latest else 1, labels=known + unknown)
+        db.session.add(label_set)
+        return label_set
+
+class EmotionVector(db.Model):
+    """Emotion scores of one journal entry, ordered like the labels of its label set.
+
+    Replaces one row per emotion: a single row per entry holds all scores
+    as float32. Labels the ML service did not return are stored as NaN.
+    """
+
+    __tablename__ = 'emotion_vectors'
+
+    entry_id = db.Column(db.Integer, db.ForeignKey('journal_entries.id', ondelete='CASCADE'), primary_key=True)
+    label_set_version = db.Column(db.Integer, db.ForeignKey('emotion_label_sets.version'), nullable=False)
+    scores = db.Column(EmotionVectorType, nullable=False)
+
+    # Joined, so loading vectors never costs an extra SELECT per label set
+    label_set = db.relationship('EmotionLabelSet', lazy='joined')
+
+    def __repr__(self):
+        return f'<EmotionVector {self.entry_id}>'
 
     def to_dict(self):
-        return {
-            "name": self.emotion_name,
-            "confidence": self.confidence_score
-        }
\ No newline at end of file
+        # float32 keeps about 7 significant digits; rounding restores the ML service's 2 decimals
+        emotions = [
+            {"name": label, "confidence": round(score, 4)}
+            for label, score in zip(self.label_set.labels, self.scores)
+            if not math.isnan(score)
+        ]
+        return sorted(emotions, key=lambda emotion: emotion["confidence"], reverse=True)
+
+class AnalysisJob(db.Model):
+
+    __tablename__ = 'analysis_jobs'
+    __table_args__ = (db.Index('ix_analysis_jobs_status_run_after', 'status', 'run_after'),)
+
+    # status values; finished jobs are deleted
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(db.Integer, db.ForeignKey('journal_entries.id', ondelete='CASCADE'), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default=QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_after = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    locked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    journal_entry = db.relationship('JournalEntry', backref=db.backref('analysis_jobs', lazy=True, cascade="all, delete-orphan"))
+
+    def __repr__(self):
+        return f'<AnalysisJob {self.id}>'
+
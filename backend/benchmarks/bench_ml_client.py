@@ -0,0 +1,141 @@
+"""Connection overhead of calling the ML service with and without a pooled session.
+
+Run from backend/:
+
+    python -m benchmarks.bench_ml_client --requests 500 --concurrency 1 4
+
+A stub ML server on 127.0.0.1 answers every prediction with a fixed
+payload after --service-ms milliseconds. The same requests are sent
+once with a bare ``requests.post`` per call (a new TCP connection every
+time) and once through ``EmotionAnalysisService.emotion_detection``,
+which uses the pooled keep-alive session. For each client the benchmark
+reports p50/p95 latency, requests/sec and the number of TCP connections
+the stub server accepted.
+"""
+import json
+import time
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app.emotion_analysis import services
+from app.emotion_analysis.services import EmotionAnalysisService, build_session
+
+PAYLOAD = json.dumps({
+    "success": True,
+    "status_code": 200,
+    "data": [{"emotion": "joy", "score": 0.9}, {"emotion": "neutral", "score": 0.1}],
+}).encode()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # responses would stall on delayed ACKs like no real server does
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.service_seconds:
+            time.sleep(self.server.service_seconds)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(service_ms=0.0):
+    """Start the stub ML server in a daemon thread and return it with its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.service_seconds = service_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_client(call, count, concurrency):
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, range(count)))
+    wall_seconds = time.perf_counter() - start
+
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "requests": count,
+        "p50_ms": round(percentile(latencies_ms, 0.50), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "mean_ms": round(sum(latencies_ms) / count, 3),
+        "requests_per_sec": round(count / wall_seconds, 1),
+    }
+
+def run(args):
+    server, base_url = start_stub_server(args.service_ms)
+    url = f"{base_url}/api/v1/emotion_detect/"
+    services.ML_SERVICE_URL = base_url
+
+    def unpooled():
+        requests.post(url, json={"text": "benchmark"}, timeout=(2, 10)).json()
+
+    def pooled():
+        EmotionAnalysisService.emotion_detection("benchmark")
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            services.ml_session = build_session(pool_size=concurrency)
+            for name, call in (("unpooled", unpooled), ("pooled", pooled)):
+                call()  # first connection and import costs are not part of the run
+                server.connections = 0
+                row = {"client": name, "concurrency": concurrency,
+                       **run_client(call, args.requests, concurrency),
+                       "connections": server.connections}
+                results.append(row)
+                print(
+                    f"{name:<9} c={concurrency:<3} p50 {row['p50_ms']:>8.3f} ms  p95 {row['p95_ms']:>8.3f} ms"
+                    f"  {row['requests_per_sec']:>9.1f} req/s  {row['connections']:>5} connections"
+                )
+    finally:
+        server.shutdown()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--service-ms", type=float, default=0.0, help="Simulated prediction time of the stub")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    report = {
+        "benchmark": "ml_client",
+        "settings": {"requests": args.requests, "service_ms": args.service_ms},
+        "results": run(args),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,4 @@ echo "Wating for databse..."
 flask db upgrade
 
 echo "Starting Gunicorn..."
-exec gunicorn --bind 0.0.0.0:5000 --workers 2 run:app
\ No newline at end of file
+exec gunicorn --bind 0.0.0.0:5000 --workers ${GUNICORN_WORKERS:-2} --threads ${GUNICORN_THREADS:-4} run:app
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""add journal_entries.analysis_status
+
+Revision ID: 3c9e1f7a2b4d
+Revises: fd89db91eabe
+Create Date: 2026-10-17 10:12:44.218903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f7a2b4d'
+down_revision = 'fd89db91eabe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_status', sa.String(length=20), server_default='done', nullable=False))
+        batch_op.create_index(batch_op.f('ix_journal_entries_analysis_status'), ['analysis_status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_journal_entries_analysis_status'))
+        batch_op.drop_column('analysis_status')
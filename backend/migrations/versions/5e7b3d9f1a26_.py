@@ -0,0 +1,26 @@
+"""add journal_entries (user_id, created_at, id) index
+
+Revision ID: 5e7b3d9f1a26
+Revises: 9a4d2c6e8f13
+Create Date: 2026-10-17 16:41:09.772310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7b3d9f1a26'
+down_revision = '9a4d2c6e8f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_journal_entries_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_journal_entries_user_id_created_at_id')
@@ -0,0 +1,49 @@
+"""add analysis_jobs queue
+
+Revision ID: 9a4d2c6e8f13
+Revises: 3c9e1f7a2b4d
+Create Date: 2026-10-17 14:03:27.561209
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d2c6e8f13'
+down_revision = '3c9e1f7a2b4d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analysis_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_entry_id'), ['entry_id'], unique=False)
+        batch_op.create_index('ix_analysis_jobs_status_run_after', ['status', 'run_after'], unique=False)
+
+    # Entries left pending by ML outages are picked up by the worker
+    op.execute(
+        "INSERT INTO analysis_jobs (entry_id, status, attempts, run_after, created_at) "
+        "SELECT id, 'queued', 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+        "FROM journal_entries WHERE analysis_status = 'pending'"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_analysis_jobs_status_run_after')
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_entry_id'))
+
+    op.drop_table('analysis_jobs')
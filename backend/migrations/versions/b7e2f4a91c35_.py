@@ -0,0 +1,139 @@
+"""store emotions as one vector per journal entry
+
+Revision ID: b7e2f4a91c35
+Revises: 5e7b3d9f1a26
+Create Date: 2026-10-17 18:12:44.903518
+
+"""
+import math
+import struct
+from datetime import datetime, timezone
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2f4a91c35'
+down_revision = '5e7b3d9f1a26'
+branch_labels = None
+depends_on = None
+
+# Vector rows written per INSERT while converting
+CHUNK_SIZE = 1000
+
+label_sets = sa.table('emotion_label_sets',
+    sa.column('version', sa.Integer),
+    sa.column('labels', sa.JSON),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+)
+emotions = sa.table('emotions',
+    sa.column('id', sa.Integer),
+    sa.column('entry_id', sa.Integer),
+    sa.column('emotion_name', sa.String),
+    sa.column('confidence_score', sa.Float),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+)
+
+
+def scores_type(bind):
+    """float32 scores as REAL[] on PostgreSQL and packed little-endian bytes elsewhere, like the model."""
+    if bind.dialect.name == 'postgresql':
+        return postgresql.ARRAY(sa.REAL)
+    return sa.LargeBinary()
+
+
+def vectors_table(bind):
+    return sa.table('emotion_vectors',
+        sa.column('entry_id', sa.Integer),
+        sa.column('label_set_version', sa.Integer),
+        sa.column('scores', scores_type(bind)),
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    packed = bind.dialect.name != 'postgresql'
+    emotion_vectors = vectors_table(bind)
+
+    op.create_table('emotion_label_sets',
+    sa.Column('version', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('labels', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('version')
+    )
+    op.create_table('emotion_vectors',
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('label_set_version', sa.Integer(), nullable=False),
+    sa.Column('scores', scores_type(bind), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['label_set_version'], ['emotion_label_sets.version'], ),
+    sa.PrimaryKeyConstraint('entry_id')
+    )
+
+    # Every label stored so far becomes label set 1, in alphabetical order
+    labels = sorted(bind.execute(sa.select(emotions.c.emotion_name).distinct()).scalars())
+    if labels:
+        bind.execute(label_sets.insert().values(version=1, labels=labels, created_at=datetime.now(timezone.utc)))
+        positions = {label: i for i, label in enumerate(labels)}
+
+        rows = bind.execute(
+            sa.select(emotions.c.entry_id, emotions.c.emotion_name, emotions.c.confidence_score)
+            .order_by(emotions.c.entry_id)
+            .execution_options(stream_results=True)
+        )
+        chunk = []
+        for entry_id, entry_rows in groupby(rows, key=lambda row: row.entry_id):
+            scores = [math.nan] * len(labels)
+            for row in entry_rows:
+                scores[positions[row.emotion_name]] = row.confidence_score
+            if packed:
+                scores = struct.pack(f'<{len(scores)}f', *scores)
+            chunk.append({"entry_id": entry_id, "label_set_version": 1, "scores": scores})
+            if len(chunk) >= CHUNK_SIZE:
+                op.bulk_insert(emotion_vectors, chunk)
+                chunk = []
+        if chunk:
+            op.bulk_insert(emotion_vectors, chunk)
+
+    op.drop_table('emotions')
+
+
+def downgrade():
+    bind = op.get_bind()
+    packed = bind.dialect.name != 'postgresql'
+    emotion_vectors = vectors_table(bind)
+
+    op.create_table('emotions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('emotion_name', sa.String(length=150), nullable=False),
+    sa.Column('confidence_score', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    labels = dict(bind.execute(sa.select(label_sets.c.version, label_sets.c.labels)).all())
+    rows = bind.execute(
+        sa.select(emotion_vectors.c.entry_id, emotion_vectors.c.label_set_version, emotion_vectors.c.scores)
+        .execution_options(stream_results=True)
+    )
+    now = datetime.now(timezone.utc)
+    chunk = []
+    for row in rows:
+        scores = struct.unpack(f'<{len(row.scores) // 4}f', row.scores) if packed else row.scores
+        for label, score in zip(labels[row.label_set_version], scores):
+            if not math.isnan(score):
+                chunk.append({"entry_id": row.entry_id, "emotion_name": label,
+                              "confidence_score": round(score, 4), "created_at": now})
+        if len(chunk) >= CHUNK_SIZE:
+            op.bulk_insert(emotions, chunk)
+            chunk = []
+    if chunk:
+        op.bulk_insert(emotions, chunk)
+
+    op.drop_table('emotion_vectors')
+    op.drop_table('emotion_label_sets')
@@ -0,0 +1,30 @@
+import pytest
+
+from app.extentions import db
+from app.models import User
+
+
+@pytest.fixture
+def db_app(monkeypatch):
+    """Flask app backed by an in-memory SQLite database"""
+    from app import create_app
+    from app.config import DevelopmentConfig
+    monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', 'sqlite://')
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user(db_app):
+    """A saved user to own journal entries"""
+    user = User(first_name="Test", last_name="User", email="test@example.com")
+    user._password_hash = "not-a-real-hash"
+    db.session.add(user)
+    db.session.commit()
+    return user
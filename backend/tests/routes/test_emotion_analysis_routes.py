@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import patch
+from flask import json
+
+
+class TestEmotionAnalysisRoutes:
+    """Test suite for Emotion Analysis routes"""
+
+    @pytest.fixture
+    def client(self, app):
+        """Create a test client for the Flask app"""
+        return app.test_client()
+
+    @pytest.fixture
+    def app(self):
+        """Create and configure a test Flask app"""
+        from app import create_app
+        app = create_app()
+        app.config['TESTING'] = True
+        return app
+
+    # ==================== GET /emotion-analysis/status Tests ====================
+
+    @patch('app.emotion_analysis.routes.EmotionAnalysisService.breaker_status')
+    def test_get_status_success(self, mock_status, client):
+        """Test the circuit breaker state is exposed without logging in"""
+        mock_status.return_value = {"state": "open", "consecutive_failures": 5, "retry_in": 12.5}
+
+        response = client.get('/emotion-analysis/status')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['success'] is True
+        assert data['data']['state'] == "open"
+        mock_status.assert_called_once()
+
+    # ==================== flask emotions requeue-failed Tests ====================
+
+    @patch('app.emotion_analysis.jobs.AnalysisQueue.requeue_failed')
+    def test_requeue_failed_command(self, mock_requeue, app):
+        """Test the CLI command requeues failed analysis jobs"""
+        mock_requeue.return_value = 3
+
+        result = app.test_cli_runner().invoke(args=['emotions', 'requeue-failed'])
+
+        assert result.exit_code == 0
+        assert 'Requeued 3 failed analysis jobs.' in result.output
+        mock_requeue.assert_called_once()
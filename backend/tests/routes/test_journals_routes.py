@@ -77,6 +77,27 @@ class TestJournalsRoutes:
 
         assert response.status_code == 500
 
+    @patch('app.journals.routes.JournalService.get_journal_entries')
+    def test_get_journal_entries_page_params(self, mock_get_entries, client):
+        """Test that cursor and limit are passed through to the service"""
+        mock_get_entries.return_value = {'entries': [], 'next_cursor': None, 'limit': 5}
+
+        response = client.get('/journals/?limit=5&cursor=abc')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['data']['next_cursor'] is None
+        mock_get_entries.assert_called_once_with(cursor='abc', limit='5', all_entries=False)
+
+    @patch('app.journals.routes.JournalService.get_journal_entries')
+    def test_get_journal_entries_all_opt_in(self, mock_get_entries, client):
+        """Test that ?all=true asks for the unpaginated list"""
+        mock_get_entries.return_value = []
+
+        client.get('/journals/?all=true')
+
+        mock_get_entries.assert_called_once_with(cursor=None, limit=None, all_entries=True)
+
     # ==================== GET /journals/<entry_id> Tests ====================
 
     @patch('app.journals.routes.JournalService.get_journal_entry_by_id')
@@ -118,6 +139,57 @@ class TestJournalsRoutes:
         # Flask routing raises NotFound which is caught by generic Exception handler returning 500
         assert response.status_code == 500
 
+    # ==================== GET /journals/analytics/timeline Tests ====================
+
+    @patch('app.journals.routes.JournalService.get_emotion_timeline')
+    def test_get_emotion_timeline_success(self, mock_get_timeline, client):
+        """Test that the timeline query parameters reach the service"""
+        mock_get_timeline.return_value = {
+            'bucket': 'week', 'from': '2025-01-01T00:00:00+00:00', 'to': None,
+            'entry_count': 1, 'emotions': [{'name': 'joy', 'count': 1, 'avg_confidence': 80.0}],
+            'series': [{'start': '2024-12-30T00:00:00+00:00', 'entry_count': 1,
+                        'emotions': [{'name': 'joy', 'count': 1, 'avg_confidence': 80.0}]}]
+        }
+
+        response = client.get('/journals/analytics/timeline?bucket=week&from=2025-01-01')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['data']['series'][0]['entry_count'] == 1
+        mock_get_timeline.assert_called_once_with(bucket='week', start='2025-01-01', end=None)
+
+    @patch('app.journals.routes.JournalService.get_emotion_timeline')
+    def test_get_emotion_timeline_invalid_bucket(self, mock_get_timeline, client):
+        """Test that an invalid bucket is a bad request"""
+        mock_get_timeline.side_effect = BadRequestError(message="bucket must be one of day, week, month.")
+
+        response = client.get('/journals/analytics/timeline?bucket=year')
+
+        assert response.status_code == 400
+
+    # ==================== GET /journals/<entry_id>/analysis Tests ====================
+
+    @patch('app.journals.routes.JournalService.get_journal_entry_analysis')
+    def test_get_journal_entry_analysis_pending(self, mock_get_analysis, client):
+        """Test polling the analysis of an entry the worker has not finished"""
+        mock_get_analysis.return_value = {'id': 1, 'analysis_status': 'pending', 'emotions': []}
+
+        response = client.get('/journals/1/analysis')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['data']['analysis_status'] == 'pending'
+        mock_get_analysis.assert_called_once_with(1)
+
+    @patch('app.journals.routes.JournalService.get_journal_entry_analysis')
+    def test_get_journal_entry_analysis_not_found(self, mock_get_analysis, client):
+        """Test polling the analysis of a non-existent journal entry"""
+        mock_get_analysis.side_effect = NotFoundError("Journal entry not found.")
+
+        response = client.get('/journals/999/analysis')
+
+        assert response.status_code == 404
+
     @patch('app.journals.routes.JournalService.get_journal_entry_by_id')
     def test_get_journal_entry_by_id_service_error(self, mock_get_entry, client):
         """Test when service raises an error"""
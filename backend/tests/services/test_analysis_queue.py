@@ -0,0 +1,164 @@
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+
+from app.extentions import db
+from app.models import AnalysisJob, JournalEntry
+from app.emotion_analysis.jobs import AnalysisQueue
+from app.emotion_analysis.worker import AnalysisWorker
+from app.utils.custom_exceptions import BadRequestError, ServiceUnavailableError
+
+
+def create_entry(user, content="Today was great!"):
+    entry = JournalEntry(user_id=user.id, title="My Day", content=content)
+    AnalysisQueue.enqueue(entry)
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+
+class TestAnalysisQueue:
+    """Test suite for the analysis job queue and worker"""
+
+    def test_enqueue_adds_one_queued_job(self, user):
+        """Test that an entry is saved pending with a single queued job"""
+        entry = create_entry(user)
+        AnalysisQueue.enqueue(entry)
+        db.session.commit()
+
+        assert entry.analysis_status == "pending"
+        assert [job.status for job in entry.analysis_jobs] == ["queued"]
+
+    def test_claim_leases_jobs_once(self, user):
+        """Test that a claimed job is not handed out again while its lease lasts"""
+        create_entry(user)
+
+        jobs = AnalysisQueue.claim(10)
+
+        assert len(jobs) == 1
+        assert jobs[0].status == "running"
+        assert jobs[0].attempts == 1
+        assert AnalysisQueue.claim(10) == []
+
+    def test_claim_reclaims_expired_lease(self, user):
+        """Test that jobs of a worker that died are run again"""
+        create_entry(user)
+        job = AnalysisQueue.claim(10)[0]
+        job.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.session.commit()
+
+        assert AnalysisQueue.claim(10) == [job]
+        assert job.attempts == 2
+
+    def test_claim_skips_jobs_backing_off(self, user):
+        """Test that a job scheduled for later is not claimed yet"""
+        entry = create_entry(user)
+        entry.analysis_jobs[0].run_after = datetime.now(timezone.utc) + timedelta(minutes=5)
+        db.session.commit()
+
+        assert AnalysisQueue.claim(10) == []
+
+    @patch('app.emotion_analysis.worker.EmotionAnalysisService.emotion_detection_batch')
+    def test_worker_stores_emotions(self, mock_batch, user):
+        """Test that the worker analyzes a batch and stores its emotions"""
+        first = create_entry(user, "Today was great!")
+        second = create_entry(user, "Today was awful.")
+        mock_batch.return_value = [{"joy": 0.9}, {"sadness": 0.8, "anger": 0.1}]
+
+        claimed = AnalysisWorker(batch_size=16).run_once()
+
+        assert claimed == 2
+        mock_batch.assert_called_once_with(["Today was great!", "Today was awful."])
+        assert first.analysis_status == "done"
+        assert second.emotions == [{"name": "sadness", "confidence": 0.8}, {"name": "anger", "confidence": 0.1}]
+        assert AnalysisJob.query.count() == 0
+
+    @patch('app.emotion_analysis.worker.EmotionAnalysisService.emotion_detection_batch')
+    def test_worker_retries_rejected_item_then_fails(self, mock_batch, user):
+        """Test that a rejected entry is retried with backoff and marked failed at the limit"""
+        entry = create_entry(user)
+        mock_batch.return_value = [BadRequestError(message="Text must be a non-empty string.")]
+
+        AnalysisWorker().run_once()
+        job = entry.analysis_jobs[0]
+
+        assert job.status == "queued"
+        assert job.run_after.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        assert entry.analysis_status == "pending"
+
+        with patch('app.emotion_analysis.jobs.ANALYSIS_MAX_ATTEMPTS', 2):
+            job.run_after = datetime.now(timezone.utc)
+            db.session.commit()
+            AnalysisWorker().run_once()
+
+        assert job.status == "failed"
+        assert job.last_error == "Text must be a non-empty string."
+        assert entry.analysis_status == "failed"
+
+        assert AnalysisQueue.requeue_failed() == 1
+        assert job.status == "queued"
+        assert entry.analysis_status == "pending"
+
+    @patch('app.emotion_analysis.worker.EmotionAnalysisService.emotion_detection_batch')
+    def test_worker_releases_jobs_while_ml_unavailable(self, mock_batch, user):
+        """Test that an outage postpones jobs without using up their attempts"""
+        entry = create_entry(user)
+        mock_batch.side_effect = ServiceUnavailableError(details={"circuit": "open", "retry_in": 20})
+
+        AnalysisWorker().run_once()
+        job = entry.analysis_jobs[0]
+
+        assert job.status == "queued"
+        assert job.attempts == 0
+        assert job.run_after.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(seconds=15)
+
+    @patch('app.emotion_analysis.worker.EmotionAnalysisService.emotion_detection_batch')
+    def test_worker_discards_result_for_edited_entry(self, mock_batch, user):
+        """Test that emotions of outdated content are not stored"""
+        entry = create_entry(user, "Old content")
+
+        def edit_while_running(contents):
+            entry.content = "New content"
+            AnalysisQueue.enqueue(entry)
+            db.session.commit()
+            return [{"joy": 0.9}]
+
+        mock_batch.side_effect = edit_while_running
+
+        AnalysisWorker().run_once()
+
+        assert entry.emotions == []
+        assert entry.analysis_status == "pending"
+        assert [job.status for job in entry.analysis_jobs] == ["queued"]
+
+    @patch('app.emotion_analysis.worker.EmotionAnalysisService.emotion_detection_batch')
+    def test_worker_skips_job_whose_entry_was_deleted(self, mock_batch, user):
+        """Test that an entry deleted after its job was claimed does not hold up the rest of the batch"""
+        deleted = create_entry(user, "Deleted soon")
+        kept = create_entry(user, "Today was great!")
+        deleted_id = deleted.id
+        mock_batch.return_value = [{"joy": 0.9}]
+        claim = AnalysisQueue.claim
+
+        def claim_then_delete(limit):
+            jobs = claim(limit)
+            db.session.execute(db.delete(AnalysisJob).where(AnalysisJob.entry_id == deleted_id))
+            db.session.execute(db.delete(JournalEntry).where(JournalEntry.id == deleted_id))
+            db.session.commit()
+            return jobs
+
+        with patch.object(AnalysisQueue, 'claim', side_effect=claim_then_delete):
+            claimed = AnalysisWorker().run_once()
+
+        assert claimed == 2
+        mock_batch.assert_called_once_with(["Today was great!"])
+        assert kept.analysis_status == "done"
+        assert AnalysisJob.query.count() == 0
+
+    def test_deleting_entry_deletes_jobs(self, user):
+        """Test that queued jobs go away with their entry"""
+        entry = create_entry(user)
+        db.session.delete(entry)
+        db.session.commit()
+
+        assert AnalysisJob.query.count() == 0
@@ -1,15 +1,24 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 import requests
 
-from app.emotion_analysis.services import EmotionAnalysisService
+from app.emotion_analysis import services
+from app.emotion_analysis.services import CircuitBreaker, EmotionAnalysisService, build_session
 from app.utils.custom_exceptions import BadRequestError, ServiceUnavailableError
 
 
+@pytest.fixture(autouse=True)
+def ml_breaker():
+    """Give every test a closed circuit breaker"""
+    breaker = CircuitBreaker(ignored=(BadRequestError,))
+    with patch('app.emotion_analysis.services.ml_breaker', breaker):
+        yield breaker
+
+
 class TestEmotionAnalysisService:
     """Test suite for EmotionAnalysisService class"""
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_success(self, mock_post):
         """Test successful emotion detection with valid text"""
         mock_response = Mock()
@@ -40,10 +49,11 @@ class TestEmotionAnalysisService:
                 "top_k": 28,
                 "strategy": "average"
             },
-            timeout=10
+            headers={"X-Request-Deadline": ANY},
+            timeout=(2, 10)
         )
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_single_emotion(self, mock_post):
         """Test emotion detection returning single emotion"""
         mock_response = Mock()
@@ -60,7 +70,7 @@ class TestEmotionAnalysisService:
         assert len(result) == 1
         assert result["sadness"] == 0.92
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_empty_result(self, mock_post):
         """Test emotion detection with no emotions detected"""
         mock_response = Mock()
@@ -75,7 +85,7 @@ class TestEmotionAnalysisService:
         assert isinstance(result, dict)
         assert len(result) == 0
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_multiple_emotions(self, mock_post):
         """Test emotion detection with many emotions"""
         mock_response = Mock()
@@ -94,7 +104,7 @@ class TestEmotionAnalysisService:
         assert len(result) == 10
         assert all(emotion in result for emotion in [f"emotion_{i}" for i in range(10)])
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_low_confidence_scores(self, mock_post):
         """Test emotion detection with low confidence scores"""
         mock_response = Mock()
@@ -112,7 +122,7 @@ class TestEmotionAnalysisService:
         assert result["joy"] == 0.02
         assert result["sadness"] == 0.01
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_high_confidence_scores(self, mock_post):
         """Test emotion detection with high confidence scores"""
         mock_response = Mock()
@@ -130,7 +140,7 @@ class TestEmotionAnalysisService:
         assert result["joy"] == 0.99
         assert result["excitement"] == 0.95
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_long_text(self, mock_post):
         """Test emotion detection with long text input"""
         mock_response = Mock()
@@ -151,7 +161,7 @@ class TestEmotionAnalysisService:
         call_args = mock_post.call_args
         assert call_args[1]['json']['text'] == long_text
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_special_characters(self, mock_post):
         """Test emotion detection with special characters in text"""
         mock_response = Mock()
@@ -168,7 +178,7 @@ class TestEmotionAnalysisService:
 
         assert result["confusion"] == 0.60
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_api_failure_not_successful(self, mock_post):
         """Test when API returns success=False without status_code"""
         mock_response = Mock()
@@ -183,7 +193,7 @@ class TestEmotionAnalysisService:
 
         assert result is None
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_api_400_error(self, mock_post):
         """Test when API returns 400 Bad Request"""
         mock_response = Mock()
@@ -199,7 +209,7 @@ class TestEmotionAnalysisService:
 
         assert exc_info.value.message == "Invalid input text"
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_api_500_error(self, mock_post):
         """Test when API returns 500 Internal Server Error"""
         mock_response = Mock()
@@ -213,7 +223,34 @@ class TestEmotionAnalysisService:
         with pytest.raises(Exception):
             EmotionAnalysisService.emotion_detection("Test text")
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.time.time', return_value=1000.0)
+    @patch('app.emotion_analysis.services.ml_session.post')
+    def test_emotion_detection_sends_request_deadline(self, mock_post, mock_time):
+        """Test the request carries an absolute deadline matching the client timeout"""
+        mock_response = Mock()
+        mock_response.json.return_value = {"success": True, "data": []}
+        mock_post.return_value = mock_response
+
+        EmotionAnalysisService.emotion_detection("Test text")
+
+        assert mock_post.call_args.kwargs["headers"] == {"X-Request-Deadline": "1012.000"}
+
+    @pytest.mark.parametrize("status_code", [503, 504])
+    @patch('app.emotion_analysis.services.ml_session.post')
+    def test_emotion_detection_overloaded(self, mock_post, status_code):
+        """Test when the ML service sheds the request or its deadline passes"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "success": False,
+            "status_code": status_code,
+            "message": "Service is overloaded, retry later."
+        }
+        mock_post.return_value = mock_response
+
+        with pytest.raises(ServiceUnavailableError):
+            EmotionAnalysisService.emotion_detection("Test text")
+
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_connection_error(self, mock_post):
         """Test when connection to API fails"""
         mock_post.side_effect = requests.ConnectionError("Connection refused")
@@ -223,7 +260,7 @@ class TestEmotionAnalysisService:
 
         assert exc_info.value.message == "Emotion Analysis Service is unavailable."
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_timeout_error(self, mock_post):
         """Test when API request times out"""
         mock_post.side_effect = requests.Timeout("Request timeout")
@@ -233,7 +270,7 @@ class TestEmotionAnalysisService:
 
         assert exc_info.value.message == "Emotion Analysis Service is unavailable."
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_json_decode_error(self, mock_post):
         """Test when API returns invalid JSON"""
         mock_response = Mock()
@@ -243,7 +280,7 @@ class TestEmotionAnalysisService:
         with pytest.raises(ValueError):
             EmotionAnalysisService.emotion_detection("Test text")
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_unexpected_response_format(self, mock_post):
         """Test when API returns unexpected response format"""
         mock_response = Mock()
@@ -260,7 +297,7 @@ class TestEmotionAnalysisService:
 
         assert result == {None: None}
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_missing_data_field(self, mock_post):
         """Test when API response is missing 'data' field"""
         mock_response = Mock()
@@ -273,7 +310,7 @@ class TestEmotionAnalysisService:
         with pytest.raises(TypeError):
             EmotionAnalysisService.emotion_detection("Test text")
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_empty_text(self, mock_post):
         """Test emotion detection with empty string"""
         mock_response = Mock()
@@ -290,7 +327,7 @@ class TestEmotionAnalysisService:
         call_args = mock_post.call_args
         assert call_args[1]['json']['text'] == ""
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_whitespace_text(self, mock_post):
         """Test emotion detection with whitespace-only text"""
         mock_response = Mock()
@@ -304,7 +341,7 @@ class TestEmotionAnalysisService:
 
         assert result == {}
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_unicode_text(self, mock_post):
         """Test emotion detection with unicode characters"""
         mock_response = Mock()
@@ -324,7 +361,7 @@ class TestEmotionAnalysisService:
         call_args = mock_post.call_args
         assert call_args[1]['json']['text'] == unicode_text
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_newlines_in_text(self, mock_post):
         """Test emotion detection with text containing newlines"""
         mock_response = Mock()
@@ -341,7 +378,7 @@ class TestEmotionAnalysisService:
 
         assert result["mixed"] == 0.70
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_api_parameters(self, mock_post):
         """Test that correct parameters are sent to API"""
         mock_response = Mock()
@@ -361,7 +398,7 @@ class TestEmotionAnalysisService:
         assert json_data['strategy'] == "average"
         assert json_data['text'] == "Test"
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_api_url(self, mock_post):
         """Test that correct API URL is used"""
         mock_response = Mock()
@@ -377,7 +414,7 @@ class TestEmotionAnalysisService:
         call_args = mock_post.call_args
         assert call_args[0][0] == 'http://127.0.0.1:5001/api/v1/emotion_detect/'
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_float_scores(self, mock_post):
         """Test that emotion scores are properly handled as floats"""
         mock_response = Mock()
@@ -397,7 +434,7 @@ class TestEmotionAnalysisService:
         assert result["joy"] == 0.123456789
         assert result["sadness"] == 0.987654321
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_zero_scores(self, mock_post):
         """Test emotion detection with zero confidence scores"""
         mock_response = Mock()
@@ -413,7 +450,7 @@ class TestEmotionAnalysisService:
 
         assert result["neutral"] == 0.0
 
-    @patch('app.emotion_analysis.services.requests.post')
+    @patch('app.emotion_analysis.services.ml_session.post')
     def test_emotion_detection_emotion_name_variations(self, mock_post):
         """Test various emotion name formats"""
         mock_response = Mock()
@@ -434,3 +471,197 @@ class TestEmotionAnalysisService:
         assert "fear_anxiety" in result
         assert "Sadness" in result
         assert "ANGER" in result
+
+    @patch('app.emotion_analysis.services.ml_session.post')
+    def test_emotion_detection_batch(self, mock_post):
+        """Test batch detection returns emotions per text and errors in place"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "success": True,
+            "data": [
+                {"index": 0, "success": True, "emotions": [{"emotion": "joy", "score": 0.9}]},
+                {"index": 1, "success": False, "error": "Text must be a non-empty string."}
+            ]
+        }
+        mock_post.return_value = mock_response
+
+        results = EmotionAnalysisService.emotion_detection_batch(["Happy", " "])
+
+        assert results[0] == {"joy": 0.9}
+        assert isinstance(results[1], BadRequestError)
+        assert results[1].message == "Text must be a non-empty string."
+        assert mock_post.call_args[0][0] == f'{services.ML_SERVICE_URL}/api/v1/emotion_detect/batch'
+        assert mock_post.call_args.kwargs['json']['texts'] == ["Happy", " "]
+        assert mock_post.call_args.kwargs['timeout'] == (
+            services.ML_SERVICE_CONNECT_TIMEOUT, services.ML_SERVICE_BATCH_READ_TIMEOUT
+        )
+
+
+class TestMLServiceSession:
+    """Test suite for the pooled session used to reach the ML service"""
+
+    @pytest.fixture
+    def stub_server(self):
+        from benchmarks.bench_ml_client import start_stub_server
+
+        server, base_url = start_stub_server()
+        with patch('app.emotion_analysis.services.ML_SERVICE_URL', base_url):
+            yield server
+        server.shutdown()
+
+    def test_session_retries_connect_errors_only(self):
+        """Test that only connection failures are retried, with jittered backoff"""
+        adapter = build_session(pool_size=8, retries=3).get_adapter('http://ml-service:5001')
+
+        assert adapter._pool_maxsize == 8
+        assert adapter.max_retries.connect == 3
+        assert adapter.max_retries.read == 0
+        assert adapter.max_retries.status == 0
+        assert adapter.max_retries.backoff_jitter > 0
+
+    def test_connections_are_reused(self, stub_server):
+        """Test that consecutive predictions share one keep-alive connection"""
+        with patch('app.emotion_analysis.services.ml_session', build_session()):
+            for _ in range(5):
+                assert EmotionAnalysisService.emotion_detection("Test text") == {"joy": 0.9, "neutral": 0.1}
+
+        assert stub_server.connections == 1
+
+    def test_read_timeout_is_not_retried(self, stub_server):
+        """Test that a request the ML service received is not sent again"""
+        stub_server.service_seconds = 0.3
+
+        with patch('app.emotion_analysis.services.ml_session', build_session()), \
+             patch('app.emotion_analysis.services.ML_SERVICE_READ_TIMEOUT', 0.05):
+            with pytest.raises(ServiceUnavailableError):
+                EmotionAnalysisService.emotion_detection("Test text")
+
+        assert stub_server.connections == 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test suite for the circuit breaker around ML service calls"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(failure_threshold=3, slow_call_seconds=5, reset_seconds=30,
+                              ignored=(BadRequestError,), clock=clock)
+
+    def fail(self):
+        raise ServiceUnavailableError(message="down")
+
+    def trip(self, breaker):
+        for _ in range(breaker.failure_threshold):
+            with pytest.raises(ServiceUnavailableError):
+                breaker.call(self.fail)
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        """Test that the circuit opens and then fails fast without calling"""
+        self.trip(breaker)
+        fn = Mock()
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            breaker.call(fn)
+
+        fn.assert_not_called()
+        assert exc_info.value.details["circuit"] == "open"
+        assert breaker.stats()["state"] == "open"
+        assert breaker.stats()["rejected"] == 1
+
+    def test_success_resets_failure_count(self, breaker):
+        """Test that only consecutive failures open the circuit"""
+        for _ in range(2):
+            with pytest.raises(ServiceUnavailableError):
+                breaker.call(self.fail)
+        breaker.call(lambda: {"joy": 0.9})
+        for _ in range(2):
+            with pytest.raises(ServiceUnavailableError):
+                breaker.call(self.fail)
+
+        assert breaker.state == "closed"
+
+    def test_rejected_input_is_not_a_failure(self, breaker):
+        """Test that a 400 from the ML service does not count against it"""
+        def reject():
+            raise BadRequestError(message="bad text")
+
+        for _ in range(5):
+            with pytest.raises(BadRequestError):
+                breaker.call(reject)
+
+        assert breaker.state == "closed"
+
+    def test_slow_calls_open_the_circuit(self, breaker, clock):
+        """Test that calls slower than the threshold count as failures"""
+        def slow():
+            clock.now += 6
+            return {"joy": 0.9}
+
+        for _ in range(3):
+            assert breaker.call(slow) == {"joy": 0.9}
+
+        assert breaker.state == "open"
+        assert breaker.stats()["slow_calls"] == 3
+
+    def test_half_open_trial_success_closes(self, breaker, clock):
+        """Test that a successful trial after the reset timeout closes the circuit"""
+        self.trip(breaker)
+        clock.now += 30
+
+        assert breaker.state == "half_open"
+        assert breaker.call(lambda: {"joy": 0.9}) == {"joy": 0.9}
+        assert breaker.state == "closed"
+
+    def test_half_open_trial_failure_reopens(self, breaker, clock):
+        """Test that a failed trial opens the circuit for another reset period"""
+        self.trip(breaker)
+        clock.now += 30
+
+        with pytest.raises(ServiceUnavailableError):
+            breaker.call(self.fail)
+
+        assert breaker.state == "open"
+        assert breaker.stats()["retry_in"] == 30
+
+    def test_half_open_allows_limited_trials(self, breaker, clock):
+        """Test that other callers keep failing fast while a trial is in flight"""
+        self.trip(breaker)
+        clock.now += 30
+        fn = Mock()
+
+        def trial():
+            with pytest.raises(ServiceUnavailableError):
+                breaker.call(fn)
+            return {"joy": 0.9}
+
+        breaker.call(trial)
+
+        fn.assert_not_called()
+        assert breaker.state == "closed"
+
+    @patch('app.emotion_analysis.services.ml_session.post')
+    def test_emotion_detection_fails_fast_when_open(self, mock_post, ml_breaker):
+        """Test that an open circuit skips the HTTP call entirely"""
+        mock_post.side_effect = requests.ConnectionError("Connection refused")
+        for _ in range(ml_breaker.failure_threshold):
+            with pytest.raises(ServiceUnavailableError):
+                EmotionAnalysisService.emotion_detection("Test text")
+        mock_post.reset_mock()
+
+        with pytest.raises(ServiceUnavailableError):
+            EmotionAnalysisService.emotion_detection("Test text")
+
+        mock_post.assert_not_called()
+        assert EmotionAnalysisService.breaker_status()["state"] == "open"
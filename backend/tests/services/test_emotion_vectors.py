@@ -0,0 +1,93 @@
+import math
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extentions import db
+from app.models import EmotionLabelSet, EmotionVector, EmotionVectorType, JournalEntry
+
+
+def create_entry(user_id, emotions):
+    entry = JournalEntry(user_id=user_id, title="My Day", content="Today was great!")
+    entry.set_emotions(emotions)
+    db.session.add(entry)
+    db.session.commit()
+    entry_id = entry.id
+    db.session.expunge_all()
+    return entry_id
+
+
+class TestEmotionVectors:
+    """Test suite for the per-entry emotion vector storage"""
+
+    def test_emotions_round_trip_in_one_row(self, user):
+        """Test that all scores of an entry are stored in a single packed row"""
+        entry_id = create_entry(user.id, {"joy": 85.23, "sadness": 3.5, "anger": 11.27})
+
+        entry = db.session.get(JournalEntry, entry_id)
+
+        assert entry.emotions == [
+            {"name": "joy", "confidence": 85.23},
+            {"name": "anger", "confidence": 11.27},
+            {"name": "sadness", "confidence": 3.5},
+        ]
+        assert EmotionVector.query.count() == 1
+        stored = db.session.execute(text("SELECT scores FROM emotion_vectors")).scalar_one()
+        assert len(stored) == 3 * 4
+
+    def test_unknown_label_adds_label_set_version(self, user):
+        """Test that a new label extends the label set without breaking older vectors"""
+        user_id = user.id
+        first_id = create_entry(user_id, {"joy": 90.0, "sadness": 10.0})
+        second_id = create_entry(user_id, {"joy": 60.0, "relief": 40.0})
+
+        label_sets = EmotionLabelSet.query.order_by(EmotionLabelSet.version).all()
+        assert [label_set.labels for label_set in label_sets] == [["joy", "sadness"], ["joy", "sadness", "relief"]]
+
+        first = db.session.get(JournalEntry, first_id)
+        second = db.session.get(JournalEntry, second_id)
+        assert first.emotion_vector.label_set_version == 1
+        assert first.emotions == [{"name": "joy", "confidence": 90.0}, {"name": "sadness", "confidence": 10.0}]
+        # Labels the ML service did not return are left out, as before
+        assert second.emotions == [{"name": "joy", "confidence": 60.0}, {"name": "relief", "confidence": 40.0}]
+
+    def test_known_labels_reuse_latest_label_set(self, user):
+        """Test that a subset of known labels does not create a new version"""
+        user_id = user.id
+        create_entry(user_id, {"joy": 90.0, "sadness": 10.0})
+        create_entry(user_id, {"sadness": 100.0})
+
+        assert EmotionLabelSet.query.count() == 1
+
+    def test_clear_emotions_deletes_vector(self, user):
+        """Test that clearing emotions removes the entry's vector row"""
+        entry_id = create_entry(user.id, {"joy": 90.0})
+        entry = db.session.get(JournalEntry, entry_id)
+
+        entry.clear_emotions()
+        db.session.commit()
+
+        assert entry.emotions == []
+        assert EmotionVector.query.count() == 0
+
+    def test_deleting_entry_deletes_vector(self, user):
+        """Test that the vector goes away with its entry"""
+        entry_id = create_entry(user.id, {"joy": 90.0})
+
+        db.session.delete(db.session.get(JournalEntry, entry_id))
+        db.session.commit()
+
+        assert EmotionVector.query.count() == 0
+
+    def test_vector_type_uses_real_array_on_postgresql(self):
+        """Test that PostgreSQL gets a REAL[] and other databases packed float32 bytes"""
+        vector_type = EmotionVectorType()
+        pg_dialect = postgresql.dialect()
+        sqlite_dialect = sqlite.dialect()
+
+        assert isinstance(vector_type.load_dialect_impl(pg_dialect), postgresql.ARRAY)
+        assert vector_type.process_bind_param([0.5, 2], pg_dialect) == [0.5, 2.0]
+
+        packed = vector_type.process_bind_param([0.5, math.nan], sqlite_dialect)
+        assert len(packed) == 8
+        unpacked = vector_type.process_result_value(packed, sqlite_dialect)
+        assert unpacked[0] == 0.5 and math.isnan(unpacked[1])
@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+
+from app.extentions import db
+from app.models import JournalEntry, User
+from app.journals.services import JournalService
+from app.utils.custom_exceptions import BadRequestError
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def entries(user):
+    """25 entries; every third pair shares a timestamp to exercise the id tie-breaker"""
+    created = []
+    for i in range(25):
+        entry = JournalEntry(
+            user_id=user.id, title=f"Entry {i}", content=f"Content {i}",
+            created_at=START + timedelta(hours=i // 2)
+        )
+        db.session.add(entry)
+        created.append(entry)
+
+    other = User(first_name="Other", last_name="User", email="other@example.com")
+    other._password_hash = "not-a-real-hash"
+    db.session.add(other)
+    db.session.flush()
+    db.session.add(JournalEntry(user_id=other.id, title="Not mine", content="Hidden", created_at=START))
+    db.session.commit()
+
+    with patch('app.journals.services.current_user', user):
+        yield created
+
+
+class TestJournalPagination:
+    """Test suite for keyset pagination of journal entries"""
+
+    def test_first_page_is_newest_first(self, entries):
+        """Test the default page size and ordering"""
+        page = JournalService.get_journal_entries()
+
+        assert page["limit"] == JournalService.page_size
+        assert len(page["entries"]) == JournalService.page_size
+        assert page["entries"][0]["title"] == "Entry 24"
+        assert page["next_cursor"] is not None
+
+    def test_cursor_walks_every_entry_once(self, entries):
+        """Test that following next_cursor returns each entry exactly once, in order"""
+        seen = []
+        cursor = None
+        while True:
+            page = JournalService.get_journal_entries(cursor=cursor, limit=4)
+            seen.extend(entry["id"] for entry in page["entries"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        expected = sorted(entries, key=lambda entry: (entry.created_at, entry.id), reverse=True)
+        assert seen == [entry.id for entry in expected]
+
+    def test_new_entries_do_not_shift_later_pages(self, entries, user):
+        """Test that a page fetched by cursor is stable while new entries are written"""
+        first = JournalService.get_journal_entries(limit=5)
+        second = JournalService.get_journal_entries(cursor=first["next_cursor"], limit=5)
+
+        db.session.add(JournalEntry(user_id=user.id, title="Newest", content="New",
+                                    created_at=START + timedelta(days=30)))
+        db.session.commit()
+
+        assert JournalService.get_journal_entries(cursor=first["next_cursor"], limit=5) == second
+
+    def test_last_page_has_no_cursor(self, entries):
+        """Test that the final page ends the iteration"""
+        page = JournalService.get_journal_entries(limit=25)
+
+        assert len(page["entries"]) == 25
+        assert page["next_cursor"] is None
+
+    def test_all_entries_opt_in(self, entries):
+        """Test the legacy unbounded list of the user's entries"""
+        result = JournalService.get_journal_entries(all_entries=True)
+
+        assert isinstance(result, list)
+        assert len(result) == 25
+
+    @pytest.mark.parametrize("limit", [0, -1, 101, "many"])
+    def test_invalid_limit(self, entries, limit):
+        """Test that page sizes outside 1..max_page_size are rejected"""
+        with pytest.raises(BadRequestError):
+            JournalService.get_journal_entries(limit=limit)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "eyJpZCI6IDF9"])
+    def test_invalid_cursor(self, entries, cursor):
+        """Test that malformed or tampered cursors are rejected"""
+        with pytest.raises(BadRequestError) as exc_info:
+            JournalService.get_journal_entries(cursor=cursor)
+
+        assert exc_info.value.message == "Invalid cursor."
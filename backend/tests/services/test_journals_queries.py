@@ -0,0 +1,84 @@
+import pytest
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+from sqlalchemy import event
+
+from app.extentions import db
+from app.models import JournalEntry
+from app.journals.services import JournalService
+
+EMOTIONS_PER_ENTRY = 28
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements sent to the database inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def add_entries(user, count):
+    user_id = user.id
+    for i in range(count):
+        entry = JournalEntry(user_id=user_id, title=f"Entry {i}", content=f"Content {i}")
+        entry.set_emotions({f"emotion_{k}": k + 1 for k in range(EMOTIONS_PER_ENTRY)})
+        db.session.add(entry)
+    db.session.commit()
+    # Start every measurement with nothing cached in the session
+    db.session.expunge_all()
+
+
+@pytest.fixture
+def as_user(user):
+    # A plain stand-in, so reading current_user.id never touches the database
+    with patch('app.journals.services.current_user', Mock(id=user.id)):
+        yield user
+
+
+class TestJournalQueryCount:
+    """Regression tests for N+1 emotion loading"""
+
+    @pytest.mark.parametrize("count", [1, 5, 20])
+    def test_page_query_count_is_constant(self, as_user, count):
+        """Test that a page costs one SELECT for entries and one for all their emotions"""
+        add_entries(as_user, count)
+
+        with count_queries() as statements:
+            page = JournalService.get_journal_entries(limit=20)
+
+        assert len(page["entries"]) == count
+        assert all(len(entry["emotions"]) == EMOTIONS_PER_ENTRY for entry in page["entries"])
+        assert len(statements) == 2
+
+    @pytest.mark.parametrize("count", [1, 30])
+    def test_all_entries_query_count_is_constant(self, as_user, count):
+        """Test that the unpaginated list does not query emotions per entry"""
+        add_entries(as_user, count)
+
+        with count_queries() as statements:
+            result = JournalService.get_journal_entries(all_entries=True)
+
+        assert len(result) == count
+        assert len(statements) == 2
+
+    def test_detail_query_count(self, as_user):
+        """Test that a single entry and its emotions load in two statements"""
+        add_entries(as_user, 1)
+        entry_id = JournalEntry.query.first().id
+        db.session.expunge_all()
+
+        with count_queries() as statements:
+            entry = JournalService.get_journal_entry_by_id(entry_id)
+            analysis = JournalService.get_journal_entry_analysis(entry_id)
+
+        assert len(entry["emotions"]) == EMOTIONS_PER_ENTRY
+        assert len(analysis["emotions"]) == EMOTIONS_PER_ENTRY
+        assert len(statements) == 4
@@ -48,7 +48,7 @@ class TestJournalService:
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_get_journal_entries_success(self, mock_current_user, mock_journal_class, mock_journal_entry):
-        """Test getting all journal entries for a user"""
+        """Test getting all journal entries for a user with the legacy opt-in"""
         mock_current_user.id = 1
         mock_journal_entry2 = Mock()
         mock_journal_entry2.to_dict.return_value = {
@@ -58,49 +58,49 @@ class TestJournalService:
             "created_at": datetime.now(timezone.utc).isoformat(),
             "emotions": []
         }
-        mock_journal_class.query.filter_by.return_value.all.return_value = [
+        mock_journal_class.query_with_emotions.return_value.filter_by.return_value.all.return_value = [
             mock_journal_entry,
             mock_journal_entry2
         ]
 
-        result = JournalService.get_journal_entries()
+        result = JournalService.get_journal_entries(all_entries=True)
 
         assert len(result) == 2
         assert result[0]["id"] == 1
         assert result[1]["id"] == 2
-        mock_journal_class.query.filter_by.assert_called_once_with(user_id=1)
+        mock_journal_class.query_with_emotions.return_value.filter_by.assert_called_once_with(user_id=1)
 
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_get_journal_entries_empty(self, mock_current_user, mock_journal_class):
         """Test getting journal entries when user has none"""
         mock_current_user.id = 1
-        mock_journal_class.query.filter_by.return_value.all.return_value = []
+        mock_journal_class.query_with_emotions.return_value.filter_by.return_value.all.return_value = []
 
-        result = JournalService.get_journal_entries()
+        result = JournalService.get_journal_entries(all_entries=True)
 
         assert result == []
-        mock_journal_class.query.filter_by.assert_called_once_with(user_id=1)
+        mock_journal_class.query_with_emotions.return_value.filter_by.assert_called_once_with(user_id=1)
 
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_get_journal_entry_by_id_success(self, mock_current_user, mock_journal_class, mock_journal_entry):
         """Test getting a specific journal entry by ID"""
         mock_current_user.id = 1
-        mock_journal_class.query.filter_by.return_value.first.return_value = mock_journal_entry
+        mock_journal_class.query_with_emotions.return_value.filter_by.return_value.first.return_value = mock_journal_entry
 
         result = JournalService.get_journal_entry_by_id(1)
 
         assert result["id"] == 1
         assert result["title"] == "Test Entry"
-        mock_journal_class.query.filter_by.assert_called_once_with(id=1, user_id=1)
+        mock_journal_class.query_with_emotions.return_value.filter_by.assert_called_once_with(id=1, user_id=1)
 
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_get_journal_entry_by_id_not_found(self, mock_current_user, mock_journal_class):
         """Test getting a journal entry that doesn't exist"""
         mock_current_user.id = 1
-        mock_journal_class.query.filter_by.return_value.first.return_value = None
+        mock_journal_class.query_with_emotions.return_value.filter_by.return_value.first.return_value = None
 
         with pytest.raises(NotFoundError) as exc_info:
             JournalService.get_journal_entry_by_id(999)
@@ -108,15 +108,13 @@ class TestJournalService:
         assert exc_info.value.message == "Journal entry not found."
 
     @patch('app.journals.services.db.session')
-    @patch('app.journals.services.EmotionAnalysisService')
-    @patch('app.journals.services.Emotion')
+    @patch('app.journals.services.AnalysisQueue')
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_create_journal_entry_success(
-        self, mock_current_user, mock_journal_class, mock_emotion_class,
-        mock_emotion_service, mock_db_session
+        self, mock_current_user, mock_journal_class, mock_analysis_queue, mock_db_session
     ):
-        """Test creating a new journal entry with emotion analysis"""
+        """Test creating a new journal entry queues its emotion analysis"""
         mock_current_user.id = 1
         mock_entry_instance = Mock()
         mock_entry_instance.id = 1
@@ -129,7 +127,6 @@ class TestJournalService:
             "emotions": [{"name": "joy", "confidence": 0.9}]
         }
         mock_journal_class.return_value = mock_entry_instance
-        mock_emotion_service.emotion_detection.return_value = {"joy": 0.9, "excitement": 0.7}
 
         data = {
             "title": "My Day",
@@ -144,7 +141,7 @@ class TestJournalService:
             title="My Day",
             content="Today was great!"
         )
-        mock_emotion_service.emotion_detection.assert_called_once_with("Today was great!")
+        mock_analysis_queue.enqueue.assert_called_once_with(mock_entry_instance)
         mock_db_session.add.assert_called_once()
         mock_db_session.commit.assert_called_once()
 
@@ -197,11 +194,11 @@ class TestJournalService:
         assert exc_info.value.message == "content is required."
 
     @patch('app.journals.services.db.session')
-    @patch('app.journals.services.EmotionAnalysisService')
+    @patch('app.journals.services.AnalysisQueue')
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_create_journal_entry_database_error(
-        self, mock_current_user, mock_journal_class, mock_emotion_service, mock_db_session
+        self, mock_current_user, mock_journal_class, mock_analysis_queue, mock_db_session
     ):
         """Test creating entry when database commit fails"""
         mock_current_user.id = 1
@@ -209,7 +206,6 @@ class TestJournalService:
         mock_entry_instance.id = 1
         mock_entry_instance.emotions = []
         mock_journal_class.return_value = mock_entry_instance
-        mock_emotion_service.emotion_detection.return_value = {"joy": 0.9}
         mock_db_session.commit.side_effect = Exception("Database error")
 
         data = {"title": "My Day", "content": "Today was great!"}
@@ -238,55 +234,46 @@ class TestJournalService:
         mock_db_session.commit.assert_called_once()
 
     @patch('app.journals.services.db.session')
-    @patch('app.journals.services.EmotionAnalysisService')
-    @patch('app.journals.services.Emotion')
+    @patch('app.journals.services.AnalysisQueue')
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_update_journal_entry_content_only(
-        self, mock_current_user, mock_journal_class, mock_emotion_class,
-        mock_emotion_service, mock_db_session, mock_journal_entry
+        self, mock_current_user, mock_journal_class, mock_analysis_queue,
+        mock_db_session, mock_journal_entry
     ):
         """Test updating only the content (triggers emotion re-analysis)"""
         mock_current_user.id = 1
         mock_journal_entry.content = "Old content"
-        mock_journal_entry.emotions = Mock()
-        mock_journal_entry.emotions.clear = Mock()
-        mock_journal_entry.emotions.append = Mock()
         mock_journal_class.query.filter_by.return_value.first.return_value = mock_journal_entry
-        mock_emotion_service.emotion_detection.return_value = {"sadness": 0.8}
 
         data = {"content": "New content"}
         result = JournalService.update_journal_entry(1, data)
 
         assert mock_journal_entry.content == "New content"
-        mock_journal_entry.emotions.clear.assert_called_once()
-        mock_emotion_service.emotion_detection.assert_called_once_with("New content")
+        mock_journal_entry.clear_emotions.assert_called_once()
+        mock_analysis_queue.enqueue.assert_called_once_with(mock_journal_entry)
         mock_db_session.commit.assert_called_once()
 
     @patch('app.journals.services.db.session')
-    @patch('app.journals.services.EmotionAnalysisService')
+    @patch('app.journals.services.AnalysisQueue')
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_update_journal_entry_both_fields(
-        self, mock_current_user, mock_journal_class,
-        mock_emotion_service, mock_db_session, mock_journal_entry
+        self, mock_current_user, mock_journal_class, mock_analysis_queue,
+        mock_db_session, mock_journal_entry
     ):
         """Test updating both title and content"""
         mock_current_user.id = 1
         mock_journal_entry.title = "Old Title"
         mock_journal_entry.content = "Old content"
-        mock_journal_entry.emotions = Mock()
-        mock_journal_entry.emotions.clear = Mock()
-        mock_journal_entry.emotions.append = Mock()
         mock_journal_class.query.filter_by.return_value.first.return_value = mock_journal_entry
-        mock_emotion_service.emotion_detection.return_value = {"joy": 0.9}
 
         data = {"title": "New Title", "content": "New content"}
         result = JournalService.update_journal_entry(1, data)
 
         assert mock_journal_entry.title == "New Title"
         assert mock_journal_entry.content == "New content"
-        mock_emotion_service.emotion_detection.assert_called_once()
+        mock_analysis_queue.enqueue.assert_called_once_with(mock_journal_entry)
         mock_db_session.commit.assert_called_once()
 
     @patch('app.journals.services.JournalEntry')
@@ -362,25 +349,42 @@ class TestJournalService:
         mock_db_session.commit.assert_called_once()
 
     @patch('app.journals.services.db.session')
-    @patch('app.journals.services.EmotionAnalysisService')
+    @patch('app.journals.services.AnalysisQueue')
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_update_journal_entry_same_content_no_reanalysis(
-        self, mock_current_user, mock_journal_class, mock_emotion_service, mock_db_session, mock_journal_entry
+        self, mock_current_user, mock_journal_class, mock_analysis_queue, mock_db_session, mock_journal_entry
     ):
         """Test updating with same content doesn't trigger emotion re-analysis"""
         mock_current_user.id = 1
         mock_journal_entry.content = "Same content"
-        mock_journal_entry.emotions = Mock()
-        mock_journal_entry.emotions.clear = Mock()
         mock_journal_class.query.filter_by.return_value.first.return_value = mock_journal_entry
 
         data = {"content": "Same content"}
         result = JournalService.update_journal_entry(1, data)
 
         # Emotions should not be cleared or re-analyzed
-        mock_journal_entry.emotions.clear.assert_not_called()
-        mock_emotion_service.emotion_detection.assert_not_called()
+        mock_journal_entry.clear_emotions.assert_not_called()
+        mock_analysis_queue.enqueue.assert_not_called()
+        mock_db_session.commit.assert_called_once()
+
+    @patch('app.journals.services.db.session')
+    @patch('app.journals.services.AnalysisQueue')
+    @patch('app.journals.services.JournalEntry')
+    @patch('app.journals.services.current_user', new_callable=MagicMock)
+    def test_update_journal_entry_title_retries_failed_analysis(
+        self, mock_current_user, mock_journal_class, mock_analysis_queue, mock_db_session, mock_journal_entry
+    ):
+        """Test that saving an entry whose analysis failed queues it again"""
+        mock_current_user.id = 1
+        mock_journal_class.ANALYSIS_FAILED = "failed"
+        mock_journal_entry.analysis_status = "failed"
+        mock_journal_class.query.filter_by.return_value.first.return_value = mock_journal_entry
+
+        JournalService.update_journal_entry(1, {"title": "New Title"})
+
+        mock_journal_entry.clear_emotions.assert_not_called()
+        mock_analysis_queue.enqueue.assert_called_once_with(mock_journal_entry)
         mock_db_session.commit.assert_called_once()
 
     @patch('app.journals.services.db.session')
@@ -449,11 +453,11 @@ class TestJournalService:
         mock_db_session.rollback.assert_called_once()
 
     @patch('app.journals.services.db.session')
-    @patch('app.journals.services.EmotionAnalysisService')
+    @patch('app.journals.services.AnalysisQueue')
     @patch('app.journals.services.JournalEntry')
     @patch('app.journals.services.current_user', new_callable=MagicMock)
     def test_create_journal_entry_strips_whitespace(
-        self, mock_current_user, mock_journal_class, mock_emotion_service, mock_db_session
+        self, mock_current_user, mock_journal_class, mock_analysis_queue, mock_db_session
     ):
         """Test that create strips whitespace from title and content"""
         mock_current_user.id = 1
@@ -462,7 +466,6 @@ class TestJournalService:
         mock_entry_instance.emotions = []
         mock_entry_instance.to_dict.return_value = {"id": 1}
         mock_journal_class.return_value = mock_entry_instance
-        mock_emotion_service.emotion_detection.return_value = {}
 
         data = {
             "title": "  My Day  ",
@@ -477,7 +480,7 @@ class TestJournalService:
             title="My Day",
             content="Today was great!"
         )
-        mock_emotion_service.emotion_detection.assert_called_once_with("Today was great!")
+        mock_analysis_queue.enqueue.assert_called_once_with(mock_entry_instance)
 
     @patch('app.journals.services.db.session')
     @patch('app.journals.services.JournalEntry')
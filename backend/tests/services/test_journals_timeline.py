@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import Mock, patch
+from datetime import datetime, timezone
+from sqlalchemy.orm import Query
+from sqlalchemy.dialects import postgresql
+
+from app.extentions import db
+from app.models import JournalEntry, User
+from app.journals.services import JournalService
+from app.utils.custom_exceptions import BadRequestError
+
+
+def at(day, hour=12, month=1):
+    return datetime(2025, month, day, hour, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def timeline_user(user):
+    """Entries on Wed 1, Thu 2 and Mon 6 January and Sat 1 February 2025, one still pending"""
+    user_id = user.id
+    analyses = [
+        (at(1), {"joy": 80.0, "sadness": 20.0}),
+        (at(1, hour=23), {"joy": 60.0, "anger": 40.0}),
+        (at(2), {"sadness": 90.0, "joy": 10.0}),
+        (at(6), {"joy": 50.0, "relief": 50.0}),
+        (at(1, month=2), {"anger": 70.0, "joy": 30.0}),
+        (at(1, month=2, hour=15), None),
+    ]
+    for created_at, emotions in analyses:
+        entry = JournalEntry(user_id=user_id, title="Entry", content="Content", created_at=created_at)
+        if emotions:
+            entry.set_emotions(emotions)
+        db.session.add(entry)
+
+    other = User(first_name="Other", last_name="User", email="other@example.com")
+    other._password_hash = "not-a-real-hash"
+    db.session.add(other)
+    db.session.flush()
+    hidden = JournalEntry(user_id=other.id, title="Not mine", content="Hidden", created_at=at(1))
+    hidden.set_emotions({"fear": 99.0})
+    db.session.add(hidden)
+    db.session.commit()
+
+    with patch('app.journals.services.current_user', Mock(id=user_id)):
+        yield user_id
+
+
+class TestEmotionTimeline:
+    """Test suite for the emotion timeline aggregation"""
+
+    def test_daily_buckets(self, timeline_user):
+        """Test entry counts and per-emotion averages for each day"""
+        timeline = JournalService.get_emotion_timeline(bucket="day")
+
+        assert [item["start"] for item in timeline["series"]] == [
+            "2025-01-01T00:00:00+00:00", "2025-01-02T00:00:00+00:00",
+            "2025-01-06T00:00:00+00:00", "2025-02-01T00:00:00+00:00",
+        ]
+        first_day = timeline["series"][0]
+        assert first_day["entry_count"] == 2
+        assert first_day["emotions"] == [
+            {"name": "joy", "count": 2, "avg_confidence": 70.0},
+            {"name": "anger", "count": 1, "avg_confidence": 40.0},
+            {"name": "sadness", "count": 1, "avg_confidence": 20.0},
+        ]
+        # The pending entry counts, but has no emotions yet
+        assert timeline["series"][-1]["entry_count"] == 2
+        assert timeline["entry_count"] == 6
+
+    def test_weekly_buckets_start_on_monday(self, timeline_user):
+        """Test that weeks are grouped from Monday like date_trunc('week')"""
+        timeline = JournalService.get_emotion_timeline(bucket="week")
+
+        assert [(item["start"], item["entry_count"]) for item in timeline["series"]] == [
+            ("2024-12-30T00:00:00+00:00", 3),
+            ("2025-01-06T00:00:00+00:00", 1),
+            ("2025-01-27T00:00:00+00:00", 2),
+        ]
+
+    def test_monthly_buckets_and_totals(self, timeline_user):
+        """Test month buckets and the totals over the whole range"""
+        timeline = JournalService.get_emotion_timeline(bucket="month")
+
+        assert [(item["start"], item["entry_count"]) for item in timeline["series"]] == [
+            ("2025-01-01T00:00:00+00:00", 4),
+            ("2025-02-01T00:00:00+00:00", 2),
+        ]
+        assert timeline["emotions"][0] == {"name": "joy", "count": 5, "avg_confidence": 46.0}
+        assert {emotion["name"] for emotion in timeline["emotions"]} == {"joy", "sadness", "anger", "relief"}
+
+    def test_range_is_start_inclusive_end_exclusive(self, timeline_user):
+        """Test filtering by from and to"""
+        timeline = JournalService.get_emotion_timeline(bucket="day", start="2025-01-02", end="2025-01-06T12:00:00Z")
+
+        assert [item["start"] for item in timeline["series"]] == ["2025-01-02T00:00:00+00:00"]
+        assert timeline["from"] == "2025-01-02T00:00:00+00:00"
+        assert timeline["to"] == "2025-01-06T12:00:00+00:00"
+
+    def test_empty_range(self, timeline_user):
+        """Test a range without entries"""
+        timeline = JournalService.get_emotion_timeline(start="2030-01-01")
+
+        assert timeline["entry_count"] == 0
+        assert timeline["emotions"] == []
+        assert timeline["series"] == []
+
+    @pytest.mark.parametrize("kwargs", [
+        {"bucket": "year"},
+        {"start": "yesterday"},
+        {"start": "2025-02-01", "end": "2025-01-01"},
+    ])
+    def test_invalid_parameters(self, timeline_user, kwargs):
+        """Test that invalid buckets and ranges are rejected"""
+        with pytest.raises(BadRequestError):
+            JournalService.get_emotion_timeline(**kwargs)
+
+    def test_postgresql_aggregates_in_sql(self, timeline_user):
+        """Test that PostgreSQL groups with date_trunc and unnests the vectors in SQL"""
+        statements = []
+
+        def compile_only(query):
+            statements.append(str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})))
+            return []
+
+        bind = Mock()
+        bind.dialect.name = 'postgresql'
+        with patch.object(db.session, 'get_bind', return_value=bind), patch.object(Query, 'all', compile_only):
+            timeline = JournalService.get_emotion_timeline(bucket="week")
+
+        assert timeline["series"] == []
+        assert len(statements) == 2
+        assert all("date_trunc('week', timezone('UTC', journal_entries.created_at))" in sql for sql in statements)
+        assert "unnest(emotion_vectors.scores) WITH ORDINALITY AS scores(score, position)" in statements[1]
+        assert "GROUP BY" in statements[1]
@@ -2,6 +2,12 @@ from flask import Flask
 from .config import Config
 from .extentions import cors
 from .emotion.emotion_detection import EmotionDetection
+from .emotion.batching import batcher
+from .emotion.cache import prediction_cache
+from .emotion.disk_cache import disk_cache
+from .emotion.metrics import metrics
+from .emotion.singleflight import singleflight
+from .emotion.admission import admission
 from .utils.error_handlers import registor_error_handlers
 
 def create_app():
@@ -17,6 +23,18 @@ def create_app():
     app.register_blueprint(emotion_bp, url_prefix='/api/v1/emotion_detect')
 
     with app.app_context():
+        EmotionDetection.configure(app.config)
         EmotionDetection.load_model()
+
+    batcher.init_app(app, runner=EmotionDetection._predict_chunks)
+    prediction_cache.init_app(app)
+    disk_cache.init_app(app, EmotionDetection.model_version)
+    metrics.init_app(app)
+    singleflight.init_app(app)
+    admission.init_app(app)
+
+    # Forked workers warm up in post_fork; torch must not run kernels in the master
+    if not app.config.get("GUNICORN_PRELOAD"):
+        EmotionDetection.warmup()
     
     return app
\ No newline at end of file
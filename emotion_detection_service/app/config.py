@@ -9,4 +9,55 @@ class Config():
     DEBUG = True
     TESTING = True
 
+    # "torch" (eager PyTorch) or "onnx" (ONNX Runtime, see app/emotion/onnx_export.py)
+    INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+    ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH")
+
+    # "dynamic" serves INT8 Linear layers once app/emotion/quantization.py approves them
+    QUANTIZATION = os.getenv("QUANTIZATION", "none")
+    QUANTIZATION_MAX_F1_DROP = float(os.getenv("QUANTIZATION_MAX_F1_DROP", 0.01))
+
+    # "longest" pads each batch to its longest row, "max_length" to 512 tokens
+    PADDING_STRATEGY = os.getenv("PADDING_STRATEGY", "longest")
+    PAD_TO_MULTIPLE_OF = int(os.getenv("PAD_TO_MULTIPLE_OF", 8))
+
+    # In-memory LRU cache of probability vectors, reported on /health
+    PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+    PREDICTION_CACHE_MAX_MB = float(os.getenv("PREDICTION_CACHE_MAX_MB", 32))
+    PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL")) if os.getenv("PREDICTION_CACHE_TTL") else None
+
+    # SQLite cache that survives restarts and is shared by workers on one host
+    DISK_CACHE_ENABLED = os.getenv("DISK_CACHE_ENABLED", "false").lower() == "true"
+    DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "predictions.sqlite3"))
+    DISK_CACHE_MAX_ENTRIES = int(os.getenv("DISK_CACHE_MAX_ENTRIES", 200000))
+
+    # Admission control: shed load with 503 + Retry-After beyond this many inference
+    # requests per worker (keep it below GUNICORN_THREADS so /health stays responsive)
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", 12))
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+
+    # Concurrent requests for the same text share one inference
+    SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+    # Prometheus metrics on /metrics; set PROMETHEUS_MULTIPROC_DIR when running several workers
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # CPU threading: intra-op threads default to the available cores split between
+    # GUNICORN_WORKERS; CPU_AFFINITY is "none", "auto" or per-worker sets like "0-3;4-7"
+    TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS")) if os.getenv("TORCH_NUM_THREADS") else None
+    TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", 1))
+    CPU_AFFINITY = os.getenv("CPU_AFFINITY", "none")
+    GUNICORN_WORKERS = int(os.getenv("GUNICORN_WORKERS", 1))
+
+    # Warm up representative batch shapes before serving. With GUNICORN_PRELOAD
+    # the model is loaded in the master and each worker warms up after the fork.
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    GUNICORN_PRELOAD = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+
+    # Cross-request micro-batching of forward passes
+    BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "true").lower() == "true"
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 16))
+    BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 10))
+
 
@@ -0,0 +1,116 @@
+import math
+import time
+import threading
+from functools import wraps
+
+from flask import Response, g, has_app_context, request
+
+from ..utils.custom_exceptions import BadRequestError, DeadlineExceededError, ServiceUnavailableError
+
+DEADLINE_HEADER = "X-Request-Deadline"
+
+def current_deadline():
+    """Deadline (Unix time in seconds) of the request being handled, if it sent one."""
+    if has_app_context():
+        return g.get("request_deadline")
+    return None
+
+def check_deadline(deadline):
+    if deadline is not None and time.time() >= deadline:
+        raise DeadlineExceededError()
+
+class AdmissionController():
+    """Bounds the number of inference requests inside the service.
+
+    A request is turned away before any work when its X-Request-Deadline
+    (absolute Unix time in seconds) has already passed, for example after
+    waiting in gunicorn's accept queue. It is also turned away with a fast
+    503 and Retry-After once ``max_in_flight`` requests are already being
+    handled. Admitted requests carry their deadline down to the
+    micro-batcher, which drops them if it expires before their forward pass.
+    """
+
+    def __init__(self, max_in_flight=12, retry_after=1, enabled=True):
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._admitted = 0
+        self._shed = 0
+        self._expired = 0
+
+    def init_app(self, app):
+        self.max_in_flight = app.config.get("ADMISSION_MAX_IN_FLIGHT", self.max_in_flight)
+        self.retry_after = app.config.get("ADMISSION_RETRY_AFTER", self.retry_after)
+        self.enabled = app.config.get("ADMISSION_ENABLED", self.enabled)
+
+    @staticmethod
+    def _parse_deadline():
+        value = request.headers.get(DEADLINE_HEADER)
+        if value is None:
+            return None
+        try:
+            deadline = float(value)
+        except ValueError:
+            raise BadRequestError(message=f'{DEADLINE_HEADER} must be a Unix timestamp in seconds.')
+        if not math.isfinite(deadline):
+            raise BadRequestError(message=f'{DEADLINE_HEADER} must be a Unix timestamp in seconds.')
+        return deadline
+
+    def _acquire(self, deadline):
+        try:
+            check_deadline(deadline)
+        except DeadlineExceededError:
+            with self._lock:
+                self._expired += 1
+            raise
+
+        with self._lock:
+            if self.enabled and self._in_flight >= self.max_in_flight:
+                self._shed += 1
+                raise ServiceUnavailableError(
+                    message='Emotion detection service is overloaded, retry later.',
+                    headers={'Retry-After': str(self.retry_after)}
+                )
+            self._in_flight += 1
+            self._admitted += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def admit(self, view):
+        """Route decorator applying admission control and deadline propagation."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            deadline = self._parse_deadline()
+            self._acquire(deadline)
+            g.request_deadline = deadline
+
+            released = False
+            try:
+                response = view(*args, **kwargs)
+                # A streamed body keeps running inference after the view returns
+                if isinstance(response, Response) and response.is_streamed:
+                    response.call_on_close(self._release)
+                    released = True
+                return response
+            finally:
+                if not released:
+                    self._release()
+
+        return wrapper
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "admitted": self._admitted,
+                "shed": self._shed,
+                "deadline_expired": self._expired,
+            }
+
+admission = AdmissionController()
@@ -0,0 +1,104 @@
+import os
+import hashlib
+import torch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification
+
+class TorchBackend():
+    """Eager PyTorch inference, on the GPU when one is available."""
+
+    name = "torch"
+
+    def __init__(self, model_path, quantize=False):
+        self.model = DistilBertForSequenceClassification.from_pretrained(model_path)
+        self.config = self.model.config
+        self.quantized = quantize
+
+        self.device = torch.device("cuda" if torch.cuda.is_available() and not quantize else "cpu")
+        self.model.to(self.device)
+        self.model.eval()
+
+        if quantize:
+            # INT8 weights for every Linear layer; activations are quantized
+            # on the fly, so no calibration data is needed. CPU only.
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    def predict_logits(self, input_ids, attention_mask):
+        with torch.no_grad():
+            logits = self.model(
+                input_ids=torch.from_numpy(input_ids).to(self.device),
+                attention_mask=torch.from_numpy(attention_mask).to(self.device)
+            ).logits
+
+        return logits.float().cpu().numpy()
+
+class OnnxBackend():
+    """ONNX Runtime inference on CPU, using the graph written by app.emotion.onnx_export."""
+
+    name = "onnx"
+    quantized = False
+
+    def __init__(self, model_path, onnx_path, num_threads=None):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise RuntimeError("INFERENCE_BACKEND=onnx requires the onnxruntime package.")
+
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(
+                f"ONNX model not found at {onnx_path}. Export it with: python -m app.emotion.onnx_export"
+            )
+
+        self.onnx_path = onnx_path
+        self.num_threads = num_threads
+        self.session = self._create_session()
+        self.config = DistilBertConfig.from_pretrained(model_path)
+        self.device = "cpu"
+
+    def _create_session(self):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = self.num_threads or 0  # 0 lets ORT use every core
+        options.inter_op_num_threads = 1
+
+        return onnxruntime.InferenceSession(
+            self.onnx_path, options, providers=["CPUExecutionProvider"]
+        )
+
+    def post_fork(self, num_threads=None):
+        # ONNX Runtime thread pools do not survive a fork, so each worker
+        # needs its own session.
+        self.num_threads = num_threads or self.num_threads
+        self.session = self._create_session()
+
+    def predict_logits(self, input_ids, attention_mask):
+        return self.session.run(
+            ["logits"],
+            {"input_ids": input_ids, "attention_mask": attention_mask}
+        )[0]
+
+def load_backend(name, model_path, onnx_path=None, quantize=False, num_threads=None):
+    if name == "torch":
+        return TorchBackend(model_path, quantize=quantize)
+    if quantize:
+        raise ValueError("Dynamic INT8 quantization is only supported by the torch backend")
+    if name == "onnx":
+        return OnnxBackend(
+            model_path, onnx_path or os.path.join(model_path, "model.optimized.onnx"), num_threads=num_threads
+        )
+    raise ValueError(f'Unknown inference backend "{name}", expected "torch" or "onnx"')
+
+def model_fingerprint(model_path):
+    """Content hash of the config and weight files in the model directory."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(model_path)):
+        if name != "config.json" and not name.endswith((".safetensors", ".bin")):
+            continue
+        digest.update(name.encode())
+        with open(os.path.join(model_path, name), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:16]
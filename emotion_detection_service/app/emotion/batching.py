@@ -0,0 +1,232 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from ..utils.custom_exceptions import DeadlineExceededError
+
+class MicroBatcher():
+    """Collects inference rows from concurrent requests and runs them as one batch.
+
+    Each caller submits the rows (texts or chunks) it needs scored and blocks on
+    a future. A single worker thread drains the queue, runs ``runner`` once for
+    the combined rows and hands every caller its own slice of the output.
+
+    Callers announce themselves with ``track()`` before tokenizing. The worker
+    only holds a batch open (up to ``max_wait_ms``) while announced callers
+    have not submitted yet, so a lone request is dispatched immediately and
+    pays no extra latency.
+
+    Rows submitted with a ``deadline`` (Unix time) that passes while they
+    wait in the queue are dropped and their caller gets DeadlineExceededError.
+    """
+
+    batch_size_buckets = (1, 2, 4, 8, 16, 32, 64)
+
+    def __init__(self, runner=None, max_batch_size=16, max_wait_ms=10, enabled=True):
+        self.runner = runner
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.enabled = enabled and runner is not None
+        self._reset()
+
+    def init_app(self, app, runner):
+        self.runner = runner
+        self.max_batch_size = app.config.get("BATCH_MAX_SIZE", self.max_batch_size)
+        self.max_wait = app.config.get("BATCH_MAX_WAIT_MS", self.max_wait * 1000) / 1000
+        self.enabled = app.config.get("BATCHING_ENABLED", True)
+        self._reset()
+
+    def _reset(self):
+        # Called again after a fork: threads and locks do not survive it.
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._pending_rows = 0
+        self._preparing = 0
+        self._local = threading.local()
+        self._worker = None
+
+        self._batches = 0
+        self._expired = 0
+        self._rows = 0
+        self._requests = 0
+        self._max_batch_rows = 0
+        self._batch_size_counts = {bucket: 0 for bucket in self._bucket_labels()}
+
+    def _bucket_labels(self):
+        uppers = self.batch_size_buckets + (self.batch_size_buckets[-1] + 1,)
+        return [self._bucket_for(rows) for rows in uppers]
+
+    def _bucket_for(self, rows):
+        lower = 1
+        for upper in self.batch_size_buckets:
+            if rows <= upper:
+                return str(upper) if lower == upper else f"{lower}-{upper}"
+            lower = upper + 1
+        return f"{lower}+"
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._worker_loop, name="emotion-micro-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def track(self):
+        """Context manager marking a caller as about to submit rows."""
+        return _ActiveCaller(self)
+
+    def submit(self, items, deadline=None):
+        future = Future()
+        if not items:
+            future.set_result(np.empty((0, 0)))
+            return future
+
+        self._check_fork()
+        with self._cond:
+            self._ensure_worker()
+            if getattr(self._local, "preparing", False):
+                self._local.preparing = False
+                self._preparing -= 1
+            self._pending.append((list(items), future, deadline))
+            self._pending_rows += len(items)
+            self._cond.notify_all()
+        return future
+
+    def run(self, items, deadline=None):
+        if not self.enabled:
+            if deadline is not None and time.time() >= deadline:
+                raise DeadlineExceededError()
+            return self.runner(items)
+        if len(items) <= self.max_batch_size:
+            return self.submit(items, deadline).result()
+        # _collect takes a request whole, so larger ones are queued in
+        # max_batch_size slices to keep every forward pass bounded
+        size = self.max_batch_size
+        futures = [self.submit(items[start:start + size], deadline) for start in range(0, len(items), size)]
+        return np.concatenate([future.result() for future in futures])
+
+    def _collect(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+
+            batch = [self._pending.popleft()]
+            rows = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+
+            while rows < self.max_batch_size:
+                if self._pending:
+                    items = self._pending[0][0]
+                    if rows + len(items) > self.max_batch_size:
+                        break
+                    batch.append(self._pending.popleft())
+                    rows += len(items)
+                    continue
+
+                # Only hold the batch open while other callers are still
+                # preparing their rows; otherwise dispatch right away.
+                remaining = deadline - time.monotonic()
+                if not self._preparing or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            self._pending_rows -= rows
+            return batch, rows
+
+    def _drop_expired(self, batch):
+        now = time.time()
+        live = []
+        for request_items, future, deadline in batch:
+            if deadline is not None and now >= deadline:
+                future.set_exception(DeadlineExceededError())
+                with self._cond:
+                    self._expired += 1
+            else:
+                live.append((request_items, future, deadline))
+        return live
+
+    def _worker_loop(self):
+        while True:
+            batch, rows = self._collect()
+            # Callers whose deadline passed in the queue have given up already
+            batch = self._drop_expired(batch)
+            if not batch:
+                continue
+            rows = sum(len(request_items) for request_items, _, _ in batch)
+            items = [item for request_items, _, _ in batch for item in request_items]
+
+            try:
+                probabilities = self.runner(items)
+            except Exception as error:
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                continue
+
+            self._record(len(batch), rows)
+
+            offset = 0
+            for request_items, future, _ in batch:
+                future.set_result(probabilities[offset:offset + len(request_items)])
+                offset += len(request_items)
+
+    def _record(self, requests, rows):
+        with self._cond:
+            self._batches += 1
+            self._rows += rows
+            self._requests += requests
+            self._max_batch_rows = max(self._max_batch_rows, rows)
+            self._batch_size_counts[self._bucket_for(rows)] += 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                "enabled": self.enabled,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "queue_depth": len(self._pending),
+                "queued_rows": self._pending_rows,
+                "preparing": self._preparing,
+                "batches": self._batches,
+                "expired": self._expired,
+                "requests": self._requests,
+                "rows": self._rows,
+                "avg_batch_size": round(self._rows / self._batches, 2) if self._batches else 0,
+                "max_batch_size_seen": self._max_batch_rows,
+                "batch_size_histogram": dict(self._batch_size_counts),
+            }
+
+class _ActiveCaller():
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    def __enter__(self):
+        batcher = self.batcher
+        batcher._check_fork()
+        with batcher._cond:
+            if not getattr(batcher._local, "preparing", False):
+                batcher._local.preparing = True
+                batcher._preparing += 1
+        return self
+
+    def __exit__(self, *exc):
+        # Callers that never submitted (validation errors, cache hits) must
+        # not keep the worker waiting.
+        batcher = self.batcher
+        with batcher._cond:
+            if getattr(batcher._local, "preparing", False):
+                batcher._local.preparing = False
+                batcher._preparing -= 1
+                batcher._cond.notify_all()
+        return False
+
+batcher = MicroBatcher()
@@ -0,0 +1,115 @@
+import time
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+class PredictionCache():
+    """Bounded in-memory LRU cache of raw probability vectors.
+
+    Entries are keyed by a hash of the normalized text, the aggregation
+    strategy and the model version. The full label vector is stored, so one
+    entry serves any threshold/top_k. Least recently used entries are
+    evicted once the estimated memory use exceeds ``max_bytes``. Entries
+    older than ``ttl`` seconds are dropped on access when a TTL is set.
+    """
+
+    # Rough per-entry cost of the dict slot, key string and tuple
+    entry_overhead = 200
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=None, enabled=True, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def init_app(self, app):
+        self.enabled = app.config.get("PREDICTION_CACHE_ENABLED", self.enabled)
+        self.max_bytes = int(app.config.get("PREDICTION_CACHE_MAX_MB", self.max_bytes / 1024 / 1024) * 1024 * 1024)
+        self.ttl = app.config.get("PREDICTION_CACHE_TTL", self.ttl)
+        self.clear()
+
+    @staticmethod
+    def normalize(text):
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @staticmethod
+    def make_key(text, strategy, model_version):
+        normalized = PredictionCache.normalize(text)
+        return hashlib.sha256(f"{model_version}\0{strategy}\0{normalized}".encode()).hexdigest()
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            probabilities, expires_at, size = entry
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                self._bytes -= size
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return probabilities
+
+    def put(self, key, probabilities):
+        if not self.enabled:
+            return
+
+        probabilities = np.array(probabilities, dtype=np.float32)
+        probabilities.setflags(write=False)
+        size = probabilities.nbytes + len(key) + self.entry_overhead
+        expires_at = self.clock() + self.ttl if self.ttl else None
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+
+            self._entries[key] = (probabilities, expires_at, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0,
+            }
+
+prediction_cache = PredictionCache()
@@ -0,0 +1,153 @@
+import os
+import time
+import sqlite3
+import threading
+
+import numpy as np
+
+class DiskCache():
+    """SQLite-backed probability cache that survives restarts and is shared by workers.
+
+    Vectors are stored as float32 blobs keyed by the same hash as the
+    in-memory PredictionCache. The database remembers which model version
+    filled it and is emptied automatically when a different model starts.
+    Once it holds more than ``max_entries`` rows, the least recently used
+    tenth is deleted. Access times are only refreshed every
+    ``touch_interval`` seconds, so reads stay read-only most of the time.
+    """
+
+    touch_interval = 300
+    evict_check_every = 100
+
+    def __init__(self, path=None, max_entries=200_000, enabled=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled and path is not None
+        self.model_version = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts_since_check = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def init_app(self, app, model_version):
+        self.path = app.config.get("DISK_CACHE_PATH", self.path)
+        self.max_entries = app.config.get("DISK_CACHE_MAX_ENTRIES", self.max_entries)
+        self.enabled = app.config.get("DISK_CACHE_ENABLED", False) and bool(self.path)
+        if self.enabled:
+            self.open(model_version)
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or a fork
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def open(self, model_version):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.model_version = model_version
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, probabilities BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_predictions_accessed_at ON predictions (accessed_at)"
+            )
+
+            row = connection.execute("SELECT value FROM meta WHERE key = 'model_version'").fetchone()
+            if row is None or row[0] != model_version:
+                connection.execute("DELETE FROM predictions")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('model_version', ?)",
+                    (model_version,)
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT probabilities, accessed_at FROM predictions WHERE key = ?", (key,)
+        ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            connection.execute("UPDATE predictions SET accessed_at = ? WHERE key = ?", (now, key))
+
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def put(self, key, probabilities):
+        if not self.enabled:
+            return
+
+        blob = np.asarray(probabilities, dtype=np.float32).tobytes()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO predictions (key, probabilities, accessed_at) VALUES (?, ?, ?)",
+            (key, blob, time.time())
+        )
+
+        with self._lock:
+            self._puts_since_check += 1
+            check = self._puts_since_check >= self.evict_check_every
+            if check:
+                self._puts_since_check = 0
+        if check:
+            self._evict(connection)
+
+    def _evict(self, connection):
+        count = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        target = int(self.max_entries * 0.9)
+        deleted = connection.execute(
+            "DELETE FROM predictions WHERE key IN ("
+            "SELECT key FROM predictions ORDER BY accessed_at LIMIT ?)",
+            (count - target,)
+        ).rowcount
+        with self._lock:
+            self._evictions += deleted
+
+    def stats(self):
+        stats = {
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
+        if self.enabled:
+            stats["entries"] = self._connection().execute(
+                "SELECT COUNT(*) FROM predictions"
+            ).fetchone()[0]
+        return stats
+
+disk_cache = DiskCache()
@@ -1,7 +1,21 @@
-import torch
 import numpy as np
 import os
-from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+import re
+import time
+from transformers import DistilBertTokenizerFast
+from .backends import load_backend, model_fingerprint
+from .quantization import quantization_approved
+from .batching import batcher
+from .cache import prediction_cache
+from .disk_cache import disk_cache
+from .metrics import metrics
+from .singleflight import singleflight, FlightAbandoned
+from .admission import current_deadline
+from ..utils.custom_exceptions import DeadlineExceededError
+from .threads import apply_torch_threads, default_num_threads, pin_to_cpus, worker_cpus
+
+# A run of text up to and including its closing punctuation, or up to a line break
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]+(?:[.!?]+[\"')\]]*|(?=\n)|$)")
 
 class EmotionDetection():
 
@@ -10,73 +24,228 @@ class EmotionDetection():
     max_length = 512
     chunk_overlap = 50
     default_threshhold = 0.3
+    inference_batch_size = 16
+    padding = "longest"
+    pad_to_multiple_of = 8
+
+    backend_name = "torch"
+    onnx_path = None
+    quantization = "none"
+    quantization_max_f1_drop = 0.01
+
+    num_threads = None
+    interop_threads = 1
+    cpu_affinity = "none"
+    workers = 1
+    warmup_enabled = True
 
     tokenizer = None
     model = None
     device = None
     emotion_labels = None
+    model_version = None
+
+    # Readiness state reported on /health
+    ready = False
+    load_seconds = None
+    warmup_seconds = None
+    last_inference_ms = None
+    last_inference_at = None
+
+    @staticmethod
+    def configure(config):
+        EmotionDetection.padding = config.get("PADDING_STRATEGY", EmotionDetection.padding)
+        EmotionDetection.pad_to_multiple_of = config.get("PAD_TO_MULTIPLE_OF", EmotionDetection.pad_to_multiple_of)
+        EmotionDetection.backend_name = config.get("INFERENCE_BACKEND", EmotionDetection.backend_name)
+        EmotionDetection.onnx_path = config.get("ONNX_MODEL_PATH", EmotionDetection.onnx_path)
+        EmotionDetection.quantization = config.get("QUANTIZATION", EmotionDetection.quantization)
+        EmotionDetection.quantization_max_f1_drop = config.get(
+            "QUANTIZATION_MAX_F1_DROP", EmotionDetection.quantization_max_f1_drop
+        )
+        EmotionDetection.num_threads = config.get("TORCH_NUM_THREADS", EmotionDetection.num_threads)
+        EmotionDetection.interop_threads = config.get("TORCH_INTEROP_THREADS", EmotionDetection.interop_threads)
+        EmotionDetection.cpu_affinity = config.get("CPU_AFFINITY", EmotionDetection.cpu_affinity)
+        EmotionDetection.workers = config.get("GUNICORN_WORKERS", EmotionDetection.workers)
+        EmotionDetection.warmup_enabled = config.get("WARMUP_ENABLED", EmotionDetection.warmup_enabled)
 
     @staticmethod
     def load_model():
         if EmotionDetection.model is not None:
             return  # already loaded
 
-        print("Loading emotion model...")
+        print(f"Loading emotion model with the {EmotionDetection.backend_name} backend...")
+        start = time.perf_counter()
+        num_threads = EmotionDetection.num_threads or default_num_threads(EmotionDetection.workers)
+        apply_torch_threads(num_threads, EmotionDetection.interop_threads)
+
         EmotionDetection.tokenizer = DistilBertTokenizerFast.from_pretrained(EmotionDetection.model_path)
-        EmotionDetection.model = DistilBertForSequenceClassification.from_pretrained(EmotionDetection.model_path)
+        quantize = EmotionDetection.quantization == "dynamic"
+        if quantize:
+            approved, reason = quantization_approved(
+                EmotionDetection.model_path, EmotionDetection.quantization_max_f1_drop
+            )
+            print(f"INT8 quantization {'enabled' if approved else 'refused'}: {reason}")
+            quantize = approved
 
-        EmotionDetection.device = torch.device(
-            "cuda" if torch.cuda.is_available() else "cpu"
+        EmotionDetection.model = load_backend(
+            EmotionDetection.backend_name,
+            EmotionDetection.model_path,
+            EmotionDetection.onnx_path,
+            quantize=quantize,
+            num_threads=num_threads
         )
-        EmotionDetection.model.to(EmotionDetection.device)
-        EmotionDetection.model.eval()
+        EmotionDetection.device = EmotionDetection.model.device
+
+        # Cached predictions are only valid for these exact weights and backend
+        EmotionDetection.model_version = "-".join([
+            model_fingerprint(EmotionDetection.model_path),
+            EmotionDetection.backend_name,
+            "int8" if quantize else "fp32"
+        ])
 
         EmotionDetection.emotion_labels = list(
             EmotionDetection.model.config.id2label.values()
         )
 
-        print(f"Model loaded on {EmotionDetection.device}")
+        EmotionDetection.load_seconds = round(time.perf_counter() - start, 3)
+        print(f"Model loaded on {EmotionDetection.device} in {EmotionDetection.load_seconds}s")
+
+    @staticmethod
+    def warmup():
+        """Run representative batch shapes through the model, then mark it ready.
+
+        The first forward pass for a new shape pays for kernel selection and
+        allocator growth. Paying it here keeps that cost off the first
+        requests. Under gunicorn this runs in each worker after the fork,
+        before it accepts connections.
+        """
+        EmotionDetection.load_model()
+        if EmotionDetection.warmup_enabled:
+            start = time.perf_counter()
+            sample = EmotionDetection._encode(["Today I felt calm, a little tired, and grateful."])[0]
+            batch_sizes = sorted({1, 4, EmotionDetection.inference_batch_size, batcher.max_batch_size})
+            # Padded widths, including [CLS] and [SEP]
+            lengths = sorted({16, 64, 128, 256, EmotionDetection.max_length})
+
+            for rows in batch_sizes:
+                for length in lengths:
+                    chunk = (sample * (length // len(sample) + 1))[:length - 2]
+                    inputs = EmotionDetection._build_inputs([chunk] * rows)
+                    EmotionDetection.model.predict_logits(**inputs)
+
+            EmotionDetection.warmup_seconds = round(time.perf_counter() - start, 3)
+            print(
+                f"Warmed up {len(batch_sizes) * len(lengths)} batch shapes "
+                f"in {EmotionDetection.warmup_seconds}s"
+            )
+
+        EmotionDetection.ready = True
 
     @staticmethod
-    def _predict_chunk(text):
-        inputs = EmotionDetection.tokenizer(
-            text,
-            truncation=True,
-            padding="max_length",
-            max_length=EmotionDetection.max_length,
-            return_tensors="pt"
-        ).to(EmotionDetection.device)
+    def post_fork(worker_index=None):
+        """Called in each gunicorn worker after it is forked from the preloading master.
 
-        with torch.no_grad():
-            logits = EmotionDetection.model(**inputs).logits
+        With CPU_AFFINITY set, the worker is pinned to its own CPUs and, unless
+        TORCH_NUM_THREADS is fixed, runs one intra-op thread per pinned CPU.
+        """
+        num_threads = EmotionDetection.num_threads or default_num_threads(EmotionDetection.workers)
+        if EmotionDetection.cpu_affinity != "none" and worker_index is not None:
+            cpus = worker_cpus(EmotionDetection.cpu_affinity, worker_index, EmotionDetection.workers)
+            pin_to_cpus(cpus)
+            num_threads = EmotionDetection.num_threads or len(cpus)
+            apply_torch_threads(num_threads, EmotionDetection.interop_threads)
+            print(f"Worker {worker_index} pinned to CPUs {cpus}")
 
-        return torch.sigmoid(logits).squeeze().cpu().numpy()
+        post_fork = getattr(EmotionDetection.model, "post_fork", None)
+        if post_fork is not None:
+            post_fork(num_threads=num_threads)
+
+        EmotionDetection.warmup()
 
     @staticmethod
-    def _predict_with_chunking(tokens, strategy):
+    def _encode(texts):
+        return EmotionDetection.tokenizer(
+            list(texts), add_special_tokens=False
+        )["input_ids"]
+
+    @staticmethod
+    def _build_inputs(chunks):
+        # Each chunk is a window of token IDs without special tokens. Wrap it
+        # in [CLS] ... [SEP] and pad the batch in one tensor, so text is never
+        # decoded and re-tokenized. "longest" pads only to the longest row,
+        # rounded up to pad_to_multiple_of and capped at max_length;
+        # "max_length" keeps the old fixed 512-token shape.
+        tokenizer = EmotionDetection.tokenizer
+        rows = [
+            [tokenizer.cls_token_id] + list(chunk[:EmotionDetection.max_length - 2]) + [tokenizer.sep_token_id]
+            for chunk in chunks
+        ]
+
+        if EmotionDetection.padding == "max_length":
+            target = EmotionDetection.max_length
+        else:
+            longest = max(len(row) for row in rows)
+            multiple = EmotionDetection.pad_to_multiple_of or 1
+            target = min(-(-longest // multiple) * multiple, EmotionDetection.max_length)
+
+        input_ids = np.full((len(rows), target), tokenizer.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(rows), target), dtype=np.int64)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    @staticmethod
+    def _predict_chunks(chunks):
+        inputs = EmotionDetection._build_inputs(chunks)
+        start = time.perf_counter()
+        logits = EmotionDetection.model.predict_logits(**inputs)
+        seconds = time.perf_counter() - start
+        metrics.record_forward(len(chunks), inputs["input_ids"].shape[1], seconds)
+        EmotionDetection.last_inference_ms = round(seconds * 1000, 3)
+        EmotionDetection.last_inference_at = time.time()
+
+        return 1 / (1 + np.exp(-logits))
+
+    @staticmethod
+    def _infer(texts):
+        # Route through the micro-batcher when it is running so concurrent
+        # requests share one forward pass. Rows of a request whose deadline
+        # has passed are dropped before inference.
+        deadline = current_deadline()
+        if batcher.enabled:
+            return batcher.run(texts, deadline=deadline)
+        if deadline is not None and time.time() >= deadline:
+            raise DeadlineExceededError()
+        return EmotionDetection._predict_chunks(texts)
+
+    @staticmethod
+    def _chunk_spans(num_tokens):
+        # (start, end) token positions of overlapping windows that fit the model
         chunk_size = EmotionDetection.max_length - 2
-        chunks = []
-        all_probabilities = []
+        if num_tokens <= chunk_size:
+            return [(0, num_tokens)]
 
+        spans = []
         start = 0
-        while start < len(tokens):
-            end = min(start + chunk_size, len(tokens))
-            chunk_tokens = tokens[start:end]
-            chunk_text = EmotionDetection.tokenizer.decode(
-                chunk_tokens, skip_special_tokens=True
-            )
-            chunks.append(chunk_text)
+        while start < num_tokens:
+            end = min(start + chunk_size, num_tokens)
+            spans.append((start, end))
 
-            if end >= len(tokens):
+            if end >= num_tokens:
                 break
             start += chunk_size - EmotionDetection.chunk_overlap
 
-        print(f"Processing long text: {len(tokens)} tokens split into {len(chunks)} chunks")
+        return spans
 
-        for chunk in chunks:
-            all_probabilities.append(EmotionDetection._predict_chunk(chunk))
+    @staticmethod
+    def _split_into_chunks(tokens):
+        return [tokens[start:end] for start, end in EmotionDetection._chunk_spans(len(tokens))]
 
-        all_probabilities = np.array(all_probabilities)
+    @staticmethod
+    def _aggregate(all_probabilities, strategy):
+        all_probabilities = np.asarray(all_probabilities)
 
         if strategy == "average":
             return np.mean(all_probabilities, axis=0)
@@ -85,35 +254,411 @@ class EmotionDetection():
         else:
             raise ValueError("Invalid aggregation strategy")
 
+    @staticmethod
+    def _predict_with_chunking(tokens, strategy):
+        if strategy not in ("average", "max"):
+            raise ValueError("Invalid aggregation strategy")
+
+        chunks = EmotionDetection._split_into_chunks(tokens)
+
+        print(f"Processing long text: {len(tokens)} tokens split into {len(chunks)} chunks")
+        metrics.annotate(tokens=len(tokens), chunks=len(chunks))
+
+        # Windows go through the model in groups of inference_batch_size, so
+        # a very long text never builds one unbounded batch
+        size = EmotionDetection.inference_batch_size
+        with metrics.stage("inference"):
+            all_probabilities = np.concatenate([
+                EmotionDetection._infer(chunks[start:start + size])
+                for start in range(0, len(chunks), size)
+            ])
+
+        with metrics.stage("aggregate"):
+            return EmotionDetection._aggregate(all_probabilities, strategy)
+
     @staticmethod
     def _format_results(probabilities, threshold, top_k):
-        results = []
-        for i, emotion in enumerate(EmotionDetection.emotion_labels):
-            prob = float(probabilities[i])
-            percentage = round(prob * 100, 2)
-            results.append({
-                'emotion': emotion,
-                'score':  percentage,
-                'detected': prob >= threshold
-            })
-
-        results.sort(key=lambda x: x['score'], reverse=True)
-        return results[:top_k] if top_k else results
+        return EmotionDetection._format_results_batch([probabilities], threshold, top_k)[0]
+
+    @staticmethod
+    def _format_results_batch(probabilities, threshold, top_k):
+        """Format a (texts, labels) probability matrix into per-text lists of emotion dicts.
+
+        Scores and threshold flags are computed for the whole matrix at once.
+        Each row is ordered with one stable sort on the rounded scores, so
+        labels tied on score keep label order, also at the top_k cut-off.
+        This is the same order as the old per-label sort.
+        """
+        probabilities = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+        labels = EmotionDetection.emotion_labels
+        scores = np.round(probabilities * 100, 2)
+        detected = probabilities >= threshold
+
+        num_labels = scores.shape[1]
+        k = min(top_k, num_labels) if top_k else num_labels
+        # Ties are broken by label index when choosing the top k, not only
+        # when ordering them; argpartition would pick tied labels arbitrarily
+        selected = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+        scores = scores.tolist()
+        detected = detected.tolist()
+        return [
+            [
+                {'emotion': labels[j], 'score': row_scores[j], 'detected': row_detected[j]}
+                for j in row
+            ]
+            for row, row_scores, row_detected in zip(selected.tolist(), scores, detected)
+        ]
+
+    @staticmethod
+    def _format_compact_batch(probabilities):
+        # Scores in emotion_labels order, without per-label dicts
+        return np.round(np.atleast_2d(np.asarray(probabilities, dtype=np.float64)) * 100, 2).tolist()
     
     @staticmethod
-    def predict(text, threshold=0.3, top_k=None, strategy="average"):
+    def _cached(key):
+        # Memory first, then the on-disk cache shared with other workers
+        probabilities = prediction_cache.get(key)
+        if probabilities is not None:
+            metrics.record_texts("memory_cache")
+            return probabilities
+
+        probabilities = disk_cache.get(key)
+        if probabilities is not None:
+            metrics.record_texts("disk_cache")
+            prediction_cache.put(key, probabilities)
+        return probabilities
+
+    @staticmethod
+    def _store(key, probabilities):
+        prediction_cache.put(key, probabilities)
+        disk_cache.put(key, probabilities)
+
+    @staticmethod
+    def predict_probabilities(text, strategy="average"):
+        """Raw per-label probabilities for ``text``, served from the caches when possible."""
+        EmotionDetection.load_model()
+
+        with metrics.request():
+            key = prediction_cache.make_key(text, strategy, EmotionDetection.model_version)
+            with metrics.stage("cache"):
+                probabilities = EmotionDetection._cached(key)
+            if probabilities is not None:
+                return probabilities
+
+            # Identical texts already being scored by another request are waited for, not recomputed
+            try:
+                probabilities, shared = singleflight.do(
+                    key, lambda: EmotionDetection._compute_probabilities(text, strategy, key)
+                )
+            except DeadlineExceededError:
+                # The shared computation may have belonged to a caller with an
+                # earlier deadline; only give up if ours has passed too.
+                deadline = current_deadline()
+                if deadline is not None and time.time() >= deadline:
+                    raise
+                return EmotionDetection._compute_probabilities(text, strategy, key)
+            except FlightAbandoned:
+                # A streaming leader was closed before it finished
+                return EmotionDetection._compute_probabilities(text, strategy, key)
+
+            if shared:
+                metrics.record_texts("singleflight")
+            return probabilities
+
+    @staticmethod
+    def _compute_probabilities(text, strategy, key):
+        with batcher.track():
+            with metrics.stage("tokenize"):
+                tokens = EmotionDetection.tokenizer.encode(text, add_special_tokens=False)
+
+            if len(tokens) <= EmotionDetection.max_length - 2:
+                metrics.annotate(tokens=len(tokens), chunks=1)
+                with metrics.stage("inference"):
+                    probabilities = EmotionDetection._infer([tokens])[0]
+            else:
+                probabilities = EmotionDetection._predict_with_chunking(
+                    tokens, strategy
+                )
+
+        with metrics.stage("cache"):
+            EmotionDetection._store(key, probabilities)
+        metrics.record_texts("model")
+        return probabilities
+
+    @staticmethod
+    def predict(text, threshold=0.3, top_k=None, strategy="average", compact=False):
+        with metrics.request():
+            probabilities = EmotionDetection.predict_probabilities(text, strategy)
+
+            with metrics.stage("format"):
+                if compact:
+                    return EmotionDetection._format_compact_batch([probabilities])[0]
+                return EmotionDetection._format_results(probabilities, threshold, top_k)
+
+    @staticmethod
+    def predict_stream(text, threshold=0.3, top_k=None, strategy="average", compact=False):
+        """Yield each chunk's emotions as soon as it is scored, then the aggregate.
+
+        Chunk events carry the window's token and character spans in ``text``.
+        The last event is the aggregated result, the same as ``predict`` would
+        return. A cached text, or one already being scored by another request,
+        yields only that event.
+        """
+        return metrics.stream(EmotionDetection._predict_stream(text, threshold, top_k, strategy, compact))
+
+    @staticmethod
+    def _predict_stream(text, threshold, top_k, strategy, compact):
+        if strategy not in ("average", "max"):
+            raise ValueError("Invalid aggregation strategy")
+
         EmotionDetection.load_model()
 
-        tokens = EmotionDetection.tokenizer.encode(text, add_special_tokens=False)
+        def format_results(probabilities):
+            with metrics.stage("format"):
+                if compact:
+                    return EmotionDetection._format_compact_batch([probabilities])[0]
+                return EmotionDetection._format_results(probabilities, threshold, top_k)
+
+        key = prediction_cache.make_key(text, strategy, EmotionDetection.model_version)
+        with metrics.stage("cache"):
+            probabilities = EmotionDetection._cached(key)
+        if probabilities is not None:
+            yield {"type": "result", "cached": True, "strategy": strategy, "emotions": format_results(probabilities)}
+            return
 
-        if len(tokens) <= EmotionDetection.max_length - 2:
-            probabilities = EmotionDetection._predict_chunk(text)
+        with singleflight.lead(key) as (flight, leader):
+            if leader:
+                probabilities = yield from EmotionDetection._stream_chunks(text, strategy, key, format_results)
+                flight.set_result(probabilities)
+                return
+
+        # Another request is scoring the same text; wait for its aggregate
+        try:
+            probabilities = flight.result()
+        except DeadlineExceededError:
+            deadline = current_deadline()
+            if deadline is not None and time.time() >= deadline:
+                raise
+            probabilities = yield from EmotionDetection._stream_chunks(text, strategy, key, format_results)
+        except FlightAbandoned:
+            probabilities = yield from EmotionDetection._stream_chunks(text, strategy, key, format_results)
         else:
-            probabilities = EmotionDetection._predict_with_chunking(
-                tokens, strategy
-            )
+            metrics.record_texts("singleflight")
+            yield {
+                "type": "result", "cached": False, "shared": True,
+                "strategy": strategy, "emotions": format_results(probabilities),
+            }
+
+    @staticmethod
+    def _stream_chunks(text, strategy, key, format_results):
+        """Yield a chunk event per window of ``text``, then the result event; return the aggregate."""
+        with metrics.stage("tokenize"):
+            encoding = EmotionDetection.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        tokens = encoding["input_ids"]
+        offsets = encoding["offset_mapping"]
+        spans = EmotionDetection._chunk_spans(len(tokens))
+        metrics.annotate(tokens=len(tokens), chunks=len(spans))
+
+        chunk_probabilities = []
+        for index, (start, end) in enumerate(spans):
+            with batcher.track(), metrics.stage("inference"):
+                probabilities = EmotionDetection._infer([tokens[start:end]])[0]
+            chunk_probabilities.append(probabilities)
+
+            yield {
+                "type": "chunk",
+                "index": index,
+                "total_chunks": len(spans),
+                "token_start": start,
+                "token_end": end,
+                "char_start": offsets[start][0] if end > start else 0,
+                "char_end": offsets[end - 1][1] if end > start else 0,
+                "emotions": format_results(probabilities),
+            }
+
+        with metrics.stage("aggregate"):
+            probabilities = EmotionDetection._aggregate(chunk_probabilities, strategy)
+        with metrics.stage("cache"):
+            EmotionDetection._store(key, probabilities)
+        metrics.record_texts("model")
 
-        return EmotionDetection._format_results(probabilities, threshold, top_k)
+        yield {
+            "type": "result",
+            "cached": False,
+            "strategy": strategy,
+            "total_chunks": len(spans),
+            "emotions": format_results(probabilities),
+        }
+        return probabilities
+
+    @staticmethod
+    def _split_sentences(text):
+        """(start, end) character spans of the non-empty sentences in ``text``."""
+        spans = []
+        for match in SENTENCE_PATTERN.finditer(text):
+            sentence = match.group()
+            stripped = sentence.strip()
+            if not any(character.isalnum() for character in stripped):
+                continue
+            start = match.start() + (len(sentence) - len(sentence.lstrip()))
+            spans.append((start, start + len(stripped)))
+        return spans
+
+    @staticmethod
+    def predict_sentences(text, threshold=0.3, top_k=None, strategy="average", compact=False):
+        """Per-sentence emotions plus a document result aggregated from them.
+
+        All sentences go through predict_probabilities_batch, so they are
+        tokenized in one call and scored in length-sorted groups, with cached
+        sentences skipped. The document result is the mean ("average") or
+        element-wise max ("max") of the sentence probabilities; the whole
+        text is not scored again.
+        """
+        if strategy not in ("average", "max"):
+            raise ValueError("Invalid aggregation strategy")
+
+        spans = EmotionDetection._split_sentences(text) or [(0, len(text))]
+        sentences = [text[start:end] for start, end in spans]
+
+        with metrics.request():
+            probabilities = EmotionDetection.predict_probabilities_batch(sentences, strategy)
+            for result in probabilities:
+                if isinstance(result, Exception):
+                    raise result
+
+            with metrics.stage("aggregate"):
+                matrix = np.stack(probabilities)
+                document = EmotionDetection._aggregate(matrix, strategy)
+                matrix = np.vstack([matrix, document])
+
+            with metrics.stage("format"):
+                if compact:
+                    formatted = EmotionDetection._format_compact_batch(matrix)
+                else:
+                    formatted = EmotionDetection._format_results_batch(matrix, threshold, top_k)
+
+        return {
+            "sentences": [
+                {
+                    "index": index,
+                    "text": sentence,
+                    "char_start": start,
+                    "char_end": end,
+                    "emotions": emotions,
+                }
+                for index, (sentence, (start, end), emotions) in enumerate(zip(sentences, spans, formatted))
+            ],
+            "document": {
+                "strategy": strategy,
+                "sentence_count": len(sentences),
+                "emotions": formatted[-1],
+            },
+        }
+
+    @staticmethod
+    def predict_probabilities_batch(texts, strategy="average"):
+        """Raw probabilities for many texts, in input order.
+
+        Cached texts are answered directly. The rest are tokenized in one call,
+        and their rows (whole short texts and chunks of long ones) are sorted
+        by length and run in groups of ``inference_batch_size``. If a group
+        fails, each text with a row in it gets the exception in place of its
+        probabilities, and the other texts are unaffected.
+        """
+        EmotionDetection.load_model()
+
+        with metrics.request():
+            return EmotionDetection._predict_probabilities_batch(texts, strategy)
+
+    @staticmethod
+    def _predict_probabilities_batch(texts, strategy):
+        keys = [
+            prediction_cache.make_key(text, strategy, EmotionDetection.model_version)
+            for text in texts
+        ]
+        with metrics.stage("cache"):
+            results = [EmotionDetection._cached(key) for key in keys]
+
+        # Repeated texts within the batch are scored once and copied
+        first_index = {}
+        duplicates = {}
+        for index, result in enumerate(results):
+            if result is None:
+                if keys[index] in first_index:
+                    duplicates[index] = first_index[keys[index]]
+                else:
+                    first_index[keys[index]] = index
+        missing = list(first_index.values())
+        if not missing:
+            return results
+
+        with batcher.track():
+            with metrics.stage("tokenize"):
+                encodings = EmotionDetection._encode([texts[index] for index in missing])
+
+            rows = []
+            for index, tokens in zip(missing, encodings):
+                for chunk_tokens in EmotionDetection._split_into_chunks(tokens):
+                    rows.append((index, len(chunk_tokens), chunk_tokens))
+            metrics.annotate(tokens=sum(len(tokens) for tokens in encodings), chunks=len(rows))
+
+            # Neighbouring rows of similar length waste the least padding.
+            rows.sort(key=lambda row: row[1], reverse=True)
+
+            row_probabilities = {index: [] for index in missing}
+            errors = {}
+            size = EmotionDetection.inference_batch_size
+            for start in range(0, len(rows), size):
+                group = rows[start:start + size]
+                try:
+                    with metrics.stage("inference"):
+                        probabilities = EmotionDetection._infer([row[2] for row in group])
+                except DeadlineExceededError:
+                    raise  # the caller has given up on the whole batch
+                except Exception as error:
+                    metrics.record_error(error)
+                    for index, _, _ in group:
+                        errors[index] = error
+                    continue
+                for (index, _, _), probability in zip(group, probabilities):
+                    row_probabilities[index].append(probability)
+
+        for index in missing:
+            if index in errors:
+                results[index] = errors[index]
+                continue
+            with metrics.stage("aggregate"):
+                results[index] = EmotionDetection._aggregate(row_probabilities[index], strategy)
+            with metrics.stage("cache"):
+                EmotionDetection._store(keys[index], results[index])
+
+        for index, source in duplicates.items():
+            results[index] = results[source]
+        metrics.record_texts("model", len(missing) - len(errors))
+        metrics.record_texts("singleflight", len(duplicates))
+        return results
+
+    @staticmethod
+    def predict_batch(texts, threshold=0.3, top_k=None, strategy="average", compact=False):
+        """Score many texts with shared settings, returning results in input order.
 
+        Texts whose inference failed get the exception in place of their result.
+        With ``compact`` each result is the list of scores in emotion_labels order.
+        """
+        with metrics.request():
+            results = EmotionDetection.predict_probabilities_batch(texts, strategy)
+            succeeded = [index for index, result in enumerate(results) if not isinstance(result, Exception)]
+            if not succeeded:
+                return results
 
+            with metrics.stage("format"):
+                matrix = np.stack([results[index] for index in succeeded])
+                if compact:
+                    formatted = EmotionDetection._format_compact_batch(matrix)
+                else:
+                    formatted = EmotionDetection._format_results_batch(matrix, threshold, top_k)
 
+            for index, result in zip(succeeded, formatted):
+                results[index] = result
+            return results
@@ -0,0 +1,201 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TOKEN_BUCKETS = (64, 128, 256, 510, 1024, 2048, 5000)
+CHUNK_BUCKETS = (1, 2, 4, 8)
+BATCH_ROW_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+def _bucket(value, uppers, lower=0):
+    for upper in uppers:
+        if value <= upper:
+            return str(upper) if lower == upper else f"{lower}-{upper}"
+        lower = upper + 1
+    return f"{lower}+"
+
+def token_bucket(tokens):
+    return "cached" if tokens is None else _bucket(tokens, TOKEN_BUCKETS)
+
+def chunk_bucket(chunks):
+    return "0" if not chunks else _bucket(chunks, CHUNK_BUCKETS, lower=1)
+
+class _RequestTimings():
+
+    def __init__(self):
+        self.stages = {}
+        self.tokens = None
+        self.chunks = 0
+
+class Metrics():
+    """Prometheus metrics for the prediction hot path.
+
+    A prediction opens a ``request()`` scope on its thread. ``stage()``
+    timers inside it only add to a dict. When the scope closes, each
+    stage is observed once, labelled with the token-length and chunk-count
+    buckets, which are only known after tokenization. Forward passes run on
+    the micro-batcher thread and are recorded per batch instead.
+
+    Under gunicorn set PROMETHEUS_MULTIPROC_DIR so that ``render()``
+    aggregates every worker instead of the one answering the scrape.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.registry = CollectorRegistry()
+        self._local = threading.local()
+
+        self.stage_seconds = Histogram(
+            "emotion_stage_seconds", "Time spent in each prediction stage",
+            ["stage", "tokens", "chunks"], buckets=STAGE_BUCKETS, registry=self.registry
+        )
+        self.forward_seconds = Histogram(
+            "emotion_forward_pass_seconds", "Model forward pass per inference batch",
+            ["tokens"], buckets=STAGE_BUCKETS, registry=self.registry
+        )
+        self.batch_rows = Histogram(
+            "emotion_inference_batch_rows", "Rows (texts or chunks) per forward pass",
+            buckets=BATCH_ROW_BUCKETS, registry=self.registry
+        )
+        self.chunks = Counter(
+            "emotion_chunks_processed", "Token windows scored by the model", registry=self.registry
+        )
+        self.texts = Counter(
+            "emotion_texts_processed", "Texts scored, by where the probabilities came from",
+            ["source"], registry=self.registry
+        )
+        self.requests = Counter(
+            "emotion_http_requests", "HTTP requests handled",
+            ["endpoint", "method", "status"], registry=self.registry
+        )
+        self.request_seconds = Histogram(
+            "emotion_http_request_seconds", "HTTP request latency",
+            ["endpoint"], buckets=STAGE_BUCKETS, registry=self.registry
+        )
+        self.errors = Counter(
+            "emotion_errors", "Errors raised while handling requests or running inference",
+            ["type"], registry=self.registry
+        )
+
+    def init_app(self, app):
+        from flask import g, request
+
+        self.enabled = app.config.get("METRICS_ENABLED", self.enabled)
+        if not self.enabled:
+            return
+
+        @app.before_request
+        def start_timer():
+            g.metrics_started_at = time.perf_counter()
+
+        @app.after_request
+        def record_request(response):
+            started_at = g.pop("metrics_started_at", None)
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            self.requests.labels(endpoint, request.method, response.status_code).inc()
+            if started_at is not None:
+                self.request_seconds.labels(endpoint).observe(time.perf_counter() - started_at)
+            return response
+
+    @contextmanager
+    def request(self):
+        """Scope collecting stage timings for one prediction call on this thread."""
+        current = getattr(self._local, "current", None)
+        if current is not None or not self.enabled:
+            # Nested calls (predict -> predict_probabilities) share the outer scope
+            yield current
+            return
+
+        timings = _RequestTimings()
+        self._local.current = timings
+        try:
+            yield timings
+        finally:
+            self._local.current = None
+            self._observe(timings)
+
+    def stream(self, events):
+        """Run the generator ``events`` as one request scope.
+
+        The scope is only current while the generator runs, not while the
+        consumer holds an event, and is observed once the generator finishes
+        or is closed.
+        """
+        if not self.enabled or getattr(self._local, "current", None) is not None:
+            yield from events
+            return
+
+        timings = _RequestTimings()
+        try:
+            while True:
+                self._local.current = timings
+                try:
+                    event = next(events)
+                except StopIteration:
+                    return
+                finally:
+                    self._local.current = None
+                yield event
+        finally:
+            events.close()
+            self._observe(timings)
+
+    def _observe(self, timings):
+        tokens = token_bucket(timings.tokens)
+        chunks = chunk_bucket(timings.chunks)
+        for stage, seconds in timings.stages.items():
+            self.stage_seconds.labels(stage, tokens, chunks).observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        timings = getattr(self._local, "current", None)
+        if timings is None:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings.stages[name] = timings.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def annotate(self, tokens=None, chunks=None):
+        """Attach the token length and chunk count of the current request."""
+        timings = getattr(self._local, "current", None)
+        if timings is None:
+            return
+        if tokens is not None:
+            timings.tokens = (timings.tokens or 0) + tokens
+        if chunks:
+            timings.chunks += chunks
+
+    def record_forward(self, rows, padded_tokens, seconds):
+        if not self.enabled:
+            return
+        self.forward_seconds.labels(token_bucket(padded_tokens)).observe(seconds)
+        self.batch_rows.observe(rows)
+        self.chunks.inc(rows)
+
+    def record_texts(self, source, count=1):
+        if self.enabled and count:
+            self.texts.labels(source).inc(count)
+
+    def record_error(self, error):
+        if self.enabled:
+            self.errors.labels(type(error).__name__).inc()
+
+    def render(self):
+        """Exposition text and content type for the /metrics endpoint."""
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = self.registry
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+metrics = Metrics()
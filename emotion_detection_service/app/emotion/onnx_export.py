@@ -0,0 +1,123 @@
+"""Export the saved model/ directory to an optimized ONNX graph and verify it.
+
+Run from emotion_detection_service/:
+
+    python -m app.emotion.onnx_export
+
+This writes model/model.onnx (raw export) and model/model.optimized.onnx
+(transformer-fused graph served by INFERENCE_BACKEND=onnx). Both have
+dynamic batch and sequence axes. The export fails if the ONNX outputs
+drift from PyTorch by more than --tolerance.
+"""
+import os
+import argparse
+
+import numpy as np
+import torch
+from transformers import DistilBertTokenizerFast
+
+from .backends import TorchBackend, OnnxBackend
+
+VERIFY_TEXTS = [
+    "I am so happy today!",
+    "I feel a bit lonely and tired after work.",
+    "Why does this keep happening to me? I'm furious.",
+    "Thank you so much, this means a lot.",
+    " ".join(["The day was long and quiet, and I kept thinking about home."] * 40),
+]
+
+class _LogitsOnly(torch.nn.Module):
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+def export_onnx(model_path, output_path, opset_version=17):
+    backend = TorchBackend(model_path)
+    model = backend.model.to("cpu")
+
+    # torch.onnx.export puts the wrapper back in its original mode afterwards;
+    # it must already be in eval mode or dropout is switched back on.
+    wrapper = _LogitsOnly(model).eval()
+
+    input_ids = torch.ones((2, 16), dtype=torch.long)
+    attention_mask = torch.ones((2, 16), dtype=torch.long)
+    attention_mask[1, 8:] = 0
+
+    torch.onnx.export(
+        wrapper,
+        (input_ids, attention_mask),
+        output_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=opset_version,
+        dynamo=False,
+    )
+    return backend.config
+
+def optimize_onnx(input_path, output_path, config):
+    # Fuses attention, LayerNorm and GELU into ORT's transformer kernels
+    from onnxruntime.transformers.optimizer import optimize_model
+
+    optimized = optimize_model(
+        input_path,
+        model_type="bert",
+        num_heads=config.n_heads,
+        hidden_size=config.dim,
+    )
+    optimized.save_model_to_file(output_path)
+
+def verify_onnx(model_path, onnx_path, texts=VERIFY_TEXTS, max_length=512):
+    """Return the largest absolute probability difference between ONNX and PyTorch."""
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+    reference = TorchBackend(model_path)
+    candidate = OnnxBackend(model_path, onnx_path)
+
+    inputs = tokenizer(
+        texts, truncation=True, max_length=max_length, padding="longest", return_tensors="np"
+    )
+    input_ids = inputs["input_ids"].astype(np.int64)
+    attention_mask = inputs["attention_mask"].astype(np.int64)
+
+    expected = 1 / (1 + np.exp(-reference.predict_logits(input_ids, attention_mask)))
+    actual = 1 / (1 + np.exp(-candidate.predict_logits(input_ids, attention_mask)))
+
+    return float(np.max(np.abs(expected - actual)))
+
+def main():
+    default_model_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'model'
+    )
+
+    parser = argparse.ArgumentParser(description="Export the emotion model to ONNX.")
+    parser.add_argument("--model-path", default=default_model_path)
+    parser.add_argument("--output", help="Optimized graph path (default: <model-path>/model.optimized.onnx)")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    raw_path = os.path.join(args.model_path, "model.onnx")
+    optimized_path = args.output or os.path.join(args.model_path, "model.optimized.onnx")
+
+    print(f"Exporting {args.model_path} to {raw_path}...")
+    config = export_onnx(args.model_path, raw_path, args.opset)
+
+    print(f"Optimizing graph into {optimized_path}...")
+    optimize_onnx(raw_path, optimized_path, config)
+
+    difference = verify_onnx(args.model_path, optimized_path)
+    print(f"Max probability difference vs PyTorch: {difference:.2e}")
+    if difference > args.tolerance:
+        os.remove(optimized_path)
+        raise SystemExit(f"ONNX outputs differ from PyTorch by more than {args.tolerance}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Accuracy gate for serving the dynamically quantized (INT8) model.
+
+Run from emotion_detection_service/ with a held-out JSONL sample, one
+{"text": ..., "labels": [...]} object per line ("labels" is optional):
+
+    python -m app.emotion.quantization --sample held_out.jsonl
+
+Both the FP32 and INT8 models score the sample. Each is compared with the
+gold labels, or with the FP32 decisions when no labels are given. The
+result is written to model/quantization_report.json. QUANTIZATION=dynamic
+is only honoured at startup when that report approves the current model
+files and its micro-F1 drop is within QUANTIZATION_MAX_F1_DROP.
+"""
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+from transformers import DistilBertTokenizerFast
+
+from .backends import TorchBackend, model_fingerprint
+
+REPORT_FILE = "quantization_report.json"
+
+def f1_scores(predicted, expected, labels):
+    """Micro-F1 over all labels plus per-label F1, from boolean (texts, labels) matrices."""
+    true_positives = np.sum(predicted & expected, axis=0)
+    false_positives = np.sum(predicted & ~expected, axis=0)
+    false_negatives = np.sum(~predicted & expected, axis=0)
+
+    def f1(tp, fp, fn):
+        denominator = 2 * tp + fp + fn
+        return float(2 * tp / denominator) if denominator else 1.0
+
+    micro = f1(true_positives.sum(), false_positives.sum(), false_negatives.sum())
+    per_label = {
+        label: round(f1(true_positives[i], false_positives[i], false_negatives[i]), 4)
+        for i, label in enumerate(labels)
+    }
+    return micro, per_label
+
+def predict_probabilities(backend, tokenizer, texts, batch_size=16, max_length=512):
+    probabilities = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            texts[start:start + batch_size],
+            truncation=True,
+            max_length=max_length,
+            padding="longest",
+            return_tensors="np"
+        )
+        logits = backend.predict_logits(
+            inputs["input_ids"].astype(np.int64),
+            inputs["attention_mask"].astype(np.int64)
+        )
+        probabilities.append(1 / (1 + np.exp(-logits)))
+    return np.concatenate(probabilities)
+
+def evaluate(model_path, samples, threshold=0.3, max_f1_drop=0.01):
+    """Compare INT8 against FP32 on ``samples`` and decide whether INT8 may be served."""
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+    texts = [sample["text"] for sample in samples]
+
+    fp32 = TorchBackend(model_path)
+    int8 = TorchBackend(model_path, quantize=True)
+    labels = list(fp32.config.id2label.values())
+
+    timings = {}
+    probabilities = {}
+    for name, backend in (("fp32", fp32), ("int8", int8)):
+        start = time.perf_counter()
+        probabilities[name] = predict_probabilities(backend, tokenizer, texts)
+        timings[name] = round((time.perf_counter() - start) * 1000 / len(texts), 3)
+
+    fp32_predicted = probabilities["fp32"] >= threshold
+    int8_predicted = probabilities["int8"] >= threshold
+
+    if all("labels" in sample for sample in samples):
+        reference = "gold_labels"
+        label_index = {label: i for i, label in enumerate(labels)}
+        expected = np.zeros_like(fp32_predicted)
+        for row, sample in enumerate(samples):
+            for label in sample["labels"]:
+                expected[row, label_index[label]] = True
+    else:
+        reference = "fp32_predictions"
+        expected = fp32_predicted
+
+    fp32_f1, fp32_per_label = f1_scores(fp32_predicted, expected, labels)
+    int8_f1, int8_per_label = f1_scores(int8_predicted, expected, labels)
+    drop = fp32_f1 - int8_f1
+
+    return {
+        "model_fingerprint": model_fingerprint(model_path),
+        "reference": reference,
+        "samples": len(samples),
+        "threshold": threshold,
+        "fp32_micro_f1": round(fp32_f1, 4),
+        "int8_micro_f1": round(int8_f1, 4),
+        "micro_f1_drop": round(drop, 4),
+        "max_f1_drop": max_f1_drop,
+        "approved": drop <= max_f1_drop,
+        "max_abs_probability_diff": round(float(np.max(np.abs(probabilities["fp32"] - probabilities["int8"]))), 4),
+        "per_label_f1": {
+            label: {"fp32": fp32_per_label[label], "int8": int8_per_label[label]} for label in labels
+        },
+        "ms_per_text": timings,
+    }
+
+def load_report(model_path):
+    path = os.path.join(model_path, REPORT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def quantization_approved(model_path, max_f1_drop):
+    """Return (approved, reason) for serving INT8 weights from ``model_path``."""
+    report = load_report(model_path)
+    if report is None:
+        return False, f"no {REPORT_FILE}; run python -m app.emotion.quantization first"
+    if report.get("model_fingerprint") != model_fingerprint(model_path):
+        return False, "the report was produced for different model files"
+    if report["micro_f1_drop"] > max_f1_drop:
+        return False, f"micro-F1 drops by {report['micro_f1_drop']}, more than the allowed {max_f1_drop}"
+    return True, f"micro-F1 drop {report['micro_f1_drop']} is within {max_f1_drop}"
+
+def main():
+    default_model_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'model'
+    )
+
+    parser = argparse.ArgumentParser(description="Gate INT8 quantization on held-out micro-F1.")
+    parser.add_argument("--sample", required=True, help="JSONL file with a text and optional labels per line")
+    parser.add_argument("--model-path", default=default_model_path)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--max-f1-drop", type=float, default=float(os.getenv("QUANTIZATION_MAX_F1_DROP", 0.01)))
+    args = parser.parse_args()
+
+    with open(args.sample) as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+
+    report = evaluate(args.model_path, samples, args.threshold, args.max_f1_drop)
+
+    with open(os.path.join(args.model_path, REPORT_FILE), "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"FP32 micro-F1 {report['fp32_micro_f1']}, INT8 micro-F1 {report['int8_micro_f1']} "
+        f"(drop {report['micro_f1_drop']}, allowed {args.max_f1_drop})"
+    )
+    if not report["approved"]:
+        raise SystemExit("INT8 quantization rejected; the service will keep serving FP32.")
+    print("INT8 quantization approved.")
+
+if __name__ == "__main__":
+    main()
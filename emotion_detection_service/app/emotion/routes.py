@@ -1,9 +1,12 @@
 from flask import request
 from . import emotion_bp
 from .services import EmotionService
-from ..utils.response import make_response
+from .metrics import metrics
+from .admission import admission
+from ..utils.response import make_response, make_stream_response
 
 @emotion_bp.route('/', methods=['POST'])
+@admission.admit
 def detect_emotions():
 
     data = request.get_json()
@@ -16,10 +19,48 @@ def detect_emotions():
             message=f'Emotions detected sucessfully.',
         )
 
+@emotion_bp.route('/stream', methods=['POST'])
+@admission.admit
+def detect_emotions_stream():
+
+    data = request.get_json()
+
+    events = EmotionService.analyze_stream(data)
+
+    return make_stream_response(events)
+
+@emotion_bp.route('/sentences', methods=['POST'])
+@admission.admit
+def detect_emotions_by_sentence():
+
+    data = request.get_json()
+
+    breakdown = EmotionService.analyze_sentences(data)
+
+    return make_response(
+            status_code=200,
+            data=breakdown,
+            message=f'Sentence emotions detected sucessfully.',
+        )
+
+@emotion_bp.route('/batch', methods=['POST'])
+@admission.admit
+def detect_emotions_batch():
+
+    data = request.get_json()
+
+    results = EmotionService.analyze_batch(data)
+
+    return make_response(
+            status_code=200,
+            data=results,
+            message=f'Batch emotion detection completed.',
+        )
+
 @emotion_bp.route('/health', methods=['GET'])
 def health():
 
-    health_info = EmotionService.model_info()
+    health_info = EmotionService.readiness()
 
     return make_response(
         status_code=200,
@@ -36,4 +77,11 @@ def info():
         status_code=200,
         data=available_emotion_info,
         message=f'Information about available emotions loaded sucessfully.'
-    )
\ No newline at end of file
+    )
+
+@emotion_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+
+    body, content_type = metrics.render()
+
+    return body, 200, {'Content-Type': content_type}
\ No newline at end of file
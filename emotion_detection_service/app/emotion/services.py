@@ -1,45 +1,175 @@
+import logging
+from datetime import datetime, timezone
 from .emotion_detection import EmotionDetection
-from ..utils.custom_exceptions import BadRequestError
+from .batching import batcher
+from .cache import prediction_cache
+from .disk_cache import disk_cache
+from .singleflight import singleflight
+from .admission import admission
+from .threads import thread_info
+from ..utils.custom_exceptions import BadRequestError, ServiceUnavailableError
 
 class EmotionService():
 
+    max_batch_texts = 256
+
     @staticmethod
     def analyze(data):
 
+        text = EmotionService._validate_text(data)
+        threshold, top_k, strategy, compact = EmotionService._validate_options(data)
+
+        emotions = EmotionDetection.predict(
+            text=text, threshold=threshold, top_k=top_k, strategy=strategy, compact=compact
+        )
+
+        return emotions
+
+    @staticmethod
+    def analyze_stream(data):
+
+        text = EmotionService._validate_text(data)
+        threshold, top_k, strategy, compact = EmotionService._validate_options(data)
+
+        # Validation runs now; the generator only starts once the response streams
+        return EmotionDetection.predict_stream(
+            text=text, threshold=threshold, top_k=top_k, strategy=strategy, compact=compact
+        )
+
+    @staticmethod
+    def analyze_sentences(data):
+
+        text = EmotionService._validate_text(data)
+        threshold, top_k, strategy, compact = EmotionService._validate_options(data)
+
+        return EmotionDetection.predict_sentences(
+            text=text, threshold=threshold, top_k=top_k, strategy=strategy, compact=compact
+        )
+
+    @staticmethod
+    def analyze_batch(data):
+
         if not data:
             raise BadRequestError(message='JSON body is required.')
-        
-        if not 'text' in data or not data.get('text').strip():
+
+        texts = data.get('texts')
+        if not isinstance(texts, list) or not texts:
+            raise BadRequestError(message='texts must be a non-empty list.')
+        if len(texts) > EmotionService.max_batch_texts:
+            raise BadRequestError(message=f'At most {EmotionService.max_batch_texts} texts can be analyzed per request.')
+
+        threshold, top_k, strategy, compact = EmotionService._validate_options(data)
+
+        # Invalid items are reported in place instead of failing the batch
+        results = [None] * len(texts)
+        valid_indexes = []
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip():
+                results[index] = {
+                    'index': index,
+                    'success': False,
+                    'error': 'Text must be a non-empty string.'
+                }
+            else:
+                valid_indexes.append(index)
+
+        predictions = []
+        if valid_indexes:
+            predictions = EmotionDetection.predict_batch(
+                texts=[texts[index].strip() for index in valid_indexes],
+                threshold=threshold,
+                top_k=top_k,
+                strategy=strategy,
+                compact=compact
+            )
+
+        for index, prediction in zip(valid_indexes, predictions):
+            if isinstance(prediction, Exception):
+                logging.error(f"Emotion detection failed for batch item {index}: {prediction}")
+                results[index] = {
+                    'index': index,
+                    'success': False,
+                    'error': 'Emotion detection failed for this text.'
+                }
+            else:
+                results[index] = {
+                    'index': index,
+                    'success': True,
+                    'emotions': prediction
+                }
+
+        return results
+
+    @staticmethod
+    def _validate_text(data):
+
+        if not data:
+            raise BadRequestError(message='JSON body is required.')
+
+        if not 'text' in data:
+            raise BadRequestError(message='Journal text is required.')
+        if not isinstance(data.get('text'), str):
+            raise BadRequestError(message=f'Text must be a string, got {type(data.get("text"))}')
+        if not data.get('text').strip():
             raise BadRequestError(message='Journal text is required.')
-        
-        text = data.get('text').strip()
+
+        return data.get('text').strip()
+
+    @staticmethod
+    def _validate_options(data):
+
         threshold = data.get('threshold', EmotionDetection.default_threshhold)
         top_k = data.get('top_k')
         strategy = data.get('strategy','average')
+        response_format = data.get('format', 'full')
 
-        if not isinstance(text, str):
-            raise BadRequestError(message=f'Text must be a string, got {type(text)}')
         if not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1:
             raise BadRequestError(message='Threshold must be between 0 and 1')
         if strategy not in ("average", "max"):
             raise BadRequestError(message='Strategy must be "average" or "max"')
         if top_k is not None and (not isinstance(top_k, int) or top_k <= 0):
             raise BadRequestError(message='top_k must be a positive integer')
+        if response_format not in ("full", "compact"):
+            raise BadRequestError(message='Format must be "full" or "compact"')
 
-        emotions = EmotionDetection.predict(text=text, threshold=threshold, top_k=top_k, strategy=strategy)
-
-        return emotions
+        return threshold, top_k, strategy, response_format == "compact"
 
     @staticmethod
     def model_info():
 
+        if EmotionDetection.ready:
+            status = "healthy"
+        elif EmotionDetection.model is None:
+            status = "loading"
+        else:
+            status = "warming_up"
+
+        # No labels until the model has loaded
+        emotion_labels = EmotionDetection.emotion_labels or []
+        last_inference_at = EmotionDetection.last_inference_at
         return {
-            "status": "healthy",
+            "status": status,
+            "ready": EmotionDetection.ready,
+            "load_seconds": EmotionDetection.load_seconds,
+            "warmup_seconds": EmotionDetection.warmup_seconds,
+            "last_inference_ms": EmotionDetection.last_inference_ms,
+            "last_inference_at": (
+                datetime.fromtimestamp(last_inference_at, timezone.utc).isoformat() if last_inference_at else None
+            ),
             "model": "DistilBERT-GoEmotions",
             "device": str(EmotionDetection.device),
+            "backend": EmotionDetection.backend_name,
+            "quantized": getattr(EmotionDetection.model, "quantized", False),
             "max_length": EmotionDetection.max_length,
-            "num_emotions": len(EmotionDetection.emotion_labels),
-            "emotions": EmotionDetection.emotion_labels
+            "num_emotions": len(emotion_labels),
+            "emotions": emotion_labels,
+            "model_version": EmotionDetection.model_version,
+            "threads": thread_info(),
+            "batching": batcher.stats(),
+            "cache": prediction_cache.stats(),
+            "disk_cache": disk_cache.stats(),
+            "singleflight": singleflight.stats(),
+            "admission": admission.stats()
         }
 
     @staticmethod
@@ -52,5 +182,16 @@ class EmotionService():
             "count": len(emotion_labels),
             "default_threshold": 0.3,
             "max_text_length": "unlimited (automatic chunking)",
-            "strategies": ["average", "max"]
-        }
\ No newline at end of file
+            "max_batch_texts": EmotionService.max_batch_texts,
+            "strategies": ["average", "max"],
+            "formats": ["full", "compact"]
+        }
+
+    @staticmethod
+    def readiness():
+
+        health_info = EmotionService.model_info()
+        if not health_info["ready"]:
+            raise ServiceUnavailableError(message='Emotion model is not ready yet.', details=health_info)
+
+        return health_info
@@ -0,0 +1,83 @@
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+
+class FlightAbandoned(Exception):
+    """The leader for a key stopped without a result, e.g. a closed stream."""
+
+class SingleFlight():
+    """Runs one computation per key at a time and shares its result.
+
+    The first caller for a key (the leader) runs the function. Callers that
+    arrive with the same key while it is running wait for the leader's
+    result, or its exception, instead of repeating the work. ``deduplicated``
+    counts those waiting callers, i.e. the inferences saved.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executed = 0
+        self._deduplicated = 0
+
+    def init_app(self, app):
+        self.enabled = app.config.get("SINGLEFLIGHT_ENABLED", self.enabled)
+
+    def do(self, key, fn):
+        """Return ``(result, shared)``, where ``shared`` is True for waiting callers."""
+        with self.lead(key) as (future, leader):
+            if not leader:
+                return future.result(), True
+            result = fn()
+            future.set_result(result)
+            return result, False
+
+    @contextmanager
+    def lead(self, key):
+        """Claim ``key`` for work that is not a single call, such as a stream.
+
+        Yields ``(future, leader)``. A leader publishes its result with
+        ``future.set_result``; if it raises, waiters get its exception, and if
+        it leaves the block without either they get ``FlightAbandoned``.
+        Other callers wait on ``future.result()``.
+        """
+        if not self.enabled:
+            yield Future(), True
+            return
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._executed += 1
+            else:
+                self._deduplicated += 1
+
+        if not leader:
+            yield future, False
+            return
+
+        try:
+            yield future, True
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            raise
+        finally:
+            if not future.done():
+                future.set_exception(FlightAbandoned())
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "deduplicated": self._deduplicated,
+            }
+
+singleflight = SingleFlight()
@@ -0,0 +1,66 @@
+import os
+
+import torch
+
+def available_cpus():
+    """CPUs this process may run on, honouring container cpusets."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+def parse_cpu_list(spec):
+    """Parse a Linux-style CPU list such as "0-3,8" into [0, 1, 2, 3, 8]."""
+    cpus = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError(f'Empty CPU list "{spec}"')
+    return cpus
+
+def worker_cpus(affinity, worker_index, workers, cpus=None):
+    """CPUs worker ``worker_index`` should be pinned to.
+
+    "auto" gives every worker an equal, disjoint slice of the available
+    CPUs. Otherwise ``affinity`` lists one CPU set per worker separated by
+    ";" (for example "0-3;4-7"), assigned round-robin.
+    """
+    if affinity == "auto":
+        cpus = cpus or available_cpus()
+        per_worker = max(1, len(cpus) // max(1, workers))
+        start = (worker_index % max(1, workers)) * per_worker % len(cpus)
+        return cpus[start:start + per_worker]
+
+    sets = [parse_cpu_list(part) for part in affinity.split(";") if part.strip()]
+    return sets[worker_index % len(sets)]
+
+def default_num_threads(workers, cpus=None):
+    # One forward pass runs at a time per worker (the micro-batcher thread),
+    # so splitting the cores between workers avoids oversubscription.
+    return max(1, len(cpus or available_cpus()) // max(1, workers))
+
+def apply_torch_threads(num_threads, interop_threads):
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(interop_threads)
+    except RuntimeError:
+        # Only allowed once, before any inter-op parallel work has started
+        pass
+
+def pin_to_cpus(cpus):
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+def thread_info():
+    return {
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads(),
+        "cpus": available_cpus(),
+    }
@@ -2,7 +2,7 @@ class AppError(Exception):
     status_code = 400
     message = 'An application error occurred.'
 
-    def __init__(self, message=None, status_code=None, details=None, path=None):
+    def __init__(self, message=None, status_code=None, details=None, path=None, headers=None):
         super().__init__()
         if message:
             self.message = message
@@ -10,6 +10,7 @@ class AppError(Exception):
             self.status_code = status_code
         self.details = details
         self.path = path
+        self.headers = headers
 
     def to_dict(self):
         error_dict = {
@@ -45,7 +46,10 @@ class ConflictError(AppError):
     status_code = 409
     message = 'Conflict occurred.'
 
+class ServiceUnavailableError(AppError):
+    status_code = 503
+    message = 'Service temporarily unavailable.'
 
-
-
-
+class DeadlineExceededError(AppError):
+    status_code = 504
+    message = 'Request deadline exceeded before inference.'
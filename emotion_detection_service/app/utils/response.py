@@ -1,4 +1,6 @@
-from flask import jsonify, request
+import json
+import logging
+from flask import Response, jsonify, request, stream_with_context
 from datetime import datetime, timezone
 
 def make_response(message=None, data=None, status_code=200, path=None):
@@ -25,4 +27,20 @@ def make_error(message='An error occurred', status_code=400, details=None, path=
     if details:
         response['details'] = details
 
-    return jsonify(response), status_code
\ No newline at end of file
+    return jsonify(response), status_code
+
+def make_stream_response(events):
+    """Stream ``events`` (JSON-serializable dicts) as newline-delimited JSON.
+
+    The status line is already sent when an event fails, so the failure is
+    reported as a final {"type": "error"} line instead.
+    """
+    def generate():
+        try:
+            for event in events:
+                yield json.dumps(event) + '\n'
+        except Exception as error:
+            logging.exception(f"Streaming response failed: {str(error)}")
+            yield json.dumps({'type': 'error', 'message': 'Emotion detection failed.'}) + '\n'
+
+    return Response(stream_with_context(generate()), status=200, mimetype='application/x-ndjson')
@@ -0,0 +1,266 @@
+"""Latency and throughput of EmotionDetection.predict and the HTTP endpoint.
+
+Run from emotion_detection_service/:
+
+    python -m benchmarks.bench_latency --output latency.json
+    python -m benchmarks.bench_latency --baseline latency.json --max-regression 0.10
+
+Every scenario (target x strategy x concurrency x text length) sends
+--requests distinct synthetic texts from --concurrency threads and
+reports p50/p95/p99 latency, texts/sec, tokens/sec and peak RSS. The
+prediction caches are off unless --cache is given, so every request
+reaches the model. The endpoint's admission limit is raised to the
+highest --concurrency so no client is shed with a 503. With --baseline, the run exits non-zero if any
+scenario's p95 latency or texts/sec is worse than the baseline by more
+than --max-regression.
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import platform
+import argparse
+import resource
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+import torch
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.emotion.emotion_detection import EmotionDetection
+from app.emotion.admission import admission
+from app.emotion.cache import prediction_cache
+from app.emotion.disk_cache import disk_cache
+
+TOKEN_LENGTHS = [16, 64, 256, 510, 1000, 2500, 5000]
+CONCURRENCY = [1, 4, 16]
+STRATEGIES = ["average", "max"]
+TARGETS = ["predict", "endpoint"]
+
+SENTENCES = [
+    "Today I felt a little anxious about work, but talking with a friend helped me calm down.",
+    "I am so grateful for the small things, like coffee in the morning and a quiet walk home.",
+    "Honestly I was furious when the train was cancelled again and nobody told us why.",
+    "The house feels empty since she moved out and I keep missing our long dinners.",
+    "What a surprise, the team remembered my birthday and I could not stop smiling!",
+    "I am nervous about tomorrow's exam even though I studied for weeks.",
+]
+
+def build_corpus(lengths, per_length, seed=0):
+    """``per_length`` distinct texts of exactly each token length, as (length, text, tokens) rows."""
+    tokenizer = EmotionDetection.tokenizer
+    rng = random.Random(seed)
+    corpus = []
+    for length in lengths:
+        for i in range(per_length):
+            sentences = []
+            tokens = []
+            while len(tokens) < length:
+                sentences.extend(rng.sample(SENTENCES, len(SENTENCES)))
+                tokens = tokenizer.encode(f"Entry {i}. " + " ".join(sentences), add_special_tokens=False)
+            text = tokenizer.decode(tokens[:length])
+            corpus.append((length, text, len(tokenizer.encode(text, add_special_tokens=False))))
+    return corpus
+
+def reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM on Linux so each scenario gets its own peak
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    # ru_maxrss is in kB on Linux and bytes on macOS; this is the lifetime peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def summarize(latencies, wall_seconds, tokens):
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "mean_ms": round(float(np.mean(latencies_ms)), 3),
+        "texts_per_sec": round(len(latencies) / wall_seconds, 2),
+        "tokens_per_sec": round(tokens / wall_seconds, 1),
+    }
+
+def run_scenario(call, texts, concurrency):
+    """Send every text through ``call`` from ``concurrency`` threads and time each call."""
+    def timed(text):
+        start = time.perf_counter()
+        call(text)
+        return time.perf_counter() - start
+
+    reset_peak_rss()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, texts))
+    wall_seconds = time.perf_counter() - start
+    return latencies, wall_seconds
+
+def predict_target(strategy):
+    def call(text):
+        EmotionDetection.predict(text, strategy=strategy)
+    return call
+
+def endpoint_target(url, strategy):
+    local = threading.local()
+
+    def call(text):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.post(url, json={"text": text, "strategy": strategy}, timeout=300)
+        response.raise_for_status()
+    return call
+
+def start_server(app, max_concurrency):
+    # Admission control sheds clients beyond ADMISSION_MAX_IN_FLIGHT with a 503;
+    # the benchmark measures latency, so every client it runs must be admitted.
+    admission.max_in_flight = max(admission.max_in_flight, max_concurrency)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/api/v1/emotion_detect/"
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "backend": EmotionDetection.backend_name,
+        "device": str(EmotionDetection.device),
+        "model_version": EmotionDetection.model_version,
+        "padding": EmotionDetection.padding,
+    }
+
+def scenario_key(row):
+    return (row["target"], row["strategy"], row["concurrency"], row["tokens"])
+
+def find_regressions(results, baseline, max_regression):
+    """Scenarios whose p95 or throughput is worse than ``baseline`` by more than ``max_regression``."""
+    previous = {scenario_key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        before = previous.get(scenario_key(row))
+        if before is None:
+            continue
+        if row["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            regressions.append({"scenario": scenario_key(row), "metric": "p95_ms",
+                                "baseline": before["p95_ms"], "current": row["p95_ms"]})
+        if row["texts_per_sec"] < before["texts_per_sec"] * (1 - max_regression):
+            regressions.append({"scenario": scenario_key(row), "metric": "texts_per_sec",
+                                "baseline": before["texts_per_sec"], "current": row["texts_per_sec"]})
+    return regressions
+
+def run(args):
+    corpus = build_corpus(args.lengths, args.requests, args.seed)
+    server, url = start_server(args.app, max(args.concurrency)) if "endpoint" in args.targets else (None, None)
+
+    results = []
+    try:
+        for target in args.targets:
+            for strategy in args.strategies:
+                call = predict_target(strategy) if target == "predict" else endpoint_target(url, strategy)
+                for concurrency in args.concurrency:
+                    for length in args.lengths:
+                        rows = [row for row in corpus if row[0] == length]
+                        texts = [text for _, text, _ in rows]
+
+                        call(texts[0])  # warm up kernels for this shape
+                        latencies, wall_seconds = run_scenario(call, texts, concurrency)
+
+                        row = {
+                            "target": target,
+                            "strategy": strategy,
+                            "concurrency": concurrency,
+                            "tokens": length,
+                            **summarize(latencies, wall_seconds, sum(tokens for _, _, tokens in rows)),
+                            "peak_rss_mb": peak_rss_mb(),
+                        }
+                        results.append(row)
+                        print(
+                            f"{target:<8} {strategy:<7} c={concurrency:<3} {length:>5} tokens"
+                            f"  p50 {row['p50_ms']:>9.2f} ms  p95 {row['p95_ms']:>9.2f} ms"
+                            f"  p99 {row['p99_ms']:>9.2f} ms  {row['texts_per_sec']:>8.2f} texts/s"
+                            f"  {row['tokens_per_sec']:>9.1f} tokens/s  RSS {row['peak_rss_mb']:>7.1f} MB"
+                        )
+    finally:
+        if server is not None:
+            server.shutdown()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default=EmotionDetection.model_path)
+    parser.add_argument("--requests", type=int, default=20, help="Texts per scenario")
+    parser.add_argument("--lengths", type=int, nargs="+", default=TOKEN_LENGTHS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="Keep the prediction caches enabled")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    args = parser.parse_args()
+
+    EmotionDetection.model_path = args.model_path
+    args.app = create_app()
+    if not args.cache:
+        prediction_cache.enabled = False
+        disk_cache.enabled = False
+
+    report = {
+        "benchmark": "latency",
+        "environment": environment(),
+        "settings": {
+            "requests": args.requests,
+            "seed": args.seed,
+            "cache": args.cache,
+        },
+        "results": run(args),
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = find_regressions(report["results"], json.load(f), args.max_regression)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['scenario']}: {regression['metric']} "
+              f"{regression['baseline']} -> {regression['current']}")
+    if report.get("regressions"):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
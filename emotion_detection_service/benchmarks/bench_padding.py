@@ -0,0 +1,87 @@
+"""Latency of fixed (max_length) vs dynamic (longest) padding across text lengths.
+
+Run from emotion_detection_service/:
+
+    python -m benchmarks.bench_padding --repeats 20 --output padding.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.emotion.emotion_detection import EmotionDetection
+
+SENTENCE = "Today I felt a little anxious about work, but talking with a friend helped me calm down."
+TOKEN_LENGTHS = [16, 32, 64, 128, 256, 510]
+
+def make_text(target_tokens):
+    words = []
+    while len(EmotionDetection.tokenizer.encode(" ".join(words), add_special_tokens=False)) < target_tokens:
+        words.extend(SENTENCE.split())
+    tokens = EmotionDetection.tokenizer.encode(" ".join(words), add_special_tokens=False)
+    return EmotionDetection.tokenizer.decode(tokens[:target_tokens])
+
+def time_padding(padding, texts, repeats):
+    EmotionDetection.padding = padding
+    chunks = EmotionDetection._encode(texts)
+    EmotionDetection._predict_chunks(chunks)  # warm up kernels for this shape
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        EmotionDetection._predict_chunks(chunks)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "mean_ms": round(float(np.mean(timings)), 3),
+    }
+
+def run(repeats, batch_size):
+    results = []
+    for length in TOKEN_LENGTHS:
+        texts = [make_text(length)] * batch_size
+        fixed = time_padding("max_length", texts, repeats)
+        dynamic = time_padding("longest", texts, repeats)
+        results.append({
+            "tokens": length,
+            "batch_size": batch_size,
+            "max_length": fixed,
+            "longest": dynamic,
+            "speedup": round(fixed["p50_ms"] / dynamic["p50_ms"], 2),
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default=EmotionDetection.model_path)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--pad-to-multiple-of", type=int, default=EmotionDetection.pad_to_multiple_of)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    EmotionDetection.model_path = args.model_path
+    EmotionDetection.pad_to_multiple_of = args.pad_to_multiple_of
+    EmotionDetection.load_model()
+
+    report = {
+        "benchmark": "padding",
+        "device": str(EmotionDetection.device),
+        "pad_to_multiple_of": args.pad_to_multiple_of,
+        "results": run(args.repeats, args.batch_size),
+    }
+
+    for row in report["results"]:
+        print(
+            f"{row['tokens']:>4} tokens  max_length p50 {row['max_length']['p50_ms']:>8.2f} ms"
+            f"  longest p50 {row['longest']['p50_ms']:>8.2f} ms  speedup x{row['speedup']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Sweep worker / intra-op / inter-op thread layouts and recommend one for this host.
+
+Run from emotion_detection_service/:
+
+    python -m benchmarks.bench_threads --requests 50 --output threads.json
+
+Each layout starts ``workers`` processes, as gunicorn would, each with its
+own torch thread settings and (with --pin) its own slice of CPUs. The
+processes score the same texts back to back, starting together. Layouts
+that would oversubscribe the cores (workers x intra-op threads > CPUs)
+are skipped. The recommended layout has the highest throughput among
+those meeting --max-p95-ms. Apply it with GUNICORN_WORKERS,
+TORCH_NUM_THREADS, TORCH_INTEROP_THREADS and CPU_AFFINITY=auto.
+"""
+import time
+import json
+import argparse
+import multiprocessing
+
+import numpy as np
+
+from app.emotion.threads import available_cpus, worker_cpus, apply_torch_threads, pin_to_cpus
+from benchmarks.bench_padding import SENTENCE
+
+def powers_of_two(limit):
+    value = 1
+    while value <= limit:
+        yield value
+        value *= 2
+
+def layouts(cpu_count, interop_options):
+    for workers in powers_of_two(cpu_count):
+        for intra in powers_of_two(cpu_count // workers):
+            for interop in interop_options:
+                yield {"workers": workers, "intra_op_threads": intra, "inter_op_threads": interop}
+
+def _worker(model_path, layout, index, pin, texts, barrier, results):
+    from app.emotion.emotion_detection import EmotionDetection
+
+    if pin:
+        pin_to_cpus(worker_cpus("auto", index, layout["workers"]))
+    EmotionDetection.model_path = model_path
+    EmotionDetection.num_threads = layout["intra_op_threads"]
+    EmotionDetection.interop_threads = layout["inter_op_threads"]
+    EmotionDetection.load_model()
+    apply_torch_threads(layout["intra_op_threads"], layout["inter_op_threads"])
+
+    for text in texts[:3]:
+        EmotionDetection.predict_probabilities(text + " warmup")
+
+    barrier.wait()
+    latencies = []
+    for i, text in enumerate(texts):
+        start = time.perf_counter()
+        # Unique texts so the prediction cache never answers
+        EmotionDetection.predict_probabilities(f"{i}. {text}")
+        latencies.append(time.perf_counter() - start)
+    results.put(latencies)
+
+def measure(model_path, layout, pin, texts):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(layout["workers"] + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(model_path, layout, index, pin, texts, barrier, results))
+        for index in range(layout["workers"])
+    ]
+    for process in processes:
+        process.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    latencies = [latency for _ in processes for latency in results.get()]
+    wall_seconds = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        **layout,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "texts_per_sec": round(len(latencies) / wall_seconds, 2),
+    }
+
+def recommend(results, max_p95_ms=None):
+    candidates = [row for row in results if max_p95_ms is None or row["p95_ms"] <= max_p95_ms]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda row: (row["texts_per_sec"], -row["p95_ms"]))
+
+def main():
+    from app.emotion.emotion_detection import EmotionDetection
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default=EmotionDetection.model_path)
+    parser.add_argument("--requests", type=int, default=50, help="Texts scored by each worker")
+    parser.add_argument("--words", type=int, default=120, help="Approximate words per text")
+    parser.add_argument("--interop", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--pin", action="store_true", help="Pin each worker to its own CPUs (CPU_AFFINITY=auto)")
+    parser.add_argument("--max-p95-ms", type=float, help="Only recommend layouts within this p95 latency")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    words = (SENTENCE.split() * (args.words // len(SENTENCE.split()) + 1))[:args.words]
+    texts = [" ".join(words)] * args.requests
+    cpus = available_cpus()
+
+    results = []
+    for layout in layouts(len(cpus), args.interop):
+        row = measure(args.model_path, layout, args.pin, texts)
+        results.append(row)
+        print(
+            f"workers {row['workers']:>2}  intra {row['intra_op_threads']:>2}  inter {row['inter_op_threads']:>2}"
+            f"  p50 {row['p50_ms']:>8.2f} ms  p95 {row['p95_ms']:>8.2f} ms  {row['texts_per_sec']:>8.2f} texts/s"
+        )
+
+    best = recommend(results, args.max_p95_ms)
+    report = {
+        "benchmark": "threads",
+        "cpus": len(cpus),
+        "pinned": args.pin,
+        "results": results,
+        "recommended": best,
+    }
+    if best:
+        print(
+            f"Recommended: GUNICORN_WORKERS={best['workers']} TORCH_NUM_THREADS={best['intra_op_threads']} "
+            f"TORCH_INTEROP_THREADS={best['inter_op_threads']}" + (" CPU_AFFINITY=auto" if args.pin else "")
+        )
+    else:
+        print("No layout met the p95 limit.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Per-worker memory of the gunicorn deployment, with and without preloading.
+
+Run from emotion_detection_service/ (Linux only, needs /proc):
+
+    python -m benchmarks.bench_worker_memory --workers 4 --output memory.json
+
+Starts gunicorn with gunicorn.conf.py, sends a few predictions so every
+worker has run the model, then reads /proc/<pid>/smaps_rollup. USS (unique
+set size: private clean + private dirty pages) is what each extra worker
+really costs; PSS splits shared pages evenly between the processes using
+them. With --compare the same run is repeated with GUNICORN_PRELOAD=false.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+
+import requests
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+def process_memory(pid):
+    """RSS, PSS, USS and shared memory of ``pid`` in MB, from /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            field = parts[0].rstrip(":")
+            if field in SMAPS_FIELDS:
+                values[field] = int(parts[1])  # kB
+
+    def mb(kb):
+        return round(kb / 1024, 1)
+
+    return {
+        "rss_mb": mb(values["Rss"]),
+        "pss_mb": mb(values["Pss"]),
+        "uss_mb": mb(values["Private_Clean"] + values["Private_Dirty"]),
+        "shared_mb": mb(values["Shared_Clean"] + values["Shared_Dirty"]),
+    }
+
+def child_pids(pid):
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(child) for child in f.read().split())
+    return children
+
+def wait_until_ready(url, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("gunicorn exited before it became ready")
+        try:
+            if requests.get(f"{url}/health", timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"gunicorn was not ready after {timeout}s")
+
+def measure(workers, preload, port, requests_per_worker, timeout):
+    env = dict(os.environ, PORT=str(port), GUNICORN_WORKERS=str(workers), GUNICORN_PRELOAD=str(preload).lower())
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "run:app"], env=env
+    )
+    url = f"http://127.0.0.1:{port}/api/v1/emotion_detect"
+    try:
+        wait_until_ready(url, process, timeout)
+        for i in range(workers * requests_per_worker):
+            requests.post(url + "/", json={"text": f"Entry {i}: I felt calm, then a little nervous."}, timeout=60)
+
+        master = process_memory(process.pid)
+        worker_memory = [process_memory(pid) for pid in child_pids(process.pid)]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    return {
+        "preload": preload,
+        "workers": workers,
+        "master": master,
+        "per_worker": worker_memory,
+        "avg_worker_uss_mb": round(sum(w["uss_mb"] for w in worker_memory) / len(worker_memory), 1),
+        "total_pss_mb": round(master["pss_mb"] + sum(w["pss_mb"] for w in worker_memory), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=5051)
+    parser.add_argument("--requests-per-worker", type=int, default=5)
+    parser.add_argument("--timeout", type=int, default=120, help="Seconds to wait for the model to load")
+    parser.add_argument("--compare", action="store_true", help="Also measure without preload_app")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    runs = [True, False] if args.compare else [True]
+    report = {
+        "benchmark": "worker_memory",
+        "results": [
+            measure(args.workers, preload, args.port, args.requests_per_worker, args.timeout) for preload in runs
+        ],
+    }
+
+    for row in report["results"]:
+        print(
+            f"preload={row['preload']!s:<5} workers={row['workers']}  master RSS {row['master']['rss_mb']:>7.1f} MB"
+            f"  avg worker USS {row['avg_worker_uss_mb']:>7.1f} MB  total PSS {row['total_pss_mb']:>7.1f} MB"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
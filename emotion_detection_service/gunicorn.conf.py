@@ -0,0 +1,65 @@
+"""Gunicorn settings for the emotion detection service.
+
+The app (and with it the model) is loaded once in the master process
+(``preload_app``) and workers are forked from it. Weight tensors are never
+written after loading, so every worker shares the same physical pages
+through copy-on-write and adding workers costs only their own Python heap.
+Check it with: python -m benchmarks.bench_worker_memory
+"""
+import gc
+import os
+
+# Nothing from app is imported at module level: app.config reads
+# GUNICORN_WORKERS and GUNICORN_PRELOAD once, so they must be set first.
+
+def usable_cpu_count():
+    """CPUs this process may run on, like app.emotion.threads.available_cpus."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+# Usable CPUs, like the torch thread sizing, so a CPU-limited container
+# does not start more workers than it has cores
+workers = int(os.getenv("GUNICORN_WORKERS", usable_cpu_count()))
+# The preloaded app sizes its torch thread pool from the worker count
+os.environ["GUNICORN_WORKERS"] = str(workers)
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+# Tells the preloaded app to leave warmup to the workers (see post_fork)
+os.environ["GUNICORN_PRELOAD"] = str(preload_app).lower()
+
+def on_starting(server):
+    # Multiprocess metric files from a previous run would be summed in
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+def when_ready(server):
+    # The garbage collector writes to the header of every object it tracks.
+    # Moving everything allocated while loading into the permanent
+    # generation keeps those pages shared after the fork.
+    gc.collect()
+    gc.freeze()
+
+def pre_fork(server, worker):
+    # Give each worker the lowest CPU slot no live worker holds, so a
+    # restarted worker takes over the cores of the one it replaces.
+    used = {getattr(other, "cpu_slot", None) for other in server.WORKERS.values()}
+    worker.cpu_slot = next(slot for slot in range(len(used) + 1) if slot not in used)
+
+def post_fork(server, worker):
+    from app.emotion.emotion_detection import EmotionDetection
+
+    EmotionDetection.post_fork(worker_index=worker.cpu_slot)
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,59 @@
+import pytest
+import torch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+from app.emotion.emotion_detection import EmotionDetection
+from app.emotion.cache import prediction_cache
+
+TINY_VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + (
+    "i feel felt so very happy sad angry calm today yesterday was is a an the good bad "
+    "day night and but it my friend work home . , !"
+).split()
+TINY_LABELS = ["joy", "sadness", "anger", "neutral"]
+
+@pytest.fixture(autouse=True)
+def restore_emotion_detection():
+    # Tests tweak class-level settings such as max_length; put them back so
+    # they do not leak into other test modules.
+    saved = {
+        name: value for name, value in vars(EmotionDetection).items()
+        if not name.startswith("__") and not isinstance(value, staticmethod)
+    }
+    prediction_cache.clear()
+    yield
+    for name, value in saved.items():
+        setattr(EmotionDetection, name, value)
+    prediction_cache.clear()
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory):
+    """A randomly initialised two-layer DistilBERT saved like the real model/ directory."""
+    path = tmp_path_factory.mktemp("tiny_model")
+
+    tokenizer = DistilBertTokenizerFast(vocab={word: i for i, word in enumerate(TINY_VOCAB)})
+    tokenizer.save_pretrained(path)
+
+    config = DistilBertConfig(
+        vocab_size=len(TINY_VOCAB),
+        dim=32,
+        hidden_dim=64,
+        n_layers=2,
+        n_heads=2,
+        initializer_range=0.2,
+        id2label=dict(enumerate(TINY_LABELS)),
+        label2id={label: i for i, label in enumerate(TINY_LABELS)},
+    )
+    torch.manual_seed(0)
+    DistilBertForSequenceClassification(config).save_pretrained(path)
+
+    return str(path)
+
+@pytest.fixture
+def tiny_model(tiny_model_path):
+    EmotionDetection.model_path = tiny_model_path
+    EmotionDetection.tokenizer = None
+    EmotionDetection.model = None
+    EmotionDetection.load_model()
+    yield EmotionDetection
+    EmotionDetection.tokenizer = None
+    EmotionDetection.model = None
@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+from unittest.mock import Mock, patch
+
+from app.emotion import emotion_bp
+from app.emotion.admission import admission
+from app.emotion.batching import MicroBatcher
+from app.utils.custom_exceptions import DeadlineExceededError
+from app.utils.error_handlers import registor_error_handlers
+
+URL = "/api/v1/emotion_detect/"
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    registor_error_handlers(app)
+    app.register_blueprint(emotion_bp, url_prefix="/api/v1/emotion_detect")
+    return app.test_client()
+
+def test_expired_deadline_is_rejected_before_inference(client):
+    with patch("app.emotion.services.EmotionDetection.predict") as predict:
+        response = client.post(URL, json={"text": "hello"}, headers={"X-Request-Deadline": str(time.time() - 1)})
+
+    assert response.status_code == 504
+    predict.assert_not_called()
+
+def test_malformed_deadline_is_a_bad_request(client):
+    response = client.post(URL, json={"text": "hello"}, headers={"X-Request-Deadline": "soon"})
+
+    assert response.status_code == 400
+
+def test_overload_sheds_with_retry_after(client):
+    with patch.object(admission, "max_in_flight", 0), patch.object(admission, "retry_after", 3), \
+         patch("app.emotion.services.EmotionDetection.predict") as predict:
+        response = client.post(URL, json={"text": "hello"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    predict.assert_not_called()
+
+def test_admitted_request_releases_its_slot(client):
+    with patch("app.emotion.services.EmotionDetection.predict", return_value=[]):
+        response = client.post(URL, json={"text": "hello"}, headers={"X-Request-Deadline": str(time.time() + 30)})
+
+    assert response.status_code == 200
+    assert admission.stats()["in_flight"] == 0
+
+def test_streamed_request_holds_its_slot_until_closed(tiny_model, client):
+    response = client.post(URL + "stream", json={"text": "i feel calm"}, buffered=False)
+    assert admission.stats()["in_flight"] == 1
+
+    response.get_data()
+    response.close()
+    assert admission.stats()["in_flight"] == 0
+
+def test_deadline_reaches_inference(tiny_model, client):
+    def expire(text, strategy, key):
+        # Deadline passes while the request is being handled
+        time.sleep(0.2)
+        return tiny_model._infer([[5]])[0]
+
+    with patch.object(tiny_model, "_compute_probabilities", side_effect=expire):
+        response = client.post(URL, json={"text": "i feel calm"}, headers={"X-Request-Deadline": str(time.time() + 0.1)})
+
+    assert response.status_code == 504
+
+def test_batcher_drops_rows_whose_deadline_passed_in_queue():
+    runner = Mock(return_value=np.zeros((1, 2)))
+    batcher = MicroBatcher(runner=runner, max_wait_ms=0)
+
+    with pytest.raises(DeadlineExceededError):
+        batcher.run(["late"], deadline=time.time() - 1)
+
+    assert np.array_equal(batcher.run(["fresh"], deadline=time.time() + 30), np.zeros((1, 2)))
+    runner.assert_called_once_with(["fresh"])
+    assert batcher.stats()["expired"] == 1
+
+def test_shared_prediction_is_recomputed_when_only_the_leaders_deadline_passed(tiny_model):
+    calls = []
+
+    def compute(text, strategy, key):
+        calls.append(1)
+        if len(calls) == 1:
+            raise DeadlineExceededError()
+        return np.zeros(4)
+
+    with patch.object(tiny_model, "_compute_probabilities", side_effect=compute):
+        probabilities = tiny_model.predict_probabilities("i feel calm")
+
+    assert len(calls) == 2
+    assert np.array_equal(probabilities, np.zeros(4))
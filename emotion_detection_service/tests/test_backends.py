@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+
+from app.emotion.backends import TorchBackend, load_backend
+
+TEXTS = [
+    "happy",
+    "i feel so happy today",
+    " ".join(["work was bad and i was angry"] * 70),
+]
+
+def test_load_backend_rejects_unknown_name(tiny_model_path):
+    with pytest.raises(ValueError):
+        load_backend("tensorflow", tiny_model_path)
+
+def test_onnx_backend_requires_exported_graph(tiny_model_path, tmp_path):
+    pytest.importorskip("onnxruntime")
+
+    with pytest.raises(FileNotFoundError):
+        load_backend("onnx", tiny_model_path, str(tmp_path / "missing.onnx"))
+
+@pytest.fixture(scope="module")
+def exported_onnx(tiny_model_path, tmp_path_factory):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    from app.emotion.onnx_export import export_onnx, optimize_onnx
+
+    path = tmp_path_factory.mktemp("onnx")
+    raw_path = str(path / "model.onnx")
+    optimized_path = str(path / "model.optimized.onnx")
+    config = export_onnx(tiny_model_path, raw_path)
+    optimize_onnx(raw_path, optimized_path, config)
+    return optimized_path
+
+def test_onnx_backend_matches_torch(tiny_model, tiny_model_path, exported_onnx):
+    torch_probabilities = tiny_model._predict_chunks(tiny_model._encode(TEXTS))
+
+    tiny_model.model = load_backend("onnx", tiny_model_path, exported_onnx)
+    onnx_probabilities = tiny_model._predict_chunks(tiny_model._encode(TEXTS))
+
+    assert onnx_probabilities.shape == torch_probabilities.shape
+    assert np.allclose(onnx_probabilities, torch_probabilities, atol=1e-4)
+
+def test_verify_onnx_reports_small_difference(tiny_model_path, exported_onnx):
+    from app.emotion.onnx_export import verify_onnx
+
+    assert verify_onnx(tiny_model_path, exported_onnx, texts=TEXTS) < 1e-4
+
+def test_torch_backend_returns_numpy_logits(tiny_model_path):
+    backend = TorchBackend(tiny_model_path)
+    input_ids = np.array([[2, 5, 6, 3]], dtype=np.int64)
+    attention_mask = np.ones_like(input_ids)
+
+    logits = backend.predict_logits(input_ids, attention_mask)
+
+    assert isinstance(logits, np.ndarray)
+    assert logits.shape == (1, backend.config.num_labels)
@@ -0,0 +1,102 @@
+import time
+import threading
+import numpy as np
+
+from app.emotion.batching import MicroBatcher
+
+def make_runner(calls, delay=0.0):
+    def runner(items):
+        calls.append(list(items))
+        time.sleep(delay)
+        return np.array([[float(item), float(item) * 10] for item in items])
+    return runner
+
+def test_run_returns_rows_for_caller():
+    calls = []
+    batcher = MicroBatcher(runner=make_runner(calls))
+
+    result = batcher.run([1, 2])
+
+    assert np.allclose(result, [[1, 10], [2, 20]])
+    assert calls == [[1, 2]]
+
+def test_oversized_request_is_split_into_max_batch_size_batches():
+    calls = []
+    batcher = MicroBatcher(runner=make_runner(calls), max_batch_size=4)
+
+    result = batcher.run(list(range(10)))
+
+    assert [len(call) for call in calls] == [4, 4, 2]
+    assert np.allclose(result[:, 0], list(range(10)))
+
+def test_lone_request_is_not_delayed():
+    batcher = MicroBatcher(runner=make_runner([]), max_wait_ms=500)
+
+    start = time.monotonic()
+    with batcher.track():
+        batcher.run([1])
+
+    assert time.monotonic() - start < 0.25
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+    batcher = MicroBatcher(runner=make_runner(calls), max_batch_size=8, max_wait_ms=500)
+    results = {}
+    ready = threading.Barrier(3)
+
+    def caller(value):
+        with batcher.track():
+            ready.wait()
+            time.sleep(0.01 * value)
+            results[value] = batcher.run([value, value])
+
+    threads = [threading.Thread(target=caller, args=(value,)) for value in (1, 2, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(calls[0]) == [1, 1, 2, 2, 3, 3]
+    for value in (1, 2, 3):
+        assert np.allclose(results[value], [[value, value * 10]] * 2)
+
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["requests"] == 3
+    assert stats["avg_batch_size"] == 6
+    assert stats["batch_size_histogram"]["5-8"] == 1
+
+def test_batch_respects_max_batch_size():
+    calls = []
+    batcher = MicroBatcher(runner=make_runner(calls, delay=0.05), max_batch_size=2)
+
+    first = batcher.submit([1])
+    time.sleep(0.01)
+    pending = [batcher.submit([value]) for value in (2, 3, 4)]
+    assert batcher.stats()["queue_depth"] == 3
+
+    first.result()
+    for future in pending:
+        future.result()
+
+    assert calls == [[1], [2, 3], [4]]
+
+def test_runner_error_is_raised_to_every_caller():
+    def runner(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(runner=runner)
+
+    future = batcher.submit(["text"])
+
+    assert isinstance(future.exception(), RuntimeError)
+
+def test_disabled_batcher_calls_runner_directly():
+    calls = []
+    batcher = MicroBatcher(runner=make_runner(calls), enabled=False)
+
+    batcher.run([5])
+
+    assert calls == [[5]]
+    assert batcher.stats()["batches"] == 0
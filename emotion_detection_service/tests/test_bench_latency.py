@@ -0,0 +1,70 @@
+import time
+
+from flask import Flask
+from unittest.mock import patch
+
+from app.config import Config
+from app.emotion import emotion_bp
+from app.emotion.admission import admission
+from app.utils.error_handlers import registor_error_handlers
+from benchmarks.bench_latency import (
+    CONCURRENCY, build_corpus, summarize, find_regressions, start_server, endpoint_target, run_scenario
+)
+
+def make_row(p95_ms, texts_per_sec):
+    return {"target": "predict", "strategy": "average", "concurrency": 1, "tokens": 64,
+            "p95_ms": p95_ms, "texts_per_sec": texts_per_sec}
+
+def test_summarize_reports_percentiles_and_throughput():
+    summary = summarize([0.01] * 98 + [0.1, 0.2], wall_seconds=2.0, tokens=1000)
+
+    assert summary["requests"] == 100
+    assert summary["p50_ms"] == 10.0
+    assert summary["p99_ms"] > summary["p95_ms"]
+    assert summary["texts_per_sec"] == 50.0
+    assert summary["tokens_per_sec"] == 500.0
+
+def test_find_regressions_flags_slower_scenarios():
+    baseline = {"results": [make_row(10.0, 100.0)]}
+
+    assert find_regressions([make_row(10.5, 95.0)], baseline, 0.10) == []
+
+    regressions = find_regressions([make_row(12.0, 80.0)], baseline, 0.10)
+    assert [regression["metric"] for regression in regressions] == ["p95_ms", "texts_per_sec"]
+
+def test_find_regressions_ignores_new_scenarios():
+    assert find_regressions([make_row(50.0, 1.0)], {"results": []}, 0.10) == []
+
+def test_build_corpus_hits_target_lengths(tiny_model):
+    corpus = build_corpus([16, 600], per_length=2)
+
+    assert [length for length, _, _ in corpus] == [16, 16, 600, 600]
+    assert len({text for _, text, _ in corpus}) == 4
+    for length, _, tokens in corpus:
+        assert abs(tokens - length) <= 2
+
+def test_endpoint_target_admits_every_client_under_default_config(tiny_model, monkeypatch):
+    monkeypatch.setattr(admission, "max_in_flight", Config.ADMISSION_MAX_IN_FLIGHT)
+    monkeypatch.setattr(admission, "enabled", Config.ADMISSION_ENABLED)
+    concurrency = max(CONCURRENCY)
+    assert admission.enabled and concurrency > admission.max_in_flight
+
+    app = Flask(__name__)
+    registor_error_handlers(app)
+    app.register_blueprint(emotion_bp, url_prefix="/api/v1/emotion_detect")
+    texts = [f"entry {i} i feel happy today" for i in range(concurrency)]
+    infer = tiny_model._infer
+
+    def slow_infer(chunks):
+        # Keeps every client's request in flight at the same time
+        time.sleep(0.3)
+        return infer(chunks)
+
+    server, url = start_server(app, concurrency)
+    try:
+        with patch.object(tiny_model, "_infer", side_effect=slow_infer):
+            latencies, _ = run_scenario(endpoint_target(url, "average"), texts, concurrency)
+    finally:
+        server.shutdown()
+
+    assert len(latencies) == concurrency
@@ -0,0 +1,109 @@
+import numpy as np
+from unittest.mock import patch
+
+from app.emotion.cache import PredictionCache
+from app.emotion.emotion_detection import EmotionDetection
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_make_key_normalizes_whitespace():
+    key = PredictionCache.make_key("  I feel\n good ", "average", "v1")
+
+    assert key == PredictionCache.make_key("I feel good", "average", "v1")
+    assert key != PredictionCache.make_key("I feel good", "max", "v1")
+    assert key != PredictionCache.make_key("I feel good", "average", "v2")
+
+def test_get_and_put_count_hits_and_misses():
+    cache = PredictionCache()
+
+    assert cache.get("key") is None
+    cache.put("key", [0.1, 0.9])
+
+    assert np.allclose(cache.get("key"), [0.1, 0.9])
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+def test_evicts_least_recently_used_over_memory_budget():
+    entry_size = np.zeros(28, dtype=np.float32).nbytes + len("a") + PredictionCache.entry_overhead
+    cache = PredictionCache(max_bytes=entry_size * 2)
+
+    cache.put("a", np.zeros(28))
+    cache.put("b", np.zeros(28))
+    cache.get("a")
+    cache.put("c", np.zeros(28))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(ttl=10, clock=clock)
+
+    cache.put("key", [0.5])
+    clock.now = 9
+    assert cache.get("key") is not None
+    clock.now = 10
+
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+def test_disabled_cache_stores_nothing():
+    cache = PredictionCache(enabled=False)
+
+    cache.put("key", [0.5])
+
+    assert cache.get("key") is None
+
+def test_predict_reuses_cached_vector_for_other_thresholds():
+    EmotionDetection.max_length = 10
+    EmotionDetection.emotion_labels = ["joy", "sadness"]
+    EmotionDetection.model_version = "v1"
+
+    with patch(
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
+    ), patch(
+        "app.emotion.emotion_detection.EmotionDetection.tokenizer"
+    ) as tokenizer, patch(
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        return_value=np.array([[0.8, 0.2]])
+    ) as infer:
+        tokenizer.encode.return_value = [1, 2]
+
+        first = EmotionDetection.predict("I feel good", threshold=0.3)
+        second = EmotionDetection.predict("I feel  good ", threshold=0.9, top_k=1)
+
+    assert infer.call_count == 1
+    assert first[0]["detected"] is True
+    assert second == [{"emotion": "joy", "score": 80.0, "detected": False}]
+
+def test_predict_batch_only_infers_uncached_texts():
+    EmotionDetection.max_length = 10
+    EmotionDetection.emotion_labels = ["joy"]
+    EmotionDetection.model_version = "v1"
+    EmotionDetection.tokenizer = None
+
+    with patch(
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
+    ), patch(
+        "app.emotion.emotion_detection.EmotionDetection._encode",
+        side_effect=lambda texts: [[1] for _ in texts]
+    ) as encode, patch(
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        side_effect=lambda chunks: np.array([[0.6]] * len(chunks))
+    ):
+        EmotionDetection.predict_batch(["cached"])
+        results = EmotionDetection.predict_batch(["cached", "new"])
+
+    assert encode.call_args_list[-1].args == (["new"],)
+    assert [result[0]["score"] for result in results] == [60.0, 60.0]
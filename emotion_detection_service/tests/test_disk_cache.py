@@ -0,0 +1,79 @@
+import numpy as np
+from unittest.mock import patch
+
+from app.emotion.disk_cache import DiskCache
+from app.emotion.emotion_detection import EmotionDetection
+from app.emotion.cache import prediction_cache
+
+def open_cache(tmp_path, model_version="v1", **kwargs):
+    cache = DiskCache(path=str(tmp_path / "predictions.sqlite3"), enabled=True, **kwargs)
+    cache.open(model_version)
+    return cache
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = open_cache(tmp_path)
+
+    cache.put("key", np.array([0.25, 0.75]))
+
+    assert np.allclose(cache.get("key"), [0.25, 0.75])
+    assert cache.get("other") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+def test_entries_survive_reopen_with_same_model(tmp_path):
+    open_cache(tmp_path).put("key", [0.5])
+
+    reopened = open_cache(tmp_path)
+
+    assert reopened.get("key") is not None
+
+def test_model_version_change_invalidates_cache(tmp_path):
+    open_cache(tmp_path, "v1").put("key", [0.5])
+
+    reopened = open_cache(tmp_path, "v2")
+
+    assert reopened.get("key") is None
+    assert reopened.stats()["entries"] == 0
+
+def test_evicts_least_recently_used_over_cap(tmp_path):
+    cache = open_cache(tmp_path, max_entries=10)
+    cache.evict_check_every = 1
+
+    with patch("app.emotion.disk_cache.time.time", side_effect=range(100)):
+        for i in range(11):
+            cache.put(f"key-{i}", [float(i)])
+
+    stats = cache.stats()
+    assert stats["entries"] == 9
+    assert stats["evictions"] == 2
+    assert cache.get("key-0") is None
+    assert cache.get("key-10") is not None
+
+def test_disabled_cache_is_a_no_op():
+    cache = DiskCache()
+
+    cache.put("key", [0.5])
+
+    assert cache.get("key") is None
+
+def test_predict_falls_back_to_disk_cache(tmp_path):
+    EmotionDetection.emotion_labels = ["joy"]
+    EmotionDetection.model_version = "v1"
+    cache = open_cache(tmp_path)
+    key = prediction_cache.make_key("I feel good", "average", "v1")
+    cache.put(key, [0.8])
+
+    with patch(
+        "app.emotion.emotion_detection.disk_cache", cache
+    ), patch(
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
+    ), patch(
+        "app.emotion.emotion_detection.EmotionDetection._infer"
+    ) as infer:
+        result = EmotionDetection.predict("I feel good")
+
+    infer.assert_not_called()
+    assert result[0]["score"] == 80.0
+    assert prediction_cache.get(key) is not None
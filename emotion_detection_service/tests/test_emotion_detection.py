@@ -13,59 +13,55 @@ def reset_emotion_detection():
 
 def test_load_model_only_once():
     fake_tokenizer = MagicMock()
-    fake_model = MagicMock()
-    fake_model.config.id2label = {0: "joy", 1: "sadness"}
+    fake_backend = MagicMock()
+    fake_backend.device = "cpu"
+    fake_backend.config.id2label = {0: "joy", 1: "sadness"}
 
     with patch(
-        "app.emotion_detection.emotion_detection.DistilBertTokenizerFast.from_pretrained",
+        "app.emotion.emotion_detection.DistilBertTokenizerFast.from_pretrained",
         return_value=fake_tokenizer
     ), patch(
-        "app.emotion_detection.emotion_detection.DistilBertForSequenceClassification.from_pretrained",
-        return_value=fake_model
-    ), patch(
-        "app.emotion_detection.emotion_detection.torch.device",
-        return_value="cpu"
-    ), patch(
-        "app.emotion_detection.emotion_detection.torch.cuda.is_available",
-        return_value=False
+        "app.emotion.emotion_detection.load_backend",
+        return_value=fake_backend
+    ) as load_backend, patch(
+        "app.emotion.emotion_detection.model_fingerprint",
+        return_value="abc123"
     ):
 
         EmotionDetection.load_model()
         EmotionDetection.load_model()  # second call should do nothing
 
+        load_backend.assert_called_once()
         assert EmotionDetection.tokenizer == fake_tokenizer
-        assert EmotionDetection.model == fake_model
+        assert EmotionDetection.model == fake_backend
+        assert EmotionDetection.device == "cpu"
         assert EmotionDetection.emotion_labels == ["joy", "sadness"]
+        assert EmotionDetection.model_version == "abc123-torch-fp32"
 
-def test_predict_chunk_returns_numpy_array():
+def test_predict_chunks_returns_numpy_array():
     EmotionDetection.tokenizer = MagicMock()
     EmotionDetection.model = MagicMock()
     EmotionDetection.device = "cpu"
 
-    fake_tensor = MagicMock()
-    fake_tensor.squeeze.return_value.cpu.return_value.numpy.return_value = np.array([0.1, 0.9])
-
-    EmotionDetection.tokenizer.return_value.to.return_value = {}
-    EmotionDetection.model.return_value.logits = fake_tensor
+    EmotionDetection.tokenizer.cls_token_id = 101
+    EmotionDetection.tokenizer.sep_token_id = 102
+    EmotionDetection.tokenizer.pad_token_id = 0
+    EmotionDetection.model.predict_logits.return_value = np.array([[0.0, 1.0], [1.0, 0.0]])
 
-    with patch("app.emotion_detection.emotion_detection.torch.no_grad"):
-        result = EmotionDetection._predict_chunk("text")
+    result = EmotionDetection._predict_chunks([[7, 8], [7, 8, 9]])
 
-        assert isinstance(result, np.ndarray)
-        assert result.shape == (2,)
+    assert isinstance(result, np.ndarray)
+    assert result.shape == (2, 2)
+    assert np.allclose(result[0], [0.5, 0.7310586])
 
 def test_predict_with_chunking_average():
     EmotionDetection.tokenizer = MagicMock()
-    EmotionDetection.tokenizer.decode.return_value = "chunk"
     EmotionDetection.chunk_overlap = 0
     EmotionDetection.max_length = 5
 
     with patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection._predict_chunk",
-        side_effect=[
-            np.array([0.2, 0.8]),
-            np.array([0.6, 0.4])
-        ]
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        return_value=np.array([[0.2, 0.8], [0.6, 0.4]])
     ):
         tokens = list(range(10))
         result = EmotionDetection._predict_with_chunking(tokens, "average")
@@ -74,16 +70,12 @@ def test_predict_with_chunking_average():
 
 def test_predict_with_chunking_max():
     EmotionDetection.tokenizer = MagicMock()
-    EmotionDetection.tokenizer.decode.return_value = "chunk"
     EmotionDetection.chunk_overlap = 0
     EmotionDetection.max_length = 5
 
     with patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection._predict_chunk",
-        side_effect=[
-            np.array([0.1, 0.9]),
-            np.array([0.8, 0.2])
-        ]
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        return_value=np.array([[0.1, 0.9], [0.8, 0.2]])
     ):
         tokens = list(range(10))
         result = EmotionDetection._predict_with_chunking(tokens, "max")
@@ -124,19 +116,78 @@ def test_format_results_top_k():
 
     assert len(result) == 2
 
+def reference_format_results(probabilities, threshold, top_k):
+    # The original per-label implementation the vectorized formatter replaces
+    results = []
+    for i, emotion in enumerate(EmotionDetection.emotion_labels):
+        prob = float(probabilities[i])
+        results.append({'emotion': emotion, 'score': round(prob * 100, 2), 'detected': prob >= threshold})
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results[:top_k] if top_k else results
+
+@pytest.mark.parametrize("top_k", [None, 1, 5, 28, 40])
+def test_format_results_batch_matches_per_label_formatting(top_k):
+    EmotionDetection.emotion_labels = [f"label_{i}" for i in range(28)]
+    probabilities = np.random.default_rng(0).random((16, 28))
+
+    results = EmotionDetection._format_results_batch(probabilities, 0.3, top_k)
+
+    assert results == [reference_format_results(row, 0.3, top_k) for row in probabilities]
+
+def test_format_results_batch_orders_ties_by_label():
+    EmotionDetection.emotion_labels = ["joy", "sadness", "anger"]
+
+    results = EmotionDetection._format_results_batch(np.array([[0.5, 0.9, 0.5]]), 0.3, 2)
+
+    assert [result["emotion"] for result in results[0]] == ["sadness", "joy"]
+
+def test_format_results_batch_keeps_lowest_label_tied_at_top_k_cutoff():
+    EmotionDetection.emotion_labels = [f"l{i}" for i in range(28)]
+    # Six labels at 100, five at 75, then eight tied at 50 for the 12th place
+    scores = [50, 25, 100, 75, 75, 100, 75, 0, 0, 100, 50, 0, 50, 25,
+              50, 50, 25, 50, 50, 100, 75, 75, 0, 25, 100, 25, 50, 100]
+    probabilities = np.array([scores]) / 100
+
+    results = EmotionDetection._format_results_batch(probabilities, 0.3, 12)
+
+    assert results == [reference_format_results(probabilities[0], 0.3, 12)]
+    assert results[0][-1] == {"emotion": "l0", "score": 50.0, "detected": True}
+
+def test_format_results_batch_matches_per_label_formatting_with_rounded_ties():
+    EmotionDetection.emotion_labels = [f"label_{i}" for i in range(28)]
+    # Few distinct rounded scores, so almost every cut-off falls inside a tie
+    probabilities = np.random.default_rng(1).integers(0, 4, size=(500, 28)) / 4
+
+    for top_k in (1, 5, 12, 27):
+        results = EmotionDetection._format_results_batch(probabilities, 0.3, top_k)
+
+        assert results == [reference_format_results(row, 0.3, top_k) for row in probabilities]
+
+def test_format_compact_batch_keeps_label_order():
+    result = EmotionDetection._format_compact_batch(np.array([[0.1234, 0.9], [0.5, 0.0]]))
+
+    assert result == [[12.34, 90.0], [50.0, 0.0]]
+
+def test_predict_batch_compact(tiny_model):
+    results = tiny_model.predict_batch(["i feel happy", "i feel sad"], compact=True)
+
+    assert len(results) == 2
+    assert all(len(scores) == len(tiny_model.emotion_labels) for scores in results)
+    assert all(isinstance(score, float) for score in results[0])
+
 def test_predict_short_text():
     EmotionDetection.max_length = 10
     EmotionDetection.emotion_labels = ["joy"]
 
     with patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection.load_model"
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
     ), patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection.tokenizer"
+        "app.emotion.emotion_detection.EmotionDetection.tokenizer"
     ) as tokenizer, patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection._predict_chunk",
-        return_value=np.array([0.9])
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        return_value=np.array([[0.9]])
     ), patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection._format_results",
+        "app.emotion.emotion_detection.EmotionDetection._format_results",
         return_value=[{"emotion": "joy"}]
     ):
         tokenizer.encode.return_value = [1, 2]
@@ -150,14 +201,14 @@ def test_predict_long_text():
     EmotionDetection.emotion_labels = ["joy"]
 
     with patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection.load_model"
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
     ), patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection.tokenizer"
+        "app.emotion.emotion_detection.EmotionDetection.tokenizer"
     ) as tokenizer, patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection._predict_with_chunking",
+        "app.emotion.emotion_detection.EmotionDetection._predict_with_chunking",
         return_value=np.array([0.7])
     ), patch(
-        "app.emotion_detection.emotion_detection.EmotionDetection._format_results",
+        "app.emotion.emotion_detection.EmotionDetection._format_results",
         return_value=[{"emotion": "joy"}]
     ):
         tokenizer.encode.return_value = [1, 2, 3, 4, 5]
@@ -165,3 +216,73 @@ def test_predict_long_text():
         result = EmotionDetection.predict("long text")
 
         assert result[0]["emotion"] == "joy"
+
+def test_predict_batch_keeps_input_order_and_sorts_rows_by_length():
+    EmotionDetection.max_length = 10
+    EmotionDetection.inference_batch_size = 2
+    EmotionDetection.emotion_labels = ["joy", "sadness"]
+    EmotionDetection.tokenizer = MagicMock()
+    EmotionDetection.tokenizer.return_value = {
+        "input_ids": [[1], [1, 2, 3], [1, 2]]
+    }
+    scores = {1: [0.1, 0.9], 3: [0.8, 0.2], 2: [0.5, 0.5]}
+    calls = []
+
+    def fake_infer(chunks):
+        calls.append([len(chunk) for chunk in chunks])
+        return np.array([scores[len(chunk)] for chunk in chunks])
+
+    with patch(
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
+    ), patch(
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        side_effect=fake_infer
+    ):
+        result = EmotionDetection.predict_batch(["short", "long", "medium"], threshold=0.3)
+
+    assert calls == [[3, 2], [1]]
+    assert [item[0]["emotion"] for item in result] == ["sadness", "joy", "joy"]
+
+def test_predict_batch_isolates_failed_group():
+    EmotionDetection.max_length = 10
+    EmotionDetection.inference_batch_size = 1
+    EmotionDetection.emotion_labels = ["joy"]
+    EmotionDetection.tokenizer = MagicMock()
+    EmotionDetection.tokenizer.return_value = {"input_ids": [[1], [1, 2]]}
+
+    def fake_infer(chunks):
+        if chunks == [[1, 2]]:
+            raise RuntimeError("forward failed")
+        return np.array([[0.7]])
+
+    with patch(
+        "app.emotion.emotion_detection.EmotionDetection.load_model"
+    ), patch(
+        "app.emotion.emotion_detection.EmotionDetection._infer",
+        side_effect=fake_infer
+    ):
+        result = EmotionDetection.predict_batch(["good", "bad"])
+
+    assert result[0][0]["score"] == 70.0
+    assert isinstance(result[1], RuntimeError)
+
+def test_split_into_chunks_uses_overlapping_token_windows():
+    EmotionDetection.max_length = 6
+    EmotionDetection.chunk_overlap = 1
+
+    chunks = EmotionDetection._split_into_chunks(list(range(10)))
+
+    assert chunks == [[0, 1, 2, 3], [3, 4, 5, 6], [6, 7, 8, 9]]
+
+def test_build_inputs_wraps_windows_in_special_tokens():
+    EmotionDetection.tokenizer = MagicMock()
+    EmotionDetection.tokenizer.cls_token_id = 101
+    EmotionDetection.tokenizer.sep_token_id = 102
+    EmotionDetection.tokenizer.pad_token_id = 0
+    EmotionDetection.padding = "longest"
+    EmotionDetection.pad_to_multiple_of = 4
+
+    inputs = EmotionDetection._build_inputs([[7, 8, 9], [7]])
+
+    assert inputs["input_ids"].tolist() == [[101, 7, 8, 9, 102, 0, 0, 0], [101, 7, 102, 0, 0, 0, 0, 0]]
+    assert inputs["attention_mask"].tolist() == [[1, 1, 1, 1, 1, 0, 0, 0], [1, 1, 1, 0, 0, 0, 0, 0]]
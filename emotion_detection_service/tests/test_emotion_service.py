@@ -8,10 +8,10 @@ def test_analyze_success_minimal():
     fake_result = {"joy": 0.91}
 
     with patch(
-        "app.services.emotion_service.EmotionDetection.predict",
+        "app.emotion.services.EmotionDetection.predict",
         return_value=fake_result
     ), patch(
-        "app.services.emotion_service.EmotionDetection.default_threshhold",
+        "app.emotion.services.EmotionDetection.default_threshhold",
         0.3
     ):
 
@@ -23,7 +23,7 @@ def test_analyze_success_all_params():
     fake_result = {"sadness": 0.7}
 
     with patch(
-        "app.services.emotion_service.EmotionDetection.predict",
+        "app.emotion.services.EmotionDetection.predict",
         return_value=fake_result
     ) as predict:
 
@@ -40,7 +40,8 @@ def test_analyze_success_all_params():
             text="I feel bad",
             threshold=0.2,
             top_k=5,
-            strategy="max"
+            strategy="max",
+            compact=False
         )
         assert result == fake_result
 
@@ -89,9 +90,10 @@ def test_analyze_invalid_top_k():
         })
 
 def test_model_info():
-    with patch("app.services.emotion_service.EmotionDetection.device", "cpu"), \
-         patch("app.services.emotion_service.EmotionDetection.max_length", 512), \
-         patch("app.services.emotion_service.EmotionDetection.emotion_labels",
+    with patch("app.emotion.services.EmotionDetection.ready", True), \
+         patch("app.emotion.services.EmotionDetection.device", "cpu"), \
+         patch("app.emotion.services.EmotionDetection.max_length", 512), \
+         patch("app.emotion.services.EmotionDetection.emotion_labels",
                ["joy", "sadness"]):
 
         result = EmotionService.model_info()
@@ -105,7 +107,7 @@ def test_emotion_label_info():
     labels = ["joy", "anger", "fear"]
 
     with patch(
-        "app.services.emotion_service.EmotionDetection.emotion_labels",
+        "app.emotion.services.EmotionDetection.emotion_labels",
         labels
     ):
         result = EmotionService.emotion_label_info()
@@ -113,3 +115,75 @@ def test_emotion_label_info():
         assert result["count"] == 3
         assert result["emotions"] == labels
         assert "average" in result["strategies"]
+
+def test_analyze_batch_success():
+    fake_results = [[{"emotion": "joy"}], [{"emotion": "sadness"}]]
+
+    with patch(
+        "app.emotion.services.EmotionDetection.predict_batch",
+        return_value=fake_results
+    ) as predict_batch:
+
+        result = EmotionService.analyze_batch({
+            "texts": [" happy ", "sad"],
+            "threshold": 0.2,
+            "top_k": 3,
+            "strategy": "max"
+        })
+
+        predict_batch.assert_called_once_with(
+            texts=["happy", "sad"],
+            threshold=0.2,
+            top_k=3,
+            strategy="max",
+            compact=False
+        )
+        assert result == [
+            {"index": 0, "success": True, "emotions": [{"emotion": "joy"}]},
+            {"index": 1, "success": True, "emotions": [{"emotion": "sadness"}]}
+        ]
+
+def test_analyze_batch_invalid_items_do_not_fail_batch():
+    with patch(
+        "app.emotion.services.EmotionDetection.predict_batch",
+        return_value=[[{"emotion": "joy"}], RuntimeError("boom")]
+    ) as predict_batch:
+
+        result = EmotionService.analyze_batch({"texts": ["happy", 42, "   ", "sad"]})
+
+        predict_batch.assert_called_once()
+        assert predict_batch.call_args.kwargs["texts"] == ["happy", "sad"]
+        assert [item["success"] for item in result] == [True, False, False, False]
+        assert [item["index"] for item in result] == [0, 1, 2, 3]
+        assert "error" in result[3]
+
+def test_analyze_batch_requires_list():
+    with pytest.raises(BadRequestError):
+        EmotionService.analyze_batch({"texts": "hello"})
+
+def test_analyze_batch_empty_list():
+    with pytest.raises(BadRequestError):
+        EmotionService.analyze_batch({"texts": []})
+
+def test_analyze_batch_too_many_texts():
+    with patch("app.emotion.services.EmotionService.max_batch_texts", 2):
+        with pytest.raises(BadRequestError):
+            EmotionService.analyze_batch({"texts": ["a", "b", "c"]})
+
+def test_analyze_batch_invalid_strategy():
+    with pytest.raises(BadRequestError):
+        EmotionService.analyze_batch({"texts": ["hello"], "strategy": "median"})
+
+def test_analyze_compact_format():
+    with patch(
+        "app.emotion.services.EmotionDetection.predict",
+        return_value=[80.0, 20.0]
+    ) as predict:
+        result = EmotionService.analyze({"text": "I feel good", "format": "compact"})
+
+        assert predict.call_args.kwargs["compact"] is True
+        assert result == [80.0, 20.0]
+
+def test_analyze_invalid_format():
+    with pytest.raises(BadRequestError):
+        EmotionService.analyze({"text": "hello", "format": "xml"})
@@ -0,0 +1,30 @@
+import os
+import sys
+import subprocess
+
+from app.emotion.threads import available_cpus
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_config_then_app(env):
+    """Run gunicorn.conf.py, then import the app config, in a fresh interpreter."""
+    code = (
+        "import runpy; runpy.run_path('gunicorn.conf.py'); "
+        "from app.config import Config; "
+        "print(Config.GUNICORN_PRELOAD, Config.GUNICORN_WORKERS)"
+    )
+    env = {key: value for key, value in os.environ.items() if not key.startswith("GUNICORN_")} | env
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SERVICE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    preload, workers = result.stdout.split()
+    return preload == "True", int(workers)
+
+def test_app_config_sees_settings_from_gunicorn_conf():
+    preload, workers = load_config_then_app({})
+
+    assert preload is True
+    assert workers == len(available_cpus())
+
+def test_app_config_sees_explicit_worker_count():
+    assert load_config_then_app({"GUNICORN_WORKERS": "3", "GUNICORN_PRELOAD": "false"}) == (False, 3)
@@ -0,0 +1,86 @@
+import pytest
+from flask import Flask
+from unittest.mock import patch
+
+from app.emotion import emotion_bp
+from app.emotion.metrics import Metrics, token_bucket, chunk_bucket
+
+@pytest.fixture
+def fresh_metrics():
+    instance = Metrics()
+    with patch("app.emotion.emotion_detection.metrics", instance):
+        yield instance
+
+def stage_count(instance, stage, tokens, chunks):
+    return instance.registry.get_sample_value(
+        "emotion_stage_seconds_count", {"stage": stage, "tokens": tokens, "chunks": chunks}
+    )
+
+def test_token_and_chunk_buckets():
+    assert token_bucket(None) == "cached"
+    assert token_bucket(10) == "0-64"
+    assert token_bucket(300) == "257-510"
+    assert token_bucket(6000) == "5001+"
+    assert chunk_bucket(0) == "0"
+    assert chunk_bucket(1) == "1"
+    assert chunk_bucket(3) == "3-4"
+    assert chunk_bucket(12) == "9+"
+
+def test_predict_records_each_stage_once(tiny_model, fresh_metrics):
+    tiny_model.predict("i feel happy today")
+
+    for stage in ("cache", "tokenize", "inference", "format"):
+        assert stage_count(fresh_metrics, stage, "0-64", "1") == 1
+    assert fresh_metrics.registry.get_sample_value("emotion_chunks_processed_total") == 1
+    assert fresh_metrics.registry.get_sample_value("emotion_texts_processed_total", {"source": "model"}) == 1
+
+def test_cache_hits_are_labelled_cached(tiny_model, fresh_metrics):
+    tiny_model.predict("i feel happy today")
+    tiny_model.predict("i feel happy today")
+
+    assert stage_count(fresh_metrics, "format", "cached", "0") == 1
+    assert stage_count(fresh_metrics, "tokenize", "cached", "0") is None
+    assert fresh_metrics.registry.get_sample_value(
+        "emotion_texts_processed_total", {"source": "memory_cache"}
+    ) == 1
+
+def test_long_text_records_chunks_and_aggregation(tiny_model, fresh_metrics):
+    tiny_model.max_length = 12
+    tiny_model.chunk_overlap = 2
+
+    tiny_model.predict(" ".join(["i feel happy today"] * 6))
+
+    assert stage_count(fresh_metrics, "aggregate", "0-64", "3-4") == 1
+    assert fresh_metrics.registry.get_sample_value("emotion_inference_batch_rows_count") == 1
+
+def test_batch_counts_failed_groups_as_errors(tiny_model, fresh_metrics):
+    with patch.object(tiny_model, "_infer", side_effect=RuntimeError("boom")):
+        results = tiny_model.predict_batch(["i feel sad", "i feel calm"])
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert fresh_metrics.registry.get_sample_value("emotion_errors_total", {"type": "RuntimeError"}) == 1
+
+def test_stage_outside_request_is_a_no_op():
+    instance = Metrics()
+
+    with instance.stage("tokenize"):
+        pass
+
+    assert instance.registry.get_sample_value(
+        "emotion_stage_seconds_count", {"stage": "tokenize", "tokens": "cached", "chunks": "0"}
+    ) is None
+
+def test_metrics_endpoint_exposes_request_counters():
+    instance = Metrics()
+    app = Flask(__name__)
+    app.register_blueprint(emotion_bp, url_prefix="/api/v1/emotion_detect")
+    instance.init_app(app)
+
+    with patch("app.emotion.routes.metrics", instance):
+        client = app.test_client()
+        client.get("/api/v1/emotion_detect/metrics")
+        response = client.get("/api/v1/emotion_detect/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    assert b'emotion_http_requests_total{endpoint="/api/v1/emotion_detect/metrics",method="GET",status="200"} 1.0' in response.data
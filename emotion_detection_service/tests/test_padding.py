@@ -0,0 +1,75 @@
+import torch
+import numpy as np
+from unittest.mock import patch
+
+SENTENCES = [
+    "happy",
+    "i feel so happy today",
+    "yesterday was a bad day but today is a good day , my friend",
+    " ".join(["i felt calm at home and it was very good ."] * 30),
+    " ".join(["work was bad and i was angry"] * 70),
+]
+
+def predict_with_padding(detection, padding, texts):
+    detection.padding = padding
+    return detection._predict_chunks(detection._encode(texts))
+
+def test_dynamic_padding_matches_max_length_padding(tiny_model):
+    fixed = predict_with_padding(tiny_model, "max_length", SENTENCES)
+    dynamic = predict_with_padding(tiny_model, "longest", SENTENCES)
+
+    assert dynamic.shape == fixed.shape
+    assert np.allclose(dynamic, fixed, atol=1e-5)
+
+def test_dynamic_padding_matches_for_single_texts(tiny_model):
+    for text in SENTENCES:
+        fixed = predict_with_padding(tiny_model, "max_length", [text])
+        dynamic = predict_with_padding(tiny_model, "longest", [text])
+
+        assert np.allclose(dynamic, fixed, atol=1e-5)
+
+def test_dynamic_padding_rounds_up_to_bucket(tiny_model):
+    tiny_model.padding = "longest"
+    tiny_model.pad_to_multiple_of = 16
+    inputs = tiny_model._build_inputs(tiny_model._encode(["i feel so happy today"]))
+
+    assert inputs["input_ids"].shape == (1, 16)
+
+def test_dynamic_padding_never_exceeds_max_length(tiny_model):
+    tiny_model.padding = "longest"
+    tiny_model.pad_to_multiple_of = 300
+    inputs = tiny_model._build_inputs(tiny_model._encode([SENTENCES[-1]]))
+
+    assert inputs["input_ids"].shape == (1, 512)
+
+def test_max_length_padding_keeps_fixed_shape(tiny_model):
+    tiny_model.padding = "max_length"
+    inputs = tiny_model._build_inputs(tiny_model._encode(["happy"]))
+
+    assert inputs["input_ids"].shape == (1, 512)
+
+def test_token_windows_match_tokenizer_special_tokens(tiny_model):
+    text = SENTENCES[2]
+    expected_inputs = tiny_model.tokenizer([text], return_tensors="pt")
+    with torch.no_grad():
+        expected = torch.sigmoid(tiny_model.model.model(**expected_inputs).logits).numpy()
+
+    result = tiny_model._predict_chunks(tiny_model._encode([text]))
+
+    assert np.allclose(result, expected, atol=1e-5)
+
+def test_long_text_chunks_run_in_bounded_batches(tiny_model, monkeypatch):
+    monkeypatch.setattr(tiny_model, "max_length", 64)
+    monkeypatch.setattr(tiny_model, "chunk_overlap", 8)
+    monkeypatch.setattr(tiny_model, "inference_batch_size", 2)
+    tokens = tiny_model._encode([SENTENCES[3]])[0]
+    chunks = tiny_model._split_into_chunks(tokens)
+    one_by_one = np.array([tiny_model._predict_chunks([chunk])[0] for chunk in chunks])
+
+    with patch.object(tiny_model, "_predict_chunks", wraps=tiny_model._predict_chunks) as predict_chunks:
+        result = tiny_model._predict_with_chunking(tokens, "average")
+
+    assert len(chunks) > tiny_model.inference_batch_size
+    assert predict_chunks.call_count == -(-len(chunks) // tiny_model.inference_batch_size)
+    assert all(len(call.args[0]) <= tiny_model.inference_batch_size for call in predict_chunks.call_args_list)
+    assert np.allclose(result, one_by_one.mean(axis=0), atol=1e-5)
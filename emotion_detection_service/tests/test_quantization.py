@@ -0,0 +1,87 @@
+import json
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+from app.emotion.emotion_detection import EmotionDetection
+from app.emotion.quantization import REPORT_FILE, evaluate, f1_scores, quantization_approved
+
+SAMPLES = [
+    {"text": "i feel so happy today"},
+    {"text": "yesterday was a bad day"},
+    {"text": "my friend was angry at work"},
+    {"text": "calm night at home"},
+]
+
+def test_f1_scores_micro_and_per_label():
+    expected = np.array([[True, False], [True, True]])
+    predicted = np.array([[True, False], [False, True]])
+
+    micro, per_label = f1_scores(predicted, expected, ["joy", "sadness"])
+
+    assert round(micro, 4) == 0.8
+    assert per_label == {"joy": 0.6667, "sadness": 1.0}
+
+def test_evaluate_compares_int8_with_fp32(tiny_model_path):
+    report = evaluate(tiny_model_path, SAMPLES, threshold=0.5, max_f1_drop=1.0)
+
+    assert report["reference"] == "fp32_predictions"
+    assert report["fp32_micro_f1"] == 1.0
+    assert report["approved"] is True
+    assert set(report["per_label_f1"]) == {"joy", "sadness", "anger", "neutral"}
+    assert report["max_abs_probability_diff"] < 0.1
+
+def test_evaluate_uses_gold_labels_when_present(tiny_model_path):
+    samples = [dict(sample, labels=["joy"]) for sample in SAMPLES]
+
+    report = evaluate(tiny_model_path, samples, threshold=0.5)
+
+    assert report["reference"] == "gold_labels"
+
+def write_report(model_path, **fields):
+    with open(f"{model_path}/{REPORT_FILE}", "w") as f:
+        json.dump(fields, f)
+
+def test_quantization_refused_without_report(tmp_path):
+    approved, reason = quantization_approved(str(tmp_path), 0.01)
+
+    assert approved is False
+    assert REPORT_FILE in reason
+
+def test_quantization_refused_when_f1_drop_too_large(tmp_path):
+    with patch("app.emotion.quantization.model_fingerprint", return_value="abc"):
+        write_report(tmp_path, model_fingerprint="abc", micro_f1_drop=0.05)
+
+        approved, _ = quantization_approved(str(tmp_path), 0.01)
+
+    assert approved is False
+
+def test_quantization_refused_for_other_model_files(tmp_path):
+    with patch("app.emotion.quantization.model_fingerprint", return_value="new"):
+        write_report(tmp_path, model_fingerprint="old", micro_f1_drop=0.0)
+
+        approved, _ = quantization_approved(str(tmp_path), 0.01)
+
+    assert approved is False
+
+def test_load_model_falls_back_to_fp32_when_gate_refuses():
+    EmotionDetection.quantization = "dynamic"
+    fake_backend = MagicMock()
+    fake_backend.config.id2label = {0: "joy"}
+
+    with patch(
+        "app.emotion.emotion_detection.DistilBertTokenizerFast.from_pretrained"
+    ), patch(
+        "app.emotion.emotion_detection.quantization_approved",
+        return_value=(False, "no report")
+    ), patch(
+        "app.emotion.emotion_detection.load_backend",
+        return_value=fake_backend
+    ) as load_backend, patch(
+        "app.emotion.emotion_detection.model_fingerprint",
+        return_value="abc123"
+    ):
+        EmotionDetection.model = None
+        EmotionDetection.load_model()
+
+    assert load_backend.call_args.kwargs["quantize"] is False
+    EmotionDetection.model = None
@@ -0,0 +1,87 @@
+import pytest
+from flask import Flask
+from unittest.mock import patch
+
+from app.emotion import emotion_bp
+from app.emotion.services import EmotionService
+from app.utils.custom_exceptions import ServiceUnavailableError
+from app.utils.error_handlers import registor_error_handlers
+
+def test_warmup_runs_every_shape_and_marks_ready(tiny_model):
+    tiny_model.ready = False
+    shapes = []
+    predict_logits = tiny_model.model.predict_logits
+
+    def record(input_ids, attention_mask):
+        shapes.append(input_ids.shape)
+        return predict_logits(input_ids, attention_mask)
+
+    with patch.object(tiny_model.model, "predict_logits", side_effect=record):
+        tiny_model.warmup()
+
+    assert tiny_model.ready is True
+    assert tiny_model.warmup_seconds is not None
+    assert (1, 16) in shapes
+    assert (tiny_model.inference_batch_size, tiny_model.max_length) in shapes
+
+def test_warmup_disabled_only_marks_ready(tiny_model):
+    tiny_model.ready = False
+    tiny_model.warmup_enabled = False
+
+    with patch.object(tiny_model.model, "predict_logits") as predict_logits:
+        tiny_model.warmup()
+
+    predict_logits.assert_not_called()
+    assert tiny_model.ready is True
+
+def test_predict_records_last_inference_latency(tiny_model):
+    tiny_model.predict("i feel happy")
+
+    assert tiny_model.last_inference_ms > 0
+    assert EmotionService.model_info()["last_inference_at"] is not None
+
+def test_model_info_reports_loading_state(tiny_model):
+    tiny_model.ready = False
+    assert EmotionService.model_info()["status"] == "warming_up"
+
+    tiny_model.ready = True
+    info = EmotionService.model_info()
+    assert info["status"] == "healthy"
+    assert info["load_seconds"] is not None
+
+def test_health_reports_loading_before_the_model_loads(tiny_model):
+    app = Flask(__name__)
+    registor_error_handlers(app)
+    app.register_blueprint(emotion_bp, url_prefix="/api/v1/emotion_detect")
+    tiny_model.ready = False
+    tiny_model.model = None
+    tiny_model.emotion_labels = None
+
+    info = EmotionService.model_info()
+    response = app.test_client().get("/api/v1/emotion_detect/health")
+
+    assert info["status"] == "loading"
+    assert info["num_emotions"] == 0 and info["emotions"] == []
+    assert response.status_code == 503
+
+def test_readiness_raises_until_ready(tiny_model):
+    tiny_model.ready = False
+
+    with pytest.raises(ServiceUnavailableError) as error:
+        EmotionService.readiness()
+
+    assert error.value.details["status"] == "warming_up"
+
+def test_health_route_is_a_readiness_probe(tiny_model):
+    app = Flask(__name__)
+    registor_error_handlers(app)
+    app.register_blueprint(emotion_bp, url_prefix="/api/v1/emotion_detect")
+    client = app.test_client()
+
+    tiny_model.ready = False
+    assert client.get("/api/v1/emotion_detect/health").status_code == 503
+
+    tiny_model.ready = True
+    response = client.get("/api/v1/emotion_detect/health")
+    assert response.status_code == 200
+    assert response.get_json()["data"]["ready"] is True
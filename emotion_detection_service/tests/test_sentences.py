@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.emotion.emotion_detection import EmotionDetection
+from app.emotion.cache import prediction_cache
+from app.emotion.metrics import Metrics
+from app.emotion.services import EmotionService
+from app.utils.custom_exceptions import BadRequestError
+
+def test_split_sentences_returns_stripped_spans():
+    text = "I felt great.  Then it rained!\nWhy?? ok"
+
+    spans = EmotionDetection._split_sentences(text)
+
+    assert [text[start:end] for start, end in spans] == ["I felt great.", "Then it rained!", "Why??", "ok"]
+
+def test_split_sentences_skips_punctuation_only_runs():
+    assert EmotionDetection._split_sentences("... !!") == []
+
+def test_predict_sentences_scores_every_sentence_in_one_batch(tiny_model):
+    text = "i feel happy today. my friend was sad! it was a bad day"
+
+    with patch.object(
+        tiny_model, "predict_probabilities_batch", wraps=tiny_model.predict_probabilities_batch
+    ) as predict_batch:
+        result = tiny_model.predict_sentences(text, threshold=0.3)
+
+    predict_batch.assert_called_once()
+    assert [sentence["text"] for sentence in result["sentences"]] == [
+        "i feel happy today.", "my friend was sad!", "it was a bad day"
+    ]
+    for sentence in result["sentences"]:
+        assert text[sentence["char_start"]:sentence["char_end"]] == sentence["text"]
+    assert result["document"]["sentence_count"] == 3
+
+def test_document_is_aggregated_from_sentence_rows(tiny_model):
+    text = "i feel happy. i feel sad."
+    sentences = ["i feel happy.", "i feel sad."]
+
+    result = tiny_model.predict_sentences(text, strategy="max", compact=True)
+
+    prediction_cache.clear()
+    expected = np.max(np.stack(tiny_model.predict_probabilities_batch(sentences, "max")), axis=0)
+    assert result["document"]["emotions"] == EmotionDetection._format_compact_batch([expected])[0]
+
+def test_predict_sentences_raises_when_inference_fails(tiny_model):
+    with patch.object(tiny_model, "_infer", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            tiny_model.predict_sentences("i feel calm. i feel sad.")
+
+def test_analyze_sentences_validates_text():
+    with pytest.raises(BadRequestError):
+        EmotionService.analyze_sentences({"text": ""})
+
+def test_analyze_sentences_passes_options():
+    with patch(
+        "app.emotion.services.EmotionDetection.predict_sentences",
+        return_value={"sentences": [], "document": {}}
+    ) as predict_sentences:
+        EmotionService.analyze_sentences({"text": "Hi. Bye.", "top_k": 3, "strategy": "max"})
+
+    predict_sentences.assert_called_once_with(
+        text="Hi. Bye.", threshold=0.3, top_k=3, strategy="max", compact=False
+    )
+
+def test_predict_sentences_is_observed_as_one_request(tiny_model):
+    instance = Metrics()
+
+    with patch("app.emotion.emotion_detection.metrics", instance):
+        tiny_model.predict_sentences("i feel happy today. my friend was sad.")
+
+    samples = [
+        sample for metric in instance.registry.collect() if metric.name == "emotion_stage_seconds"
+        for sample in metric.samples if sample.name.endswith("_count")
+    ]
+    assert {sample.labels["stage"]: sample.value for sample in samples} == {
+        "cache": 1, "tokenize": 1, "inference": 1, "aggregate": 1, "format": 1,
+    }
+    assert {(sample.labels["tokens"], sample.labels["chunks"]) for sample in samples} == {("0-64", "2")}
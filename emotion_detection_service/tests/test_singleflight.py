@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.emotion.singleflight import SingleFlight
+
+def run_concurrently(flight, key, fn, callers=4):
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, fn) for _ in range(callers)]
+        return [future.result() for future in futures]
+
+def slow(result, calls):
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return result
+    return fn
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    results = run_concurrently(flight, "key", slow("value", calls))
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["value"] * 4
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert flight.stats()["deduplicated"] == 3
+    assert flight.stats()["in_flight"] == 0
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+    assert flight.stats()["executed"] == 2
+
+def test_waiting_callers_receive_the_leaders_exception():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", fail)
+        started.wait()
+        follower = pool.submit(flight.do, "key", fail)
+
+        with pytest.raises(RuntimeError):
+            leader.result()
+        with pytest.raises(RuntimeError):
+            follower.result()
+
+    assert flight.stats()["in_flight"] == 0
+
+def test_disabled_runs_every_call():
+    flight = SingleFlight(enabled=False)
+    calls = []
+
+    run_concurrently(flight, "key", slow("value", calls), callers=3)
+
+    assert len(calls) == 3
+
+def test_identical_concurrent_predictions_run_one_inference(tiny_model):
+    calls = []
+    infer = tiny_model._infer
+
+    def slow_infer(chunks):
+        calls.append(1)
+        time.sleep(0.1)
+        return infer(chunks)
+
+    with patch.object(tiny_model, "_infer", side_effect=slow_infer):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(lambda _: tiny_model.predict("i feel happy today"), range(3)))
+
+    assert len(calls) == 1
+    assert results[0] == results[1] == results[2]
+
+def test_batch_scores_repeated_texts_once(tiny_model):
+    with patch.object(tiny_model, "_infer", wraps=tiny_model._infer) as infer:
+        results = tiny_model.predict_probabilities_batch(["i feel sad", "i feel calm", "i feel sad"])
+
+    assert sum(len(call.args[0]) for call in infer.call_args_list) == 2
+    assert np.array_equal(results[0], results[2])
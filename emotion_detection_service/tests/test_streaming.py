@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+from unittest.mock import patch
+
+from app.emotion import emotion_bp
+from app.emotion.cache import prediction_cache
+from app.emotion.metrics import Metrics, chunk_bucket
+from app.emotion.singleflight import SingleFlight
+from app.utils.error_handlers import registor_error_handlers
+
+LONG_TEXT = " ".join(["i feel happy today but my friend was sad ."] * 5)
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    registor_error_handlers(app)
+    app.register_blueprint(emotion_bp, url_prefix="/api/v1/emotion_detect")
+    return app.test_client()
+
+def test_stream_yields_each_chunk_then_the_aggregate(tiny_model):
+    tiny_model.max_length = 12
+    tiny_model.chunk_overlap = 2
+
+    events = list(tiny_model.predict_stream(LONG_TEXT, threshold=0.3))
+
+    chunks, result = events[:-1], events[-1]
+    assert len(chunks) > 1
+    assert [event["index"] for event in chunks] == list(range(len(chunks)))
+    assert all(event["total_chunks"] == len(chunks) for event in chunks)
+    assert chunks[0]["token_start"] == 0
+    assert chunks[-1]["char_end"] == len(LONG_TEXT)
+    assert LONG_TEXT[chunks[1]["char_start"]:chunks[1]["char_end"]].split()[0] in LONG_TEXT.split()
+    assert result["type"] == "result"
+    assert result["cached"] is False
+
+    prediction_cache.clear()
+    assert result["emotions"] == tiny_model.predict(LONG_TEXT, threshold=0.3)
+
+def test_stream_serves_cached_text_as_single_result(tiny_model):
+    tiny_model.predict("i feel calm")
+
+    events = list(tiny_model.predict_stream("i feel calm"))
+
+    assert len(events) == 1
+    assert events[0]["cached"] is True
+
+def test_stream_rejects_invalid_strategy(tiny_model):
+    with pytest.raises(ValueError):
+        next(tiny_model.predict_stream("i feel calm", strategy="median"))
+
+def test_stream_route_returns_ndjson(tiny_model, client):
+    tiny_model.max_length = 12
+    tiny_model.chunk_overlap = 2
+
+    response = client.post("/api/v1/emotion_detect/stream", json={"text": LONG_TEXT, "top_k": 2})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    events = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert events[-1]["type"] == "result"
+    assert all(len(event["emotions"]) == 2 for event in events)
+
+def test_stream_route_validates_before_streaming(client):
+    response = client.post("/api/v1/emotion_detect/stream", json={"text": "   "})
+
+    assert response.status_code == 400
+
+def test_stream_route_reports_failure_as_last_line(tiny_model, client):
+    with patch.object(tiny_model, "_infer", side_effect=RuntimeError("boom")):
+        response = client.post("/api/v1/emotion_detect/stream", json={"text": "i feel calm"})
+
+    lines = response.data.decode().splitlines()
+    assert json.loads(lines[-1]) == {"type": "error", "message": "Emotion detection failed."}
+
+def test_stream_records_request_stages(tiny_model):
+    instance = Metrics()
+    tiny_model.max_length = 12
+    tiny_model.chunk_overlap = 2
+
+    with patch("app.emotion.emotion_detection.metrics", instance):
+        events = list(tiny_model.predict_stream(LONG_TEXT))
+
+    chunks = chunk_bucket(len(events) - 1)
+    for stage in ("cache", "tokenize", "inference", "aggregate", "format"):
+        assert instance.registry.get_sample_value(
+            "emotion_stage_seconds_count", {"stage": stage, "tokens": "0-64", "chunks": chunks}
+        ) == 1
+    assert instance.registry.get_sample_value("emotion_texts_processed_total", {"source": "model"}) == 1
+
+def test_stream_waits_for_identical_text_in_flight(tiny_model):
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    infer = tiny_model._infer
+
+    def slow_infer(texts):
+        started.set()
+        release.wait(5)
+        return infer(texts)
+
+    with patch("app.emotion.emotion_detection.singleflight", flight), \
+            patch.object(tiny_model, "_infer", side_effect=slow_infer) as mock_infer:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            leader = pool.submit(tiny_model.predict, "i feel calm")
+            started.wait(5)
+            follower = tiny_model.predict_stream("i feel calm")
+            release.set()
+            events = list(follower)
+            expected = leader.result()
+
+    assert mock_infer.call_count == 1
+    assert events == [{"type": "result", "cached": False, "shared": True, "strategy": "average", "emotions": expected}]
+    assert flight.stats()["deduplicated"] == 1
+
+def test_closed_stream_lets_waiters_compute(tiny_model):
+    tiny_model.max_length = 12
+    tiny_model.chunk_overlap = 2
+    flight = SingleFlight()
+
+    with patch("app.emotion.emotion_detection.singleflight", flight):
+        stream = tiny_model.predict_stream(LONG_TEXT)
+        next(stream)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            follower = pool.submit(tiny_model.predict_probabilities, LONG_TEXT)
+            while flight.stats()["deduplicated"] == 0:
+                time.sleep(0.01)
+            stream.close()
+            probabilities = follower.result(timeout=5)
+
+    assert probabilities.shape == (tiny_model.model.config.num_labels,)
+    assert flight.stats()["in_flight"] == 0
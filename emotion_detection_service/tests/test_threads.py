@@ -0,0 +1,74 @@
+import os
+
+import pytest
+import torch
+
+from app.emotion.threads import parse_cpu_list, worker_cpus, default_num_threads, available_cpus
+from app.emotion.emotion_detection import EmotionDetection
+from benchmarks.bench_threads import layouts, recommend
+
+@pytest.fixture
+def restore_threads():
+    threads = torch.get_num_threads()
+    cpus = available_cpus()
+    yield
+    torch.set_num_threads(threads)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,8") == [0, 1, 2, 3, 8]
+    assert parse_cpu_list("5") == [5]
+    with pytest.raises(ValueError):
+        parse_cpu_list(" ")
+
+def test_worker_cpus_auto_splits_cpus_between_workers():
+    cpus = list(range(8))
+
+    assert worker_cpus("auto", 0, 2, cpus) == [0, 1, 2, 3]
+    assert worker_cpus("auto", 1, 2, cpus) == [4, 5, 6, 7]
+    assert worker_cpus("auto", 3, 16, cpus) == [3]
+
+def test_worker_cpus_explicit_sets_are_round_robin():
+    assert worker_cpus("0-1;2-3", 0, 4) == [0, 1]
+    assert worker_cpus("0-1;2-3", 3, 4) == [2, 3]
+
+def test_default_num_threads_divides_cpus_by_workers():
+    assert default_num_threads(2, list(range(8))) == 4
+    assert default_num_threads(16, list(range(8))) == 1
+
+def test_load_model_applies_thread_settings(tiny_model_path, restore_threads):
+    EmotionDetection.model_path = tiny_model_path
+    EmotionDetection.model = None
+    EmotionDetection.num_threads = 1
+
+    EmotionDetection.load_model()
+
+    assert torch.get_num_threads() == 1
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs sched_setaffinity")
+def test_post_fork_pins_worker(restore_threads):
+    first_cpu = available_cpus()[0]
+    EmotionDetection.model = object()
+    EmotionDetection.warmup_enabled = False
+    EmotionDetection.cpu_affinity = str(first_cpu)
+    EmotionDetection.num_threads = None
+
+    EmotionDetection.post_fork(worker_index=0)
+
+    assert available_cpus() == [first_cpu]
+    assert torch.get_num_threads() == 1
+
+def test_sweep_layouts_never_oversubscribe():
+    for layout in layouts(8, [1, 2]):
+        assert layout["workers"] * layout["intra_op_threads"] <= 8
+
+def test_recommend_prefers_throughput_within_latency_limit():
+    results = [
+        {"workers": 1, "texts_per_sec": 100.0, "p95_ms": 20.0},
+        {"workers": 4, "texts_per_sec": 300.0, "p95_ms": 80.0},
+    ]
+
+    assert recommend(results)["workers"] == 4
+    assert recommend(results, max_p95_ms=50)["workers"] == 1
+    assert recommend(results, max_p95_ms=10) is None
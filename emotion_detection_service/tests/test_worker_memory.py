@@ -0,0 +1,77 @@
+import gc
+import os
+
+import pytest
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+from benchmarks.bench_worker_memory import process_memory
+from app.emotion.emotion_detection import EmotionDetection
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists("/proc/self/smaps_rollup"), reason="needs Linux /proc smaps_rollup"
+)
+
+def test_process_memory_reports_own_usage():
+    memory = process_memory(os.getpid())
+
+    assert memory["rss_mb"] > 0
+    assert memory["uss_mb"] <= memory["rss_mb"]
+    assert memory["pss_mb"] <= memory["rss_mb"]
+
+def test_forked_worker_shares_preloaded_model_weights(tiny_model_path, tmp_path):
+    # Preload the model the way create_app does in the gunicorn master, with
+    # enough weights (~60 MB) that copying them would dominate the child's USS
+    DistilBertTokenizerFast.from_pretrained(tiny_model_path).save_pretrained(tmp_path)
+    config = DistilBertConfig.from_pretrained(
+        tiny_model_path, vocab_size=60000, dim=256, hidden_dim=512, n_layers=2, n_heads=4
+    )
+    DistilBertForSequenceClassification(config).save_pretrained(tmp_path)
+    EmotionDetection.model_path = str(tmp_path)
+    EmotionDetection.model = None
+    EmotionDetection.load_model()
+    weights_mb = sum(
+        parameter.numel() * parameter.element_size()
+        for parameter in EmotionDetection.model.model.parameters()
+    ) / (1024 * 1024)
+    chunks = EmotionDetection._encode(["i feel so happy today"] * 4)
+    EmotionDetection._predict_chunks(chunks)
+    # What when_ready in gunicorn.conf.py does before forking
+    gc.collect()
+    gc.freeze()
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            EmotionDetection._predict_chunks(chunks)
+            os.write(write_fd, str(process_memory(os.getpid())["uss_mb"]).encode())
+        finally:
+            os._exit(0)
+
+    gc.unfreeze()
+    os.close(write_fd)
+    child_uss_mb = float(os.read(read_fd, 64).decode())
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert child_uss_mb < weights_mb / 4
+
+def test_post_fork_recreates_backend_session():
+    class Backend():
+        sessions = 0
+
+        def post_fork(self, num_threads=None):
+            Backend.sessions += 1
+
+    EmotionDetection.model = Backend()
+    EmotionDetection.warmup_enabled = False
+
+    EmotionDetection.post_fork()
+
+    assert Backend.sessions == 1
+
+def test_post_fork_ignores_backends_without_hook():
+    EmotionDetection.model = object()
+    EmotionDetection.warmup_enabled = False
+
+    EmotionDetection.post_fork()
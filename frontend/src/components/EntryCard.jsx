@@ -32,7 +32,13 @@ function EntryCard({ entry }) {
     >
       {/* Header: Emotion Badge and Timestamp */}
       <div className="flex justify-between items-center mb-4">
-        <EmotionBadge emotion={topEmotion.name} score={topEmotion.confidence} />
+        {topEmotion ? (
+          <EmotionBadge emotion={topEmotion.name} score={topEmotion.confidence} />
+        ) : (
+          <span className="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium border bg-gray-100 text-gray-600 border-gray-200">
+            Analysis pending
+          </span>
+        )}
         <div className="flex items-center text-xs font-medium text-gray-400">
           <FiClock className="h-3 w-3 mr-1" />
           <span>{formattedDateTime}</span>
@@ -52,7 +58,7 @@ function EntryCard({ entry }) {
       {/* Action Footer: Now a unified 'view' link */}
       <div className="flex justify-between items-center pt-4 border-t border-gray-100">
         <span className="text-sm text-orange-800">
-          Confidence: {topEmotion.confidence}%
+          {topEmotion ? `Confidence: ${topEmotion.confidence}%` : "Emotions not analyzed yet"}
         </span>
 
         {/* View Details Link */}
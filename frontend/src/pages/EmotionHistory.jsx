@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { getJournalEntries } from "../services/journal.js";
+import { getEmotionTimeline } from "../services/journal.js";
 import {
   FiTrendingUp,
   FiCalendar,
@@ -11,108 +11,80 @@ import {
 } from "react-icons/fi";
 
 function EmotionHistory() {
-  const [entries, setEntries] = useState([]);
+  const [timeline, setTimeline] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [timeRange, setTimeRange] = useState("all"); // all, week, month
+  const [bucket, setBucket] = useState("day"); // day, week, month
 
   useEffect(() => {
-    const fetchEntries = async () => {
-      setLoading(true);
+    const fetchTimeline = async () => {
+      // loading only covers the first fetch; later ones keep the current data on screen
       try {
-        const response = await getJournalEntries();
+        const days = { week: 7, month: 30 }[timeRange];
+        const from = days
+          ? new Date(Date.now() - days * 24 * 60 * 60 * 1000).toISOString()
+          : undefined;
+        const response = await getEmotionTimeline({ bucket, from });
         if (response.success) {
-          setEntries(response.data);
+          setTimeline(response.data);
+          setError(null);
         } else {
-          setError(response.message || "Failed to load journal entries.");
+          setError(response.message || "Failed to load emotion history.");
         }
       } catch (err) {
-        setError("Failed to load journal entries.");
+        setError("Failed to load emotion history.");
       } finally {
         setLoading(false);
       }
     };
-    fetchEntries();
-  }, []);
+    fetchTimeline();
+  }, [timeRange, bucket]);
 
-  // Filter entries based on time range
-  const getFilteredEntries = () => {
-    const now = new Date();
-    return entries.filter((entry) => {
-      const entryDate = new Date(entry.created_at);
-      if (timeRange === "week") {
-        const weekAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-        return entryDate >= weekAgo;
-      } else if (timeRange === "month") {
-        const monthAgo = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000);
-        return entryDate >= monthAgo;
-      }
-      return true; // all
-    });
-  };
+  const totalEntries = timeline ? timeline.entry_count : 0;
 
-  const filteredEntries = getFilteredEntries();
-
-  // Calculate emotion statistics
+  // Emotion statistics over the selected range, aggregated by the backend
   const calculateEmotionStats = () => {
-    const emotionCounts = {};
-    const emotionScores = {};
-    let totalEmotions = 0;
+    const emotions = timeline ? timeline.emotions : [];
+    const totalEmotions = emotions.reduce((sum, emotion) => sum + emotion.count, 0);
 
-    filteredEntries.forEach((entry) => {
-      entry.emotions.forEach((emotion) => {
-        const name = emotion.name;
-        emotionCounts[name] = (emotionCounts[name] || 0) + 1;
-        emotionScores[name] = (emotionScores[name] || 0) + emotion.confidence;
-        totalEmotions++;
-      });
-    });
-
-    // Calculate percentages and averages
-    const emotionStats = Object.entries(emotionCounts)
-      .map(([name, count]) => ({
-        name,
-        count,
-        percentage: ((count / totalEmotions) * 100).toFixed(1),
-        avgConfidence: (emotionScores[name] / count).toFixed(1),
-      }))
-      .sort((a, b) => b.count - a.count);
-
-    return emotionStats;
+    return emotions.map((emotion) => ({
+      name: emotion.name,
+      count: emotion.count,
+      percentage: ((emotion.count / totalEmotions) * 100).toFixed(1),
+      avgConfidence: emotion.avg_confidence.toFixed(1),
+    }));
   };
 
   const emotionStats = calculateEmotionStats();
   const topEmotion = emotionStats[0];
 
-  // Calculate timeline data (group by date)
-  const getTimelineData = () => {
-    const timeline = {};
-
-    filteredEntries.forEach((entry) => {
-      const date = new Date(entry.created_at).toLocaleDateString("en-US", {
-        month: "short",
-        day: "numeric",
-      });
-
-      if (!timeline[date]) {
-        timeline[date] = {};
-      }
-
-      entry.emotions.forEach((emotion) => {
-        timeline[date][emotion.name] =
-          (timeline[date][emotion.name] || 0) + 1;
+  // Bucket starts are UTC midnights, so they are labelled in UTC
+  const formatBucket = (start, unit) => {
+    const date = new Date(start);
+    if (unit === "month") {
+      return date.toLocaleDateString("en-US", {
+        month: "long",
+        year: "numeric",
+        timeZone: "UTC",
       });
+    }
+    const label = date.toLocaleDateString("en-US", {
+      month: "short",
+      day: "numeric",
+      timeZone: "UTC",
     });
-
-    return Object.entries(timeline)
-      .slice(-7) // Last 7 dates
-      .map(([date, emotions]) => ({
-        date,
-        emotions,
-      }));
+    return unit === "week" ? `Week of ${label}` : label;
   };
 
-  const timelineData = getTimelineData();
+  const timelineData = (timeline ? timeline.series : [])
+    .slice(-7) // Last 7 buckets
+    .map((item) => ({
+      date: formatBucket(item.start, timeline.bucket),
+      emotions: Object.fromEntries(
+        item.emotions.map((emotion) => [emotion.name, emotion.count])
+      ),
+    }));
 
   // Get emotion color
   const getEmotionColor = (index) => {
@@ -160,7 +132,7 @@ function EmotionHistory() {
   }
 
   // Empty State
-  if (filteredEntries.length === 0) {
+  if (totalEntries === 0) {
     return (
       <section className="py-8">
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
@@ -225,7 +197,7 @@ function EmotionHistory() {
                   Total Entries
                 </p>
                 <p className="text-3xl font-bold text-gray-900 mt-2">
-                  {filteredEntries.length}
+                  {totalEntries}
                 </p>
               </div>
               <div className="w-12 h-12 bg-orange-100 rounded-full flex items-center justify-center">
@@ -348,11 +320,22 @@ function EmotionHistory() {
 
         {/* Timeline View */}
         <div className="bg-white rounded-md shadow-sm border border-gray-200 p-6 mb-6">
-          <div className="flex items-center gap-2 mb-6">
-            <FiCalendar className="h-5 w-5 text-orange-600" />
-            <h2 className="text-lg font-semibold text-gray-900">
-              Recent Timeline
-            </h2>
+          <div className="flex items-center justify-between gap-2 mb-6">
+            <div className="flex items-center gap-2">
+              <FiCalendar className="h-5 w-5 text-orange-600" />
+              <h2 className="text-lg font-semibold text-gray-900">
+                Recent Timeline
+              </h2>
+            </div>
+            <select
+              value={bucket}
+              onChange={(e) => setBucket(e.target.value)}
+              className="px-3 py-1.5 text-sm border border-gray-300 rounded-lg bg-white focus:ring-2 focus:ring-orange-500 focus:border-orange-500"
+            >
+              <option value="day">Daily</option>
+              <option value="week">Weekly</option>
+              <option value="month">Monthly</option>
+            </select>
           </div>
           <div className="space-y-4">
             {timelineData.length > 0 ? (
@@ -419,14 +402,14 @@ function EmotionHistory() {
                 </p>
               </div>
             )}
-            {filteredEntries.length > 0 && (
+            {totalEntries > 0 && (
               <div className="flex items-start gap-3">
                 <div className="w-2 h-2 bg-orange-600 rounded-full mt-2"></div>
                 <p className="text-gray-700">
                   You've created{" "}
                   <span className="font-semibold">
-                    {filteredEntries.length} journal{" "}
-                    {filteredEntries.length === 1 ? "entry" : "entries"}
+                    {totalEntries} journal{" "}
+                    {totalEntries === 1 ? "entry" : "entries"}
                   </span>{" "}
                   {timeRange === "week"
                     ? "in the last 7 days"
@@ -22,13 +22,9 @@ function Home() {
   useEffect(() => {
     (async () => {
       try {
-        const response = await getJournalEntries();
+        const response = await getJournalEntries({ limit: 3 });
         if (response.success) {
-          setRecentEntries(
-            response.data
-              .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-              .slice(0, 3)
-          );
+          setRecentEntries(response.data.entries);
         } else {
           setError(response.message || "Failed to load journal entries.");
         }
@@ -17,7 +17,9 @@ function JournalEntries() {
   const [searchTerm, setSearchTerm] = useState("");
 
   const [entries, setEntries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
   useEffect(() => {
@@ -26,7 +28,8 @@ function JournalEntries() {
       try {
         const response = await getJournalEntries();
         if (response.success) {
-          setEntries(response.data);
+          setEntries(response.data.entries);
+          setNextCursor(response.data.next_cursor);
         } else {
           setError(response.message);
         }
@@ -39,12 +42,29 @@ function JournalEntries() {
     fetchEntries();
   }, []);
 
+  const loadMoreEntries = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await getJournalEntries({ cursor: nextCursor });
+      if (response.success) {
+        setEntries((loaded) => [...loaded, ...response.data.entries]);
+        setNextCursor(response.data.next_cursor);
+      } else {
+        setError(response.message);
+      }
+    } catch (err) {
+      setError("Failed to load journal entries.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Filtering Logic (simplified)
   const filteredEntries = entries
     .filter(
       (entry) =>
         filter === "All" ||
-        entry.emotions[0].name.toLowerCase() === filter.toLowerCase()
+        entry.emotions[0]?.name.toLowerCase() === filter.toLowerCase()
     )
     .filter(
       (entry) =>
@@ -145,6 +165,20 @@ function JournalEntries() {
             ))}
           </div>
         )}
+
+        {/* Entries are loaded a page at a time, newest first */}
+        {nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={loadMoreEntries}
+              disabled={loadingMore}
+              className="flex items-center gap-2 px-5 py-2.5 text-sm font-medium text-orange-700 bg-white border border-orange-300 rounded-md shadow-sm hover:bg-orange-50 disabled:opacity-60 cursor-pointer"
+            >
+              {loadingMore && <FiLoader className="h-4 w-4 animate-spin" />}
+              {loadingMore ? "Loading..." : "Load older entries"}
+            </button>
+          </div>
+        )}
       </div>
     </section>
   );
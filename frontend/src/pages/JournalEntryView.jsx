@@ -1,10 +1,14 @@
 import { useState, useEffect } from "react";
 import { useNavigate, useParams } from "react-router-dom";
-import { getJournalEntryById } from "../services/journal.js";
+import {
+  getJournalEntryById,
+  getJournalEntryAnalysis,
+} from "../services/journal.js";
 import { FiEdit, FiLoader, FiAlertTriangle, FiActivity } from "react-icons/fi";
 import Header from "../components/Header.jsx";
 
 const formatScore = (score) => `${score.toFixed(1)}%`;
+const ANALYSIS_POLL_MS = 2000;
 
 function JournalEntryView() {
   const navigate = useNavigate();
@@ -14,6 +18,8 @@ function JournalEntryView() {
   const [content, setContent] = useState("");
   const [createdAt, setCreatedAt] = useState("");
   const [entryData, setEntryData] = useState(null);
+  const [analysisStatus, setAnalysisStatus] = useState(null);
+  const [pollCount, setPollCount] = useState(0);
 
   const [loading, setLoading] = useState(null);
   const [error, setError] = useState(null);
@@ -38,6 +44,7 @@ function JournalEntryView() {
             })
           );
           setEntryData(entry.emotions);
+          setAnalysisStatus(entry.analysis_status);
         } else {
           setError(response.message || "Failed to fetch entry.");
         }
@@ -50,6 +57,21 @@ function JournalEntryView() {
     fetchEntry();
   }, [id]);
 
+  // Poll until the analysis worker has processed the entry
+  useEffect(() => {
+    if (analysisStatus !== "pending") return;
+
+    const timer = setTimeout(async () => {
+      const response = await getJournalEntryAnalysis(id);
+      if (response?.success && response.data) {
+        setEntryData(response.data.emotions);
+        setAnalysisStatus(response.data.analysis_status);
+      }
+      setPollCount((count) => count + 1);
+    }, ANALYSIS_POLL_MS);
+    return () => clearTimeout(timer);
+  }, [id, analysisStatus, pollCount]);
+
   // Emotions Processing
   const processedEmotions = entryData
     ? entryData
@@ -175,7 +197,11 @@ function JournalEntryView() {
                   <div className="text-center py-10 text-gray-500">
                     <FiAlertTriangle className="h-8 w-8 mx-auto mb-3 text-orange-400" />
                     <p className="text-sm">
-                      Save or update your entry to run the AI emotion analysis.
+                      {analysisStatus === "pending"
+                        ? "Your entry is saved. Analyzing emotions..."
+                        : analysisStatus === "failed"
+                        ? "Emotion analysis failed for this entry. Edit the entry to try again."
+                        : "Save or update your entry to run the AI emotion analysis."}
                     </p>
                   </div>
                 )}
@@ -1,8 +1,30 @@
 // Use Vite dev server proxy during development so requests are same-origin
 const API_BASE_URL = "/api";
 
-export const getJournalEntries = async () => {
-  const response = await fetch(`${API_BASE_URL}/journals/`, {
+// Returns { entries, next_cursor, limit }; pass { all: true } for every entry as a plain list
+export const getJournalEntries = async ({ cursor, limit, all } = {}) => {
+  const params = new URLSearchParams();
+  if (cursor) params.set("cursor", cursor);
+  if (limit) params.set("limit", limit);
+  if (all) params.set("all", "true");
+  const query = params.toString() ? `?${params}` : "";
+
+  const response = await fetch(`${API_BASE_URL}/journals/${query}`, {
+    method: "GET",
+    credentials: "include",
+  });
+  return await response.json();
+};
+
+// Aggregated emotion series; bucket is "day", "week" or "month", from/to are ISO timestamps
+export const getEmotionTimeline = async ({ bucket, from, to } = {}) => {
+  const params = new URLSearchParams();
+  if (bucket) params.set("bucket", bucket);
+  if (from) params.set("from", from);
+  if (to) params.set("to", to);
+  const query = params.toString() ? `?${params}` : "";
+
+  const response = await fetch(`${API_BASE_URL}/journals/analytics/timeline${query}`, {
     method: "GET",
     credentials: "include",
   });
@@ -21,6 +43,18 @@ export const getJournalEntryById = async (entryId) => {
   }
 };
 
+export const getJournalEntryAnalysis = async (entryId) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/journals/${entryId}/analysis`, {
+      method: "GET",
+      credentials: "include",
+    });
+    return await response.json();
+  } catch (error) {
+    console.error("Error fetching journal entry analysis:", error);
+  }
+};
+
 export const createJournalEntry = async (entryData) => {
   try {
     const response = await fetch(`${API_BASE_URL}/journals/`, {